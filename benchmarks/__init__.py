@@ -0,0 +1 @@
+"""Client-side benchmarks for ContentForge (run with ``python -m benchmarks.<name>``)."""
@@ -0,0 +1,82 @@
+"""Batch throughput: ``run_batch`` over generated rows against the fake Ollama server.
+
+With ``--repeat N`` every row appears N times in a row (the same product in N
+locales), so concurrent duplicates are coalesced into one upstream request
+(``CoalescingProvider``); the run is repeated without coalescing for comparison.
+
+Usage: python -m benchmarks.bench_batch [--rows 500] [--concurrency 16] [--latency 0.02]
+       [--repeat 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from benchmarks.stub_server import StubServer
+from contentforge.batch import BatchStats, run_batch
+from contentforge.providers.coalesce import CoalescingProvider
+from contentforge.providers.ollama_provider import OllamaProvider
+
+
+async def _run(
+    rows: int, concurrency: int, latency: float, repeat: int, coalesce: bool
+) -> tuple[BatchStats, int]:
+    jobs = ({"id": str(i), "topic": f"topic {i // repeat}"} for i in range(rows))
+    records: list[dict] = []
+    async with (
+        StubServer(response="a short generated post", latency=latency) as server,
+        OllamaProvider(base_url=server.base_url, model="stub") as prov,
+    ):
+        stats = await run_batch(
+            CoalescingProvider(prov) if coalesce else prov,
+            jobs,
+            records.append,
+            template_id="social",
+            concurrency=concurrency,
+        )
+        return stats, server.requests
+
+
+async def main(rows: int, concurrency: int, latency: float, repeat: int = 1) -> dict:
+    stats, upstream = await _run(rows, concurrency, latency, repeat, coalesce=repeat > 1)
+    result = {
+        "rows": stats.processed,
+        "failed": stats.failed,
+        "seconds": stats.elapsed,
+        "rows_per_second": stats.rows_per_second,
+        # With fixed server latency, concurrency bounds the ideal rate.
+        "ideal_rows_per_second": concurrency / latency if latency else None,
+        "upstream_requests": upstream,
+        "dedup_ratio": stats.dedup_ratio,
+    }
+    if repeat > 1:
+        plain, plain_upstream = await _run(rows, concurrency, latency, repeat, coalesce=False)
+        result["uncoalesced_rows_per_second"] = plain.rows_per_second
+        result["uncoalesced_upstream_requests"] = plain_upstream
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--repeat", type=int, default=1, help="copies of each row")
+    args = parser.parse_args()
+
+    r = asyncio.run(main(args.rows, args.concurrency, args.latency, args.repeat))
+    ideal = f" (ideal {r['ideal_rows_per_second']:.0f})" if r["ideal_rows_per_second"] else ""
+    print(
+        f"{r['rows']} rows ({r['failed']} failed) in {r['seconds']:.2f}s: "
+        f"{r['rows_per_second']:.0f} rows/s{ideal}"
+    )
+    if args.repeat > 1:
+        print(
+            f"  coalesced: {r['upstream_requests']} upstream requests, "
+            f"dedup ratio {r['dedup_ratio']:.0%}"
+        )
+        print(
+            f"  without:   {r['uncoalesced_upstream_requests']} upstream requests, "
+            f"{r['uncoalesced_rows_per_second']:.0f} rows/s"
+        )
@@ -0,0 +1,129 @@
+"""Generation history write cost and search latency.
+
+Times, in a temporary database:
+
+* ``record``: what a generation pays to record one entry (a queue put; the
+  background writer does the SQLite work);
+* ``insert``: sustained writer throughput, batching entries per transaction,
+  versus one transaction per entry;
+* ``search``: full-text queries over ``--rows`` entries, ranked by relevance
+  and newest first, for a rare and a very common word.
+
+Usage: python -m benchmarks.bench_history [--rows 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from contentforge.history import HistoryEntry, HistoryStore, HistoryWriter
+
+_WORDS = [
+    "coffee",
+    "tea",
+    "launch",
+    "product",
+    "review",
+    "guide",
+    "pricing",
+    "launch",
+    "customer",
+    "story",
+    "marketing",
+    "newsletter",
+    "summer",
+    "winter",
+    "design",
+    "growth",
+    "cloud",
+    "security",
+    "team",
+    "remote",
+    "hiring",
+]
+
+
+def _entries(n: int, seed: int = 7) -> list[HistoryEntry]:
+    rng = random.Random(seed)
+    entries = []
+    for i in range(n):
+        words = " ".join(rng.choices(_WORDS, k=120))
+        entries.append(
+            HistoryEntry(
+                template="blog",
+                provider="fake",
+                model="fake-1",
+                content=f"Post {i}: {words}" + (" zeppelin" if i % 10_000 == 0 else ""),
+                variables={"topic": rng.choice(_WORDS), "audience": "developers"},
+                tokens_used=300,
+            )
+        )
+    return entries
+
+
+def _time_search(store: HistoryStore, query: str, newest: bool, rounds: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        store.search(query, limit=20, newest_first=newest)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main(rows: int) -> dict:
+    entries = _entries(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        single = HistoryStore(root / "single.sqlite")
+        sample = entries[:500]
+        start = time.perf_counter()
+        for entry in sample:
+            single.add_many([entry])
+        per_entry_tx = len(sample) / (time.perf_counter() - start)
+        single.close()
+
+        store = HistoryStore(root / "history.sqlite")
+        writer = HistoryWriter(store)
+        start = time.perf_counter()
+        for entry in entries:
+            writer.add(entry)
+        queued = time.perf_counter() - start
+        writer.close()
+        batched = rows / (time.perf_counter() - start)
+
+        reader = HistoryStore(root / "history.sqlite")
+        result = {
+            "rows": rows,
+            "record_us": queued / rows * 1e6,
+            "insert_batched_per_s": batched,
+            "insert_per_entry_tx_per_s": per_entry_tx,
+            "transactions": writer.transactions,
+            "search_rare_ms": _time_search(reader, "zeppelin", newest=False),
+            "search_common_ms": _time_search(reader, "coffee", newest=False, rounds=3),
+            "search_common_newest_ms": _time_search(reader, "coffee", newest=True),
+            "search_prefix_newest_ms": _time_search(reader, "market*", newest=True),
+        }
+        reader.close()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="entries in the database")
+    args = parser.parse_args()
+
+    r = main(args.rows)
+    print(f"{r['rows']} entries")
+    print(f"  record (caller cost):     {r['record_us']:8.2f} us/entry")
+    print(
+        f"  writer throughput:        {r['insert_batched_per_s']:8.0f} entries/s "
+        f"in {r['transactions']} transactions"
+    )
+    print(f"  one transaction per row:  {r['insert_per_entry_tx_per_s']:8.0f} entries/s")
+    print(f"  search rare word:         {r['search_rare_ms']:8.2f} ms")
+    print(f"  search common word:       {r['search_common_ms']:8.2f} ms (by relevance)")
+    print(f"  search common, newest:    {r['search_common_newest_ms']:8.2f} ms")
+    print(f"  search prefix, newest:    {r['search_prefix_newest_ms']:8.2f} ms")
@@ -0,0 +1,86 @@
+"""Long-form blog latency: one serial request vs outline + concurrent sections.
+
+The fake server generates ``--tps`` tokens per second per request. ``serial``
+streams a whole post of ``--sections`` x ``--words`` words in one request;
+``long_form`` asks for an outline (every response of the fake server doubles
+as an outline of ``--sections`` headings) and then streams all sections at
+once. Reported: time to first token and total time.
+
+Usage: python -m benchmarks.bench_long_form [--sections 6] [--words 150] [--tps 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+from benchmarks.stub_server import StubServer
+from contentforge.longform import stream_long_form
+from contentforge.providers.ollama_provider import OllamaProvider
+
+
+def _section_text(sections: int, words: int) -> str:
+    headings = "\n".join(f"## Section {i + 1}" for i in range(sections))
+    return f"# Bench post\n{headings}\n" + " ".join(["word"] * words)
+
+
+async def _timed(chunks: AsyncIterator[str]) -> tuple[float, float, int]:
+    start = time.perf_counter()
+    first = None
+    words = 0
+    async for chunk in chunks:
+        if first is None:
+            first = time.perf_counter() - start
+        words += len(chunk.split())
+    return (first or 0.0) * 1000, (time.perf_counter() - start) * 1000, words
+
+
+async def main(sections: int, words: int, tps: float) -> dict:
+    full = " ".join(["word"] * (sections * words))
+    async with (
+        StubServer(response=full, tokens_per_second=tps, chunk_size=4) as server,
+        OllamaProvider(base_url=server.base_url, model="stub") as prov,
+    ):
+        serial = await _timed(prov.stream("write the whole post"))
+
+    async with (
+        StubServer(
+            response=_section_text(sections, words), tokens_per_second=tps, chunk_size=4
+        ) as server,
+        OllamaProvider(base_url=server.base_url, model="stub") as prov,
+    ):
+        variables = {"topic": "bench", "word_count": str(sections * words)}
+        long_form = await _timed(stream_long_form(prov, "", variables))
+        requests = server.requests
+
+    return {
+        "serial_ttft_ms": serial[0],
+        "serial_total_ms": serial[1],
+        "serial_words": serial[2],
+        "long_form_ttft_ms": long_form[0],
+        "long_form_total_ms": long_form[1],
+        "long_form_words": long_form[2],
+        "long_form_requests": requests,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=6)
+    parser.add_argument("--words", type=int, default=150, help="words per section")
+    parser.add_argument("--tps", type=float, default=1000, help="tokens/s per request")
+    args = parser.parse_args()
+
+    r = asyncio.run(main(args.sections, args.words, args.tps))
+    print(f"{args.sections} sections x {args.words} words at {args.tps:.0f} tokens/s")
+    print(
+        f"  serial:    {r['serial_total_ms']:7.0f} ms total, "
+        f"first token {r['serial_ttft_ms']:5.0f} ms ({r['serial_words']} words)"
+    )
+    print(
+        f"  long-form: {r['long_form_total_ms']:7.0f} ms total, "
+        f"first token {r['long_form_ttft_ms']:5.0f} ms ({r['long_form_words']} words, "
+        f"{r['long_form_requests']} requests)"
+    )
@@ -0,0 +1,74 @@
+"""Prompt prefix-cache hit rate for stable-first vs variables-first requests.
+
+Sends one template's rows through each provider against the fake server,
+which reports the leading prompt tokens shared with the previous request as
+cached (like OpenAI prefix caching and Ollama's KV cache). ``stable-first`` is
+how ContentForge builds requests: the shared system prompt, then the rendered
+per-row prompt. ``variables-first`` puts the per-row prompt ahead of the same
+instructions, which is what the ordering avoids.
+
+Usage: python -m benchmarks.bench_prefix_cache [--rows 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from benchmarks.bench_provider_stream import _provider
+from benchmarks.stub_server import StubServer
+from contentforge import metrics
+from contentforge.templates import get_template, render_prompt
+
+
+def _rows(n: int) -> list[str]:
+    tpl = get_template("product")
+    return [
+        render_prompt(tpl, {"name": f"Widget {i}", "features": f"feature {i}, feature {i + 1}"})
+        for i in range(n)
+    ]
+
+
+async def _measure(name: str, rows: list[str], layout: str) -> dict:
+    system_prompt = get_template("product").system_prompt
+    total = metrics.GenerationMetrics()
+    async with StubServer() as server, _provider(name, server.base_url) as prov:
+        for prompt in rows:
+            m = metrics.GenerationMetrics()
+            with metrics.collecting(m):
+                if layout == "stable-first":
+                    await prov.generate(prompt, system_prompt)
+                else:
+                    await prov.generate(f"{prompt}\n\n{system_prompt}")
+            total.tokens_in += m.tokens_in
+            total.tokens_cached += m.tokens_cached
+            total.prefix_saved_ms = (total.prefix_saved_ms or 0.0) + (m.prefix_saved_ms or 0.0)
+    return {
+        "provider": name,
+        "layout": layout,
+        "rows": len(rows),
+        "hit_rate": total.prefix_cache_hit_rate or 0.0,
+        "saved_ms": total.prefix_saved_ms or 0.0,
+    }
+
+
+async def main(rows: int) -> list[dict]:
+    prompts = _rows(rows)
+    return [
+        await _measure(name, prompts, layout)
+        for name in ("ollama", "openai")
+        for layout in ("stable-first", "variables-first")
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50)
+    args = parser.parse_args()
+
+    for r in asyncio.run(main(args.rows)):
+        saved = f" • ~{r['saved_ms']:.0f} ms prompt eval saved" if r["saved_ms"] else ""
+        print(
+            f"{r['provider']:>7} {r['layout']:<16}: {r['hit_rate']:.0%} of prompt tokens "
+            f"cached over {r['rows']} rows{saved}"
+        )
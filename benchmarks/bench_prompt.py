@@ -0,0 +1,76 @@
+"""Prompt rendering throughput across every built-in template.
+
+Compares rendering row by row through ``render_prompt`` with rendering whole
+columns at once through ``CompiledTemplate.render_columns``.
+
+Usage: python -m benchmarks.bench_prompt [--rounds 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from contentforge.templates import list_templates, render_prompt
+
+
+def sample_variables(template) -> dict[str, str]:
+    """Fill every field: selects get their first option, the rest a short value."""
+    values: dict[str, str] = {}
+    for field in template.fields:
+        if field.options:
+            values[field.name] = field.options[0]
+        elif field.type == "number":
+            values[field.name] = "500"
+        else:
+            values[field.name] = f"sample {field.name}"
+    return values
+
+
+def _columns(template, rows: int) -> dict[str, list[str]]:
+    """Column-oriented variables with a distinct value per row for text fields."""
+    columns: dict[str, list[str]] = {}
+    for name, value in sample_variables(template).items():
+        field = next(f for f in template.fields if f.name == name)
+        if field.options or field.type == "number":
+            columns[name] = [value] * rows
+        else:
+            columns[name] = [f"{value} {i}" for i in range(rows)]
+    return columns
+
+
+def main(rounds: int) -> dict:
+    templates = list_templates()
+    jobs = [(t, sample_variables(t)) for t in templates]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for template, variables in jobs:
+            render_prompt(template, variables)
+    elapsed = time.perf_counter() - start
+    renders = rounds * len(jobs)
+
+    columns = [(t.compiled, _columns(t, rounds)) for t in templates]
+    start = time.perf_counter()
+    for compiled, cols in columns:
+        compiled.render_columns(cols)
+    bulk_elapsed = time.perf_counter() - start
+    return {
+        "renders": renders,
+        "seconds": elapsed,
+        "renders_per_second": renders / elapsed,
+        "bulk_seconds": bulk_elapsed,
+        "bulk_rows_per_second": renders / bulk_elapsed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    r = main(args.rounds)
+    print(f"{r['renders']} renders in {r['seconds']:.3f}s ({r['renders_per_second']:,.0f}/s)")
+    print(
+        f"{r['renders']} rows in {r['bulk_seconds']:.3f}s by column "
+        f"({r['bulk_rows_per_second']:,.0f} rows/s)"
+    )
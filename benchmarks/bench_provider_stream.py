@@ -0,0 +1,69 @@
+"""Client-side streaming overhead of each provider against the fake server.
+
+Streams a long response from the fake server with no pacing and reports
+how many chunks per second the provider's parser delivers, plus the
+time-to-first-chunk overhead on top of the server's configured latency.
+
+Usage: python -m benchmarks.bench_provider_stream [--tokens 2000] [--chunk-size 1] [--latency 0.05]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_server import StubServer
+from contentforge.providers.base import BaseProvider
+from contentforge.providers.ollama_provider import OllamaProvider
+from contentforge.providers.openai_provider import OpenAIProvider
+
+
+def _provider(name: str, base_url: str) -> BaseProvider:
+    if name == "openai":
+        prov = OpenAIProvider(api_key="sk-bench", model="stub", max_retries=0)
+        prov.client = prov.client.with_options(base_url=f"{base_url}/v1")
+        return prov
+    return OllamaProvider(base_url=base_url, model="stub")
+
+
+async def _measure(name: str, tokens: int, chunk_size: int, latency: float) -> dict:
+    text = " ".join(f"tok{i}" for i in range(tokens))
+    async with (
+        StubServer(response=text, chunk_size=chunk_size, latency=latency) as server,
+        _provider(name, server.base_url) as prov,
+    ):
+        await prov.generate("warm-up")  # open the pooled connection first
+        start = time.perf_counter()
+        first = None
+        chunks = 0
+        async for _ in prov.stream("x"):
+            if first is None:
+                first = time.perf_counter() - start
+            chunks += 1
+        elapsed = time.perf_counter() - start
+    body = elapsed - (first or 0.0)
+    return {
+        "provider": name,
+        "chunks": chunks,
+        "ttft_overhead_ms": ((first or 0.0) - latency) * 1000,
+        "chunks_per_second": chunks / body if body > 0 else float("inf"),
+    }
+
+
+async def main(tokens: int, chunk_size: int, latency: float) -> list[dict]:
+    return [await _measure(name, tokens, chunk_size, latency) for name in ("ollama", "openai")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    for r in asyncio.run(main(args.tokens, args.chunk_size, args.latency)):
+        print(
+            f"{r['provider']:>7}: {r['chunks']} chunks • {r['chunks_per_second']:,.0f} chunks/s • "
+            f"TTFT overhead {r['ttft_overhead_ms']:.1f} ms"
+        )
@@ -0,0 +1,106 @@
+"""Load test ``contentforge serve`` against a stub LLM backend.
+
+Starts the stub Ollama server and a ``ContentServer`` pointed at it, then
+fires requests at ``/v1/generate/social`` over keep-alive connections and reports
+requests/sec with p50/p99 latency, for JSON and SSE responses.
+
+Usage: python -m benchmarks.bench_serve [--requests 1000] [--concurrency 32]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.stub_server import StubServer
+from contentforge.config import Config
+from contentforge.server import ContentServer
+
+_BODY = {"variables": {"topic": "launch week", "platform": "linkedin"}}
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+async def _read_response(reader: asyncio.StreamReader) -> None:
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").lower()
+    if not head.startswith("http/1.1 200"):
+        raise RuntimeError(head.splitlines()[0])
+    if "transfer-encoding: chunked" in head:
+        while True:
+            size = int(await reader.readuntil(b"\r\n"), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                return
+    length = int(head.split("content-length:", 1)[1].split("\r\n", 1)[0])
+    await reader.readexactly(length)
+
+
+async def _load(port: int, n: int, concurrency: int, stream: bool) -> dict:
+    # Raw keep-alive sockets keep the load generator's own overhead out of the numbers.
+    body = json.dumps({**_BODY, "stream": stream}).encode()
+    request = (
+        b"POST /v1/generate/social HTTP/1.1\r\nHost: localhost\r\n"
+        b"Content-Type: application/json\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    latencies: list[float] = []
+    remaining = iter(range(n))
+
+    async def _worker() -> None:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            for _ in remaining:
+                start = time.perf_counter()
+                writer.write(request)
+                await _read_response(reader)
+                latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": "sse" if stream else "json",
+        "requests": n,
+        "rps": n / elapsed,
+        "p50_ms": _percentile(latencies, 50),
+        "p99_ms": _percentile(latencies, 99),
+    }
+
+
+async def main(n: int, concurrency: int) -> tuple[list[dict], int]:
+    async with StubServer() as backend:
+        cfg = Config(
+            default_provider="ollama",
+            ollama_base_url=backend.base_url,
+            ollama_model="stub",
+            cache_enabled=False,
+        )
+        async with ContentServer(cfg, port=0) as server:
+            rows = [
+                await _load(server.port, n, concurrency, stream=False),
+                await _load(server.port, n, concurrency, stream=True),
+            ]
+        return rows, backend.connections
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    rows, backend_connections = asyncio.run(main(args.requests, args.concurrency))
+    for row in rows:
+        print(
+            f"{row['mode']:>5}: {row['requests']} requests • {row['rps']:.0f} req/s • "
+            f"p50 {row['p50_ms']:.1f} ms • p99 {row['p99_ms']:.1f} ms"
+        )
+    print(f"backend connections: {backend_connections}")
@@ -0,0 +1,68 @@
+"""Cold-start import budget for the CLI.
+
+Runs ``python -X importtime`` in fresh interpreters and fails (exit code 1)
+when importing the CLI entry point exceeds the budget, or when a fast path
+pulls in a provider SDK.
+
+Usage: python -m benchmarks.bench_startup [--budget-ms 100] [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+
+# Modules that must never load just to parse the command line or print --version
+HEAVY_MODULES = ("openai", "google.generativeai", "httpx", "rich.markdown")
+
+_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_time_us(module: str = "contentforge.cli") -> tuple[int, set[str]]:
+    """Return (cumulative import time in microseconds, top-level modules loaded)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = 0
+    loaded: set[str] = set()
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        loaded.add(m.group(3))
+        if m.group(3) == module and not m.group(2):
+            cumulative = int(m.group(1))
+    return cumulative, loaded
+
+
+def main(budget_ms: float, runs: int) -> int:
+    samples = []
+    loaded: set[str] = set()
+    for _ in range(runs):
+        us, loaded = import_time_us()
+        samples.append(us / 1000)
+    best = min(samples)
+    print(f"import contentforge.cli: best {best:.1f} ms of {runs} runs (budget {budget_ms:.0f} ms)")
+
+    failed = False
+    heavy = sorted(m for m in HEAVY_MODULES if m in loaded)
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy)}")
+        failed = True
+    if best > budget_ms:
+        print("FAIL: cold start is over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(main(args.budget_ms, args.runs))
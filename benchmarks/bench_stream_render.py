@@ -0,0 +1,124 @@
+"""Micro-benchmark: streamed markdown rendering cost vs output length.
+
+Compares re-parsing the whole document on every chunk (the old behaviour)
+with ``MarkdownStreamBuffer``, which re-parses only the open tail block.
+Both variants render one frame per chunk, so the difference is purely
+parsing/rendering work, not frame coalescing. It then times the real
+``run_stream_markdown`` and ``run_stream_plain`` end to end (console output
+discarded) as they run in the CLI.
+
+Usage: python -m benchmarks.bench_stream_render [--sizes 250 500 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+from collections.abc import AsyncIterator
+
+from rich.console import Console
+from rich.markdown import Markdown
+
+from contentforge import output
+from contentforge.output import MarkdownStreamBuffer
+
+_PARAGRAPH = (
+    "Streaming output arrives a few words at a time, and each frame should cost "
+    "about the same no matter how much text came before it."
+)
+
+
+def make_chunks(n_chunks: int, words_per_chunk: int = 2) -> list[str]:
+    """Build a markdown document (sections of paragraphs) split into word chunks."""
+    parts: list[str] = ["# Benchmark Post\n\n"]
+    words = 0
+    section = 0
+    while words < n_chunks * words_per_chunk:
+        if words % 300 == 0:
+            section += 1
+            parts.append(f"## Section {section}\n\n")
+        parts.append(_PARAGRAPH + "\n\n")
+        words += len(_PARAGRAPH.split())
+    tokens = "".join(parts).split(" ")
+    return [
+        " ".join(tokens[i : i + words_per_chunk]) + " "
+        for i in range(0, len(tokens), words_per_chunk)
+    ][:n_chunks]
+
+
+def _console() -> Console:
+    return Console(file=io.StringIO(), width=100)
+
+
+def bench_full(chunks: list[str]) -> float:
+    console = _console()
+    collected: list[str] = []
+    start = time.perf_counter()
+    for chunk in chunks:
+        collected.append(chunk)
+        console.render_lines(Markdown("".join(collected)), console.options)
+    return time.perf_counter() - start
+
+
+def bench_incremental(chunks: list[str]) -> float:
+    console = _console()
+    buffer = MarkdownStreamBuffer()
+    start = time.perf_counter()
+    for chunk in chunks:
+        for block in buffer.feed(chunk):
+            console.render_lines(Markdown(block), console.options)
+        console.render_lines(Markdown(buffer.tail), console.options)
+    return time.perf_counter() - start
+
+
+def bench_run_stream(chunks: list[str], markdown: bool) -> float:
+    """Time ``run_stream_markdown``/``run_stream_plain`` with output sent to a buffer."""
+
+    async def source() -> AsyncIterator[str]:
+        for chunk in chunks:
+            yield chunk
+
+    saved = output.console
+    output.console = Console(file=io.StringIO(), width=100, force_terminal=True)
+    try:
+        start = time.perf_counter()
+        if markdown:
+            output.run_stream_markdown(source())
+        else:
+            output.run_stream_plain(source())
+        return time.perf_counter() - start
+    finally:
+        output.console = saved
+
+
+def main(sizes: list[int]) -> list[dict]:
+    rows = []
+    for n in sizes:
+        chunks = make_chunks(n)
+        rows.append(
+            {
+                "chunks": n,
+                "full_s": bench_full(chunks),
+                "incremental_s": bench_incremental(chunks),
+                "run_stream_markdown_s": bench_run_stream(chunks, markdown=True),
+                "run_stream_plain_s": bench_run_stream(chunks, markdown=False),
+            }
+        )
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000])
+    args = parser.parse_args()
+
+    print(
+        f"{'chunks':>8} {'full (s)':>10} {'incremental (s)':>16} "
+        f"{'run_stream_markdown (s)':>24} {'run_stream_plain (s)':>21}"
+    )
+    for r in main(args.sizes):
+        print(
+            f"{r['chunks']:>8} {r['full_s']:>10.3f} {r['incremental_s']:>16.3f} "
+            f"{r['run_stream_markdown_s']:>24.3f} {r['run_stream_plain_s']:>21.3f}"
+        )
@@ -0,0 +1,86 @@
+"""Structured output: first field vs whole reply, and incremental parser throughput.
+
+``latency`` streams a JSON reply from the fake server at ``--tps`` tokens per
+second and reports when the first field (the meta title) was available from
+``JsonStreamParser`` against when the reply was complete, i.e. when parsing
+it with ``json.loads`` at the end could start. ``throughput`` feeds a large
+document to the parser in small chunks and compares it with one ``json.loads``.
+
+Usage: python -m benchmarks.bench_structured [--tps 200] [--fields 40]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.stub_server import StubServer
+from contentforge.providers.ollama_provider import OllamaProvider
+from contentforge.structured import JsonStreamParser
+
+
+def _reply(fields: int) -> str:
+    doc = {"meta_title": "A short title"}
+    doc.update({f"field_{i}": f"value number {i} with a few words" for i in range(fields)})
+    return json.dumps(doc)
+
+
+async def _latency(tps: float, fields: int) -> tuple[float, float]:
+    async with (
+        StubServer(response=_reply(fields), tokens_per_second=tps) as server,
+        OllamaProvider(base_url=server.base_url, model="stub") as prov,
+    ):
+        parser = JsonStreamParser()
+        start = time.perf_counter()
+        first = None
+        async for chunk in prov.stream("seo"):
+            if parser.feed(chunk) and first is None:
+                first = time.perf_counter() - start
+        total = time.perf_counter() - start
+        parser.close()
+    return (first or total) * 1000, total * 1000
+
+
+def _throughput(fields: int, chunk_size: int = 16) -> tuple[float, float]:
+    text = _reply(fields)
+    chunks = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+    start = time.perf_counter()
+    parser = JsonStreamParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    incremental = time.perf_counter() - start
+    start = time.perf_counter()
+    json.loads(text)
+    whole = time.perf_counter() - start
+    megabytes = len(text) / 1e6
+    return megabytes / incremental, megabytes / whole
+
+
+async def main(tps: float, fields: int) -> dict:
+    first_ms, total_ms = await _latency(tps, fields)
+    incremental, whole = _throughput(20_000)
+    return {
+        "first_field_ms": first_ms,
+        "reply_ms": total_ms,
+        "parser_mb_per_s": incremental,
+        "json_loads_mb_per_s": whole,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tps", type=float, default=200, help="tokens/s of the reply")
+    parser.add_argument("--fields", type=int, default=40, help="fields after the first")
+    args = parser.parse_args()
+
+    r = asyncio.run(main(args.tps, args.fields))
+    print(f"JSON reply of {args.fields + 1} fields at {args.tps:.0f} tokens/s")
+    print(f"  first field: {r['first_field_ms']:6.0f} ms")
+    print(f"  whole reply: {r['reply_ms']:6.0f} ms")
+    print(
+        f"  parser: {r['parser_mb_per_s']:.1f} MB/s in 16-char chunks "
+        f"(json.loads on the whole text: {r['json_loads_mb_per_s']:.0f} MB/s)"
+    )
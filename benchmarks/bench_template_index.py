@@ -0,0 +1,85 @@
+"""User template lookup cost with and without the on-disk index.
+
+Writes ``--templates`` TOML files to a temporary directory, then times one
+``get_template``-style lookup three ways: parsing every file (no index), a cold
+index build, and a warm index where every file is only stat'ed.
+
+Usage: python -m benchmarks.bench_template_index [--templates 300]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from contentforge.config import tomllib
+from contentforge.templates.loader import build_index, template_from_dict
+
+_TEMPLATE = '''
+name = "House template {i}"
+category = "house"
+description = "Generated benchmark template number {i}."
+system_prompt = """You are a senior copywriter. Follow the house style guide:
+short sentences, active voice, no jargon. Template {i}."""
+user_prompt_template = "Write about {{topic}} for {{audience}}.{{#notes}}\\nNotes: {{notes}}{{/notes}}"
+
+[[fields]]
+name = "topic"
+
+[[fields]]
+name = "audience"
+type = "select"
+options = ["developers", "executives", "customers"]
+default = "customers"
+
+[[fields]]
+name = "notes"
+type = "textarea"
+required = false
+'''
+
+
+def main(templates: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        src = root / "templates"
+        src.mkdir()
+        for i in range(templates):
+            (src / f"house-{i:04d}.toml").write_text(_TEMPLATE.format(i=i), encoding="utf-8")
+        index_file = root / "template_index.json"
+
+        start = time.perf_counter()
+        for path in sorted(src.iterdir()):
+            template_from_dict(tomllib.loads(path.read_text(encoding="utf-8")), path.stem)
+        parse_all = time.perf_counter() - start
+
+        start = time.perf_counter()
+        build_index([src], index_file).get("house-0000")
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = build_index([src], index_file)
+        index.get("house-0000")
+        warm = time.perf_counter() - start
+        assert index.parsed == 0
+
+    return {
+        "templates": templates,
+        "parse_all_ms": parse_all * 1000,
+        "cold_index_ms": cold * 1000,
+        "warm_index_ms": warm * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--templates", type=int, default=300)
+    args = parser.parse_args()
+
+    r = main(args.templates)
+    print(f"{r['templates']} template files")
+    print(f"  parse every file: {r['parse_all_ms']:8.1f} ms")
+    print(f"  cold index build: {r['cold_index_ms']:8.1f} ms")
+    print(f"  warm index:       {r['warm_index_ms']:8.1f} ms")
@@ -0,0 +1,72 @@
+"""Compare pooled vs per-request HTTP clients against a local stub server.
+
+Usage: python -m benchmarks.bench_transport [--requests 500] [--concurrency 16]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.stub_server import StubServer
+from contentforge.providers.ollama_provider import OllamaProvider
+
+
+async def _unpooled(base_url: str, n: int, concurrency: int) -> None:
+    # The pre-pooling behaviour: one client (and TCP connection) per request.
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one() -> None:
+        async with sem, httpx.AsyncClient(timeout=30.0) as client:
+            resp = await client.post(f"{base_url}/api/generate", json={"prompt": "x"})
+            resp.raise_for_status()
+
+    await asyncio.gather(*(_one() for _ in range(n)))
+
+
+async def _pooled(base_url: str, n: int, concurrency: int) -> None:
+    sem = asyncio.Semaphore(concurrency)
+    async with OllamaProvider(base_url=base_url, model="stub") as prov:
+
+        async def _one() -> None:
+            async with sem:
+                await prov.generate("x")
+
+        await asyncio.gather(*(_one() for _ in range(n)))
+
+
+async def _measure(name: str, fn, n: int, concurrency: int) -> dict:
+    async with StubServer() as server:
+        start = time.perf_counter()
+        await fn(server.base_url, n, concurrency)
+        elapsed = time.perf_counter() - start
+    return {
+        "mode": name,
+        "requests": server.requests,
+        "connections": server.connections,
+        "seconds": elapsed,
+        "rps": n / elapsed,
+    }
+
+
+async def main(n: int, concurrency: int) -> list[dict]:
+    return [
+        await _measure("unpooled", _unpooled, n, concurrency),
+        await _measure("pooled", _pooled, n, concurrency),
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    for row in asyncio.run(main(args.requests, args.concurrency)):
+        print(
+            f"{row['mode']:>9}: {row['requests']} requests over {row['connections']} connections "
+            f"in {row['seconds']:.2f}s ({row['rps']:.0f} req/s)"
+        )
@@ -0,0 +1,64 @@
+"""Ollama cold-model latency with and without warm-up.
+
+The fake server takes ``--load`` seconds to load a model that is not in
+memory. Timed from the start of a generation:
+
+* ``cold``: ``--prep`` seconds of setup (config, template, prompt), then a
+  request that pays the load;
+* ``warm_up``: the same, with ``OllamaProvider.warm_up`` fired before the
+  setup so the load overlaps it;
+* ``preloaded``: the model was loaded beforehand (``ollama preload`` or a
+  long ``keep_alive``), so only the request itself is timed.
+
+Usage: python -m benchmarks.bench_warm_up [--load 0.5] [--prep 0.2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_server import StubServer
+from contentforge.providers.ollama_provider import OllamaProvider
+
+
+async def _first_request(base_url: str, model: str, prep: float, warm: bool) -> float:
+    async with OllamaProvider(base_url=base_url, model=model) as prov:
+        start = time.perf_counter()
+        if warm:
+            prov.warm_up()
+        await asyncio.sleep(prep)
+        await prov.generate("hello")
+        return time.perf_counter() - start
+
+
+async def main(load: float, prep: float) -> dict:
+    async with StubServer(response="hi there", load_time=load) as server:
+        cold = await _first_request(server.base_url, "cold", prep, warm=False)
+        warm = await _first_request(server.base_url, "warm", prep, warm=True)
+        async with OllamaProvider(base_url=server.base_url, model="preloaded") as prov:
+            await prov.preload()
+        preloaded = await _first_request(server.base_url, "preloaded", 0.0, warm=False)
+        loads = server.loads
+    return {
+        "load_ms": load * 1000,
+        "prep_ms": prep * 1000,
+        "cold_ms": cold * 1000,
+        "warm_up_ms": warm * 1000,
+        "preloaded_ms": preloaded * 1000,
+        "loads": loads,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--load", type=float, default=0.5, help="model load time (s)")
+    parser.add_argument("--prep", type=float, default=0.2, help="setup before the request (s)")
+    args = parser.parse_args()
+
+    r = asyncio.run(main(args.load, args.prep))
+    print(f"model load {r['load_ms']:.0f} ms, setup {r['prep_ms']:.0f} ms")
+    print(f"  cold:      {r['cold_ms']:7.1f} ms")
+    print(f"  warm_up:   {r['warm_up_ms']:7.1f} ms")
+    print(f"  preloaded: {r['preloaded_ms']:7.1f} ms")
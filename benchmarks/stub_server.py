@@ -0,0 +1,306 @@
+"""Fake LLM server speaking the Ollama and OpenAI chat-completions protocols.
+
+Routes::
+
+    POST /api/generate                 Ollama: one JSON object, or NDJSON when "stream": true
+                                       (without a prompt it only loads the model)
+    GET  /api/ps                       Ollama: loaded models
+    POST /v1/chat/completions          OpenAI: chat.completion, or SSE chunks when "stream": true
+    GET  /api/tags, GET /v1/models     health probes
+
+The response text is split on whitespace into "tokens"; streams send
+``chunk_size`` tokens per chunk, paced to ``tokens_per_second`` (0 = as fast
+as possible) after waiting ``latency`` seconds for the first byte. Non-streamed
+responses arrive once the whole text would have been generated.
+
+Prompts are tokenized the same way to emulate provider prefix caches: the
+leading tokens a request shares with the previous request for the same model
+(or OpenAI ``prompt_cache_key``) are reported as cached, via Ollama's
+``context``/``prompt_eval_count`` and OpenAI's ``prompt_tokens_details``.
+
+With ``load_time`` > 0 an Ollama model that is not loaded takes that long to
+load before its first response (concurrent requests wait for the same load),
+and ``keep_alive: 0`` unloads it again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+
+_REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests"}
+
+
+class StubServer:
+    """Local keep-alive HTTP/1.1 server that counts TCP connections and requests.
+
+    With ``error_rate`` > 0 that fraction of requests is answered with
+    ``429 Too Many Requests`` (plus ``Retry-After`` when ``retry_after`` is set).
+    """
+
+    def __init__(
+        self,
+        response: str = "ok",
+        error_rate: float = 0.0,
+        retry_after: float | None = None,
+        seed: int = 0,
+        latency: float = 0.0,
+        chunk_size: int = 1,
+        tokens_per_second: float = 0.0,
+        load_time: float = 0.0,
+    ) -> None:
+        self.response = response
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.latency = latency
+        self.chunk_size = max(1, chunk_size)
+        self.tokens_per_second = tokens_per_second
+        self.load_time = load_time
+        self.loads = 0
+        self._loaded: dict[str, asyncio.Task] = {}
+        self._rng = random.Random(seed)
+        self.connections = 0
+        self.requests = 0
+        self.throttled = 0
+        self._prefixes: dict[str, list[str]] = {}
+        self._server: asyncio.base_events.Server | None = None
+        self.port = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def __aenter__(self) -> StubServer:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _tokens(self) -> list[str]:
+        # Keep the separating whitespace so the chunks join back to the response.
+        words = self.response.split(" ")
+        return [w + " " for w in words[:-1]] + [words[-1]]
+
+    def _chunks(self) -> list[str]:
+        tokens = self._tokens()
+        n = self.chunk_size
+        return ["".join(tokens[i : i + n]) for i in range(0, len(tokens), n)]
+
+    async def _pace(self, tokens: int) -> None:
+        if self.tokens_per_second > 0:
+            await asyncio.sleep(tokens / self.tokens_per_second)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = lines[0].split(" ", 2)
+                headers = {
+                    k.strip().lower(): v.strip()
+                    for k, _, v in (line.partition(":") for line in lines[1:] if line)
+                }
+                length = int(headers.get("content-length", "0"))
+                body = json.loads(await reader.readexactly(length)) if length else {}
+                self.requests += 1
+
+                if self._rng.random() < self.error_rate:
+                    self.throttled += 1
+                    extra = (
+                        {"Retry-After": f"{self.retry_after:g}"}
+                        if self.retry_after is not None
+                        else {}
+                    )
+                    await self._send(writer, 429, b"", extra)
+                    continue
+                await self._route(writer, method, path.split("?", 1)[0], body)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(
+        self, writer: asyncio.StreamWriter, method: str, path: str, body: dict
+    ) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if path == "/api/generate":
+            model = body.get("model", "stub")
+            load_ns = await self._load(model)
+            if body.get("keep_alive") in (0, "0"):
+                self._loaded.pop(model, None)
+            if not body.get("prompt"):
+                done = {"model": model, "response": "", "done": True, "done_reason": "load"}
+                await self._send_json(writer, {**done, "load_duration": load_ns})
+                return
+            usage = self._prompt_usage(
+                body.get("model", "stub"), f"{body.get('system', '')} {body.get('prompt', '')}"
+            )
+            if body.get("stream"):
+                await self._ollama_stream(writer, usage)
+            else:
+                await self._pace(len(self._tokens()))
+                await self._send_json(writer, self._ollama_final(self.response, usage))
+        elif path.endswith("/chat/completions"):
+            model = body.get("model", "stub")
+            usage = self._prompt_usage(
+                body.get("prompt_cache_key") or model,
+                " ".join(m.get("content", "") for m in body.get("messages", [])),
+            )
+            if body.get("stream"):
+                include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+                await self._openai_stream(writer, model, usage if include_usage else None)
+            else:
+                await self._pace(len(self._tokens()))
+                await self._send_json(writer, self._openai_completion(model, usage))
+        elif path == "/api/ps":
+            await self._send_json(writer, {"models": [{"name": m} for m in self._loaded]})
+        elif path == "/api/tags":
+            await self._send_json(writer, {"models": [{"name": "stub"}]})
+        elif path.endswith("/models"):
+            await self._send_json(
+                writer, {"object": "list", "data": [{"id": "stub", "object": "model"}]}
+            )
+        else:
+            await self._send_json(writer, {"error": f"no route for {method} {path}"}, 404)
+
+    async def _load(self, model: str) -> int:
+        """Wait for ``model`` to be loaded; returns the load time in ns if this request loaded it."""
+        if self.load_time <= 0:
+            return 0
+        task = self._loaded.get(model)
+        if task is None:
+            self.loads += 1
+            task = self._loaded[model] = asyncio.create_task(asyncio.sleep(self.load_time))
+            await task
+            return int(self.load_time * 1e9)
+        await task
+        return 0
+
+    # ── Protocol payloads ──────────────────────────────────────
+
+    def _prompt_usage(self, key: str, prompt: str) -> tuple[int, int]:
+        """Return (prompt tokens, tokens shared with the previous prompt for ``key``)."""
+        words = prompt.split()
+        cached = 0
+        for a, b in zip(self._prefixes.get(key, []), words, strict=False):
+            if a != b:
+                break
+            cached += 1
+        self._prefixes[key] = words
+        return len(words), cached
+
+    def _ollama_final(self, text: str, usage: tuple[int, int]) -> dict:
+        prompt_tokens, cached = usage
+        out = len(self._tokens())
+        evaluated = prompt_tokens - cached
+        return {
+            "response": text,
+            "done": True,
+            "context": list(range(prompt_tokens + out)),
+            "prompt_eval_count": evaluated,
+            "prompt_eval_duration": evaluated * 1_000_000,  # 1 ms per evaluated token
+            "eval_count": out,
+        }
+
+    async def _ollama_stream(self, writer: asyncio.StreamWriter, usage: tuple[int, int]) -> None:
+        await self._start_chunked(writer, "application/x-ndjson")
+        for chunk in self._chunks():
+            await self._pace(self.chunk_size)
+            line = json.dumps({"response": chunk, "done": False}) + "\n"
+            await self._write_chunk(writer, line.encode())
+        final = json.dumps(self._ollama_final("", usage)) + "\n"
+        await self._write_chunk(writer, final.encode())
+        await self._end_chunked(writer)
+
+    def _usage(self, usage: tuple[int, int]) -> dict:
+        prompt_tokens, cached = usage
+        out = len(self._tokens())
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": out,
+            "total_tokens": prompt_tokens + out,
+            "prompt_tokens_details": {"cached_tokens": cached},
+        }
+
+    def _openai_completion(self, model: str, usage: tuple[int, int]) -> dict:
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": self.response},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": self._usage(usage),
+        }
+
+    async def _openai_stream(
+        self, writer: asyncio.StreamWriter, model: str, usage: tuple[int, int] | None
+    ) -> None:
+        base = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+        }
+
+        async def event(data: dict | str) -> None:
+            payload = data if isinstance(data, str) else json.dumps(data)
+            await self._write_chunk(writer, f"data: {payload}\n\n".encode())
+
+        await self._start_chunked(writer, "text/event-stream")
+        for chunk in self._chunks():
+            await self._pace(self.chunk_size)
+            await event(
+                {
+                    **base,
+                    "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}],
+                }
+            )
+        await event({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if usage is not None:
+            await event({**base, "choices": [], "usage": self._usage(usage)})
+        await event("[DONE]")
+        await self._end_chunked(writer)
+
+    # ── HTTP framing ───────────────────────────────────────────
+
+    async def _send(
+        self, writer: asyncio.StreamWriter, status: int, body: bytes, headers: dict | None = None
+    ) -> None:
+        head = f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\nContent-Length: {len(body)}\r\n"
+        for k, v in (headers or {}).items():
+            head += f"{k}: {v}\r\n"
+        writer.write(head.encode() + b"\r\n" + body)
+        await writer.drain()
+
+    async def _send_json(self, writer: asyncio.StreamWriter, data: dict, status: int = 200) -> None:
+        await self._send(
+            writer, status, json.dumps(data).encode(), {"Content-Type": "application/json"}
+        )
+
+    async def _start_chunked(self, writer: asyncio.StreamWriter, content_type: str) -> None:
+        writer.write(
+            f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\nTransfer-Encoding: chunked\r\n\r\n".encode()
+        )
+        await writer.drain()
+
+    async def _write_chunk(self, writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        await writer.drain()
+
+    async def _end_chunked(self, writer: asyncio.StreamWriter) -> None:
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
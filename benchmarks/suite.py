@@ -0,0 +1,287 @@
+"""Run the benchmark suite, save results and compare against a baseline.
+
+Every benchmark runs against in-process fakes (the fake LLM server in
+``benchmarks.stub_server``), so no API keys or network access are needed.
+Results are flat ``name -> value`` metrics that carry their unit and
+direction, which makes any two result files comparable.
+
+Usage:
+    python -m benchmarks.suite                       # run and print
+    python -m benchmarks.suite --save                # also write benchmarks/results/<stamp>.json
+    python -m benchmarks.suite --compare baseline.json [--tolerance 0.15]
+    python -m benchmarks.suite --only startup prompt
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+@dataclass
+class Metric:
+    """One benchmark measurement."""
+
+    value: float
+    unit: str
+    higher_is_better: bool
+
+
+def _startup() -> dict[str, Metric]:
+    from benchmarks.bench_startup import import_time_us
+
+    best = min(import_time_us()[0] for _ in range(5)) / 1000
+    return {"startup.import_cli": Metric(best, "ms", False)}
+
+
+def _prompt() -> dict[str, Metric]:
+    from benchmarks import bench_prompt
+
+    r = bench_prompt.main(rounds=2000)
+    return {
+        "prompt.render": Metric(r["renders_per_second"], "renders/s", True),
+        "prompt.render_columns": Metric(r["bulk_rows_per_second"], "rows/s", True),
+    }
+
+
+def _template_index() -> dict[str, Metric]:
+    from benchmarks import bench_template_index
+
+    r = bench_template_index.main(300)
+    return {
+        "template_index.parse_all": Metric(r["parse_all_ms"], "ms", False),
+        "template_index.warm": Metric(r["warm_index_ms"], "ms", False),
+    }
+
+
+def _stream_render() -> dict[str, Metric]:
+    from benchmarks import bench_stream_render
+
+    (r,) = bench_stream_render.main([500])
+    us = 1e6 / r["chunks"]
+    return {
+        "stream_render.incremental": Metric(r["incremental_s"] * us, "us/chunk", False),
+        "stream_render.run_stream_markdown": Metric(
+            r["run_stream_markdown_s"] * us, "us/chunk", False
+        ),
+        "stream_render.run_stream_plain": Metric(r["run_stream_plain_s"] * us, "us/chunk", False),
+    }
+
+
+def _transport() -> dict[str, Metric]:
+    from benchmarks import bench_transport
+
+    rows = asyncio.run(bench_transport.main(300, 16))
+    return {f"transport.{r['mode']}": Metric(r["rps"], "req/s", True) for r in rows}
+
+
+def _provider_stream() -> dict[str, Metric]:
+    from benchmarks import bench_provider_stream
+
+    metrics: dict[str, Metric] = {}
+    for r in asyncio.run(bench_provider_stream.main(2000, 1, 0.05)):
+        name = r["provider"]
+        metrics[f"provider_stream.{name}"] = Metric(r["chunks_per_second"], "chunks/s", True)
+        metrics[f"provider_stream.{name}_ttft_overhead"] = Metric(
+            r["ttft_overhead_ms"], "ms", False
+        )
+    return metrics
+
+
+def _prefix_cache() -> dict[str, Metric]:
+    from benchmarks import bench_prefix_cache
+
+    return {
+        f"prefix_cache.{r['provider']}_hit_rate": Metric(r["hit_rate"] * 100, "%", True)
+        for r in asyncio.run(bench_prefix_cache.main(50))
+        if r["layout"] == "stable-first"
+    }
+
+
+def _warm_up() -> dict[str, Metric]:
+    from benchmarks import bench_warm_up
+
+    r = asyncio.run(bench_warm_up.main(load=0.5, prep=0.2))
+    return {
+        "warm_up.cold": Metric(r["cold_ms"], "ms", False),
+        "warm_up.warm_up": Metric(r["warm_up_ms"], "ms", False),
+    }
+
+
+def _batch() -> dict[str, Metric]:
+    from benchmarks import bench_batch
+
+    r = asyncio.run(bench_batch.main(rows=400, concurrency=16, latency=0.02))
+    dup = asyncio.run(bench_batch.main(rows=200, concurrency=16, latency=0.02, repeat=4))
+    return {
+        "batch.throughput": Metric(r["rows_per_second"], "rows/s", True),
+        "batch.dedup_ratio": Metric(dup["dedup_ratio"] * 100, "%", True),
+    }
+
+
+def _long_form() -> dict[str, Metric]:
+    from benchmarks import bench_long_form
+
+    r = asyncio.run(bench_long_form.main(sections=6, words=150, tps=1000))
+    return {
+        "long_form.serial": Metric(r["serial_total_ms"], "ms", False),
+        "long_form.sections": Metric(r["long_form_total_ms"], "ms", False),
+    }
+
+
+def _campaign() -> dict[str, Metric]:
+    from benchmarks import bench_campaign
+
+    r = asyncio.run(bench_campaign.main(words=200, tps=1000))
+    return {
+        "campaign.serial": Metric(r["serial_ms"], "ms", False),
+        "campaign.graph": Metric(r["graph_ms"], "ms", False),
+    }
+
+
+def _structured() -> dict[str, Metric]:
+    from benchmarks import bench_structured
+
+    r = asyncio.run(bench_structured.main(tps=400, fields=40))
+    return {
+        "structured.first_field": Metric(r["first_field_ms"], "ms", False),
+        "structured.reply": Metric(r["reply_ms"], "ms", False),
+        "structured.parser": Metric(r["parser_mb_per_s"], "MB/s", True),
+    }
+
+
+def _history() -> dict[str, Metric]:
+    from benchmarks import bench_history
+
+    r = bench_history.main(20_000)
+    return {
+        "history.record": Metric(r["record_us"], "us", False),
+        "history.insert": Metric(r["insert_batched_per_s"], "entries/s", True),
+        "history.search_newest": Metric(r["search_common_newest_ms"], "ms", False),
+    }
+
+
+def _serve() -> dict[str, Metric]:
+    from benchmarks import bench_serve
+
+    rows, _ = asyncio.run(bench_serve.main(500, 32))
+    metrics: dict[str, Metric] = {}
+    for r in rows:
+        metrics[f"serve.{r['mode']}"] = Metric(r["rps"], "req/s", True)
+        metrics[f"serve.{r['mode']}_p99"] = Metric(r["p99_ms"], "ms", False)
+    return metrics
+
+
+BENCHMARKS: dict[str, Callable[[], dict[str, Metric]]] = {
+    "startup": _startup,
+    "prompt": _prompt,
+    "template_index": _template_index,
+    "stream_render": _stream_render,
+    "transport": _transport,
+    "provider_stream": _provider_stream,
+    "prefix_cache": _prefix_cache,
+    "warm_up": _warm_up,
+    "batch": _batch,
+    "long_form": _long_form,
+    "campaign": _campaign,
+    "structured": _structured,
+    "history": _history,
+    "serve": _serve,
+}
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(names: list[str]) -> dict:
+    metrics: dict[str, Metric] = {}
+    for name in names:
+        start = time.perf_counter()
+        metrics.update(BENCHMARKS[name]())
+        print(f"  {name} done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": {k: asdict(v) for k, v in metrics.items()},
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Print a comparison table and return the names of regressed metrics."""
+    regressions = []
+    print(f"\n{'metric':<40} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, cur in current["metrics"].items():
+        base = baseline["metrics"].get(name)
+        if base is None or not base["value"]:
+            print(f"{name:<40} {'-':>12} {cur['value']:>12.2f} {'new':>9}")
+            continue
+        change = (cur["value"] - base["value"]) / abs(base["value"])
+        worse = -change if cur["higher_is_better"] else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<40} {base['value']:>12.2f} {cur['value']:>12.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument(
+        "--save",
+        nargs="?",
+        const="",
+        default=None,
+        help="Write results as JSON (default: benchmarks/results/<timestamp>.json)",
+    )
+    parser.add_argument("--compare", type=Path, help="Baseline results file to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15, help="Allowed relative slowdown (default 0.15)"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.only)
+    for name, m in results["metrics"].items():
+        print(f"{name:<40} {m['value']:>12.2f} {m['unit']}")
+
+    if args.save is not None:
+        path = (
+            Path(args.save) if args.save else RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nSaved results to {path}")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed beyond {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
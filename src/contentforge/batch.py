@@ -0,0 +1,185 @@
+"""Concurrent batch generation over JSONL/CSV job files."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from contentforge import history, metrics
+from contentforge.providers.base import BaseProvider
+from contentforge.templates import get_template, render_prompt
+
+# Row keys that control the job rather than fill template fields
+_RESERVED_KEYS = {"id", "template"}
+
+
+@dataclass
+class BatchStats:
+    """Running counters for a batch job."""
+
+    succeeded: int = 0
+    failed: int = 0
+    tokens_used: int = 0
+    tokens_in: int = 0
+    tokens_cached: int = 0
+    coalesced: int = 0  # rows answered by an identical request already in flight
+    started: float = field(default_factory=time.perf_counter)
+    finished: float | None = None
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def prefix_cache_hit_rate(self) -> float | None:
+        """Share of prompt tokens served from the provider's prefix cache."""
+        return self.tokens_cached / self.tokens_in if self.tokens_in else None
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Share of succeeded rows that shared another row's upstream call."""
+        return self.coalesced / self.succeeded if self.succeeded else 0.0
+
+
+def iter_jobs(path: str | Path) -> Iterator[dict[str, str]]:
+    """Lazily yield job rows from a ``.jsonl`` or ``.csv`` file.
+
+    Rows are read one at a time so memory stays flat regardless of file size.
+    """
+    p = Path(path)
+    if p.suffix.lower() == ".csv":
+        with p.open(encoding="utf-8", newline="") as fh:
+            for row in csv.DictReader(fh):
+                yield {k: v or "" for k, v in row.items() if k is not None}
+        return
+
+    with p.open(encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{p.name}:{lineno}: invalid JSON ({e.msg})") from None
+            if not isinstance(row, dict):
+                raise ValueError(f"{p.name}:{lineno}: expected a JSON object")
+            yield {k: "" if v is None else str(v) for k, v in row.items()}
+
+
+async def _process_row(
+    prov: BaseProvider,
+    index: int,
+    row: dict[str, str],
+    template_id: str | None,
+    temperature: float,
+    max_tokens: int,
+    stats: BatchStats | None = None,
+    record_history: bool = False,
+) -> dict:
+    """Render and generate a single row. Errors are captured in the record.
+
+    Prompt token usage (including prefix-cache hits) and coalesced duplicates
+    are added to ``stats``;
+    with ``record_history`` fresh (uncached) results go to the history database.
+    """
+    tid = row.get("template") or template_id or ""
+    record: dict = {"index": index}
+    if "id" in row:
+        record["id"] = row["id"]
+    record["template"] = tid
+
+    try:
+        tpl = get_template(tid)
+        variables = {k: v for k, v in row.items() if k not in _RESERVED_KEYS}
+        user_prompt = render_prompt(tpl, variables)
+        with metrics.collecting(metrics.GenerationMetrics(template=tid)) as m:
+            result = await prov.generate(user_prompt, tpl.system_prompt, temperature, max_tokens)
+    except Exception as e:
+        record["error"] = str(e) or type(e).__name__
+        return record
+
+    if stats is not None:
+        stats.tokens_in += m.tokens_in
+        stats.tokens_cached += m.tokens_cached
+        stats.coalesced += m.coalesced
+    record.update(
+        content=result.content,
+        provider=result.provider,
+        model=result.model,
+        tokens_used=result.tokens_used,
+        finish_reason=result.finish_reason,
+    )
+    if record_history:
+        history.record_result(result, variables, m)
+    return record
+
+
+async def run_batch(
+    prov: BaseProvider,
+    jobs: Iterable[dict[str, str]],
+    write: Callable[[dict], None],
+    template_id: str | None = None,
+    concurrency: int = 8,
+    temperature: float = 0.7,
+    max_tokens: int = 2000,
+    progress: Callable[[BatchStats], None] | None = None,
+    record_history: bool = False,
+) -> BatchStats:
+    """Generate content for every job row with bounded concurrency.
+
+    A single producer feeds a bounded queue drained by ``concurrency`` workers,
+    so at most ``2 * concurrency`` rows are held in memory at once. Each result
+    record is passed to ``write`` as soon as it completes (not in input order).
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    stats = BatchStats()
+    queue: asyncio.Queue[tuple[int, dict[str, str]] | None] = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def _produce() -> None:
+        for index, row in enumerate(jobs):
+            await queue.put((index, row))
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def _work() -> None:
+        while (item := await queue.get()) is not None:
+            index, row = item
+            record = await _process_row(
+                prov, index, row, template_id, temperature, max_tokens, stats, record_history
+            )
+            if "error" in record:
+                stats.failed += 1
+            else:
+                stats.succeeded += 1
+                stats.tokens_used += record["tokens_used"]
+            write(record)
+            if progress:
+                progress(stats)
+
+    tasks = [asyncio.create_task(_produce())]
+    tasks += [asyncio.create_task(_work()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for t in tasks:
+            t.cancel()
+        stats.finished = time.perf_counter()
+    return stats
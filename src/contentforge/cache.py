@@ -0,0 +1,229 @@
+"""Persistent content-addressed response cache (SQLite, LRU + TTL)."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from contentforge import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    content TEXT NOT NULL,
+    chunks TEXT NOT NULL,
+    tokens_used INTEGER NOT NULL DEFAULT 0,
+    finish_reason TEXT NOT NULL DEFAULT 'stop',
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def cache_path() -> Path:
+    """Return the path to the response cache database."""
+    return config.APP_DIR / "cache.sqlite"
+
+
+def request_key(
+    provider: str,
+    model: str,
+    system_prompt: str,
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """Hash a fully rendered request into a stable cache key."""
+    payload = json.dumps(
+        [provider, model, system_prompt, prompt, float(temperature), int(max_tokens)],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """A cached provider response."""
+
+    content: str
+    chunks: list[str]
+    provider: str
+    model: str
+    tokens_used: int = 0
+    finish_reason: str = "stop"
+
+
+@dataclass
+class CacheStats:
+    """Summary of the cache contents."""
+
+    path: Path
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    oldest: float | None
+    newest: float | None
+
+
+class ResponseCache:
+    """On-disk response cache with LRU eviction by total size and a TTL.
+
+    The database is opened lazily so constructing a cache costs nothing
+    for runs that never reach the provider. The size budget is summed in the
+    write transaction that evicts, so processes sharing the file (a batch next
+    to ``serve``) all enforce the same total.
+    """
+
+    def __init__(self, path: Path, max_bytes: int, ttl: float = 0.0) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl  # seconds; 0 disables expiry
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl > 0 and now - created > self.ttl
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry for ``key`` (refreshing its LRU position) or None."""
+        db = self._db()
+        row = db.execute(
+            "SELECT content, chunks, provider, model, tokens_used, finish_reason, created "
+            "FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if self._expired(row[6], now):
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            db.commit()
+            return None
+
+        db.execute("UPDATE responses SET accessed = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        db.commit()
+        return CacheEntry(
+            content=row[0],
+            chunks=json.loads(row[1]),
+            provider=row[2],
+            model=row[3],
+            tokens_used=row[4],
+            finish_reason=row[5],
+        )
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """Store ``entry`` under ``key`` and evict least-recently-used rows if over size."""
+        chunks = json.dumps(entry.chunks, ensure_ascii=False)
+        size = len(entry.content.encode()) + len(chunks.encode())
+        if size > self.max_bytes:
+            return
+
+        db = self._db()
+        now = time.time()
+        db.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, provider, model, content, chunks, tokens_used, finish_reason, size, created, accessed) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                entry.provider,
+                entry.model,
+                entry.content,
+                chunks,
+                entry.tokens_used,
+                entry.finish_reason,
+                size,
+                now,
+                now,
+            ),
+        )
+        # The insert holds the write lock until commit, so the total summed by
+        # _evict cannot change under it.
+        self._evict(db)
+        db.commit()
+
+    def _evict(self, db: sqlite3.Connection) -> int:
+        """Drop least-recently-used rows until the cache fits in ``max_bytes``."""
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return 0
+        victims: list[str] = []
+        freed = 0
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            victims.append(key)
+            freed += size
+            if freed >= excess:
+                break
+        db.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k in victims])
+        return len(victims)
+
+    def prune(self) -> int:
+        """Remove expired entries and enforce the size cap. Returns rows removed."""
+        db = self._db()
+        removed = 0
+        if self.ttl > 0:
+            cutoff = time.time() - self.ttl
+            removed += db.execute("DELETE FROM responses WHERE created < ?", (cutoff,)).rowcount
+        removed += self._evict(db)
+        db.commit()
+        if removed:
+            db.execute("VACUUM")
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry. Returns rows removed."""
+        db = self._db()
+        removed = db.execute("DELETE FROM responses").rowcount
+        db.commit()
+        db.execute("VACUUM")
+        return removed
+
+    def stats(self) -> CacheStats:
+        db = self._db()
+        entries, size, hits, oldest, newest = db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0), "
+            "MIN(created), MAX(created) FROM responses"
+        ).fetchone()
+        return CacheStats(
+            path=self.path,
+            entries=entries,
+            size_bytes=size,
+            max_bytes=self.max_bytes,
+            hits=hits,
+            oldest=oldest,
+            newest=newest,
+        )
+
+
+def open_cache(cfg: config.Config | None = None) -> ResponseCache:
+    """Create a cache using the size and TTL limits from config."""
+    cfg = cfg or config.load_config()
+    return ResponseCache(
+        cache_path(),
+        max_bytes=int(cfg.cache_max_mb * 1024 * 1024),
+        ttl=cfg.cache_ttl_days * 86400,
+    )
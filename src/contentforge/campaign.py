@@ -0,0 +1,392 @@
+"""Campaigns: one brief fanned out over several templates as a dependency graph."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from graphlib import CycleError, TopologicalSorter
+from pathlib import Path
+from typing import Any
+
+from contentforge import history, metrics, structured
+from contentforge.cache import request_key
+from contentforge.config import tomllib
+from contentforge.providers.base import BaseProvider, GenerationResult
+from contentforge.templates import get_template, render_prompt
+
+MANIFEST = "campaign.json"
+
+# A value references the brief ({topic}), another node's output ({blog}) or one
+# field of a structured node ({seo.meta_title}); referencing a node makes it a
+# dependency.
+_REFERENCE = re.compile(r"\{([A-Za-z_][\w-]*(?:\.[\w-]+)*)\}")
+
+# Brief values the default plan refers to; ``product`` and ``keyword`` default to the topic.
+DEFAULT_BRIEF = {"tone": "professional", "keywords": "", "audience": "general audience", "usp": ""}
+
+
+@dataclass
+class Node:
+    """One template in a campaign, with variable values that may hold references."""
+
+    id: str
+    template: str
+    variables: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def references(self) -> set[str]:
+        return {name for value in self.variables.values() for name in _REFERENCE.findall(value)}
+
+
+# blog, seo and ad start from the brief at once; the LinkedIn post and the thread
+# are written from the finished blog post.
+DEFAULT_NODES = [
+    Node("blog", "blog", {"topic": "{topic}", "tone": "{tone}", "keywords": "{keywords}"}),
+    Node(
+        "linkedin",
+        "social",
+        {
+            "platform": "linkedin",
+            "topic": "{topic}\n\nPromote this blog post:\n\n{blog}",
+            "goal": "traffic",
+        },
+    ),
+    Node(
+        "thread",
+        "tweet-thread",
+        {"topic": "{topic}\n\nSummarise this blog post:\n\n{blog}"},
+    ),
+    Node(
+        "seo",
+        "seo",
+        {"keyword": "{keyword}", "page_type": "blog-post", "secondary_keywords": "{keywords}"},
+    ),
+    Node("ad", "ad", {"product": "{product}", "audience": "{audience}", "usp": "{usp}"}),
+]
+
+
+def build_brief(*layers: Mapping[str, str]) -> dict[str, str]:
+    """Merge brief layers (later wins) over ``DEFAULT_BRIEF``."""
+    brief = dict(DEFAULT_BRIEF)
+    for layer in layers:
+        brief.update({k: v for k, v in layer.items() if v is not None})
+    if brief.get("topic"):
+        brief.setdefault("product", brief["topic"])
+        brief.setdefault("keyword", brief["topic"])
+    return brief
+
+
+def substitute(value: str, values: Mapping[str, str]) -> str:
+    """Replace ``{name}`` references with ``values[name]``, in one pass."""
+    return _REFERENCE.sub(lambda m: values.get(m.group(1), m.group(0)), value)
+
+
+@dataclass
+class Campaign:
+    """Nodes and the brief they are filled from."""
+
+    nodes: dict[str, Node]
+    brief: dict[str, str]
+
+    def dependencies(self, node_id: str) -> set[str]:
+        return {_root(ref) for ref in self.nodes[node_id].references} & self.nodes.keys()
+
+    def graph(self) -> dict[str, set[str]]:
+        return {node_id: self.dependencies(node_id) for node_id in self.nodes}
+
+    def validate(self) -> None:
+        """Check templates, references and cycles. Raises ValueError."""
+        if not self.nodes:
+            raise ValueError("The campaign has no nodes")
+        for node in self.nodes.values():
+            try:
+                get_template(node.template)
+            except KeyError as e:
+                raise ValueError(f"Node '{node.id}': {e.args[0]}") from None
+            unknown = {
+                ref for ref in node.references if _root(ref) not in self.nodes
+            } - self.brief.keys()
+            if unknown:
+                names = ", ".join("{" + name + "}" for name in sorted(unknown))
+                raise ValueError(
+                    f"Node '{node.id}' references {names}: not a node or a brief value"
+                )
+            for ref in node.references:
+                source = self.nodes.get(_root(ref))
+                if source is not None and "." in ref and not _is_structured(source):
+                    raise ValueError(
+                        f"Node '{node.id}' references {{{ref}}}, but '{source.id}' "
+                        "has no structured output"
+                    )
+        try:
+            TopologicalSorter(self.graph()).prepare()
+        except CycleError as e:
+            raise ValueError(f"Campaign nodes form a cycle: {' -> '.join(e.args[1])}") from None
+
+
+def _is_structured(node: Node) -> bool:
+    return get_template(node.template).output_format == "structured"
+
+
+def load_plan(path: str | Path) -> tuple[list[Node], dict[str, str]]:
+    """Read a TOML plan: ``[brief]`` values and ``[nodes.<id>]`` tables.
+
+    Each node table needs ``template``; every other key is a template variable.
+    Raises ValueError for an unreadable or malformed plan.
+    """
+    p = Path(path)
+    try:
+        data = tomllib.loads(p.read_text(encoding="utf-8"))
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise ValueError(f"Cannot read plan {p}: {e}") from None
+    nodes = []
+    for node_id, table in data.get("nodes", {}).items():
+        if not isinstance(table, dict) or "template" not in table:
+            raise ValueError(f"{p.name}: [nodes.{node_id}] needs a 'template' key")
+        variables = {k: str(v) for k, v in table.items() if k != "template"}
+        nodes.append(Node(node_id, str(table["template"]), variables))
+    brief = {k: str(v) for k, v in data.get("brief", {}).items()}
+    return nodes, brief
+
+
+@dataclass
+class NodeResult:
+    """Outcome of one node.
+
+    ``status`` is ``generated``, ``cached`` (response cache), ``reused`` (the
+    output file of a previous run), ``failed`` or ``skipped`` (a dependency failed).
+    """
+
+    node: str
+    template: str
+    status: str
+    content: str = ""
+    key: str = ""
+    seconds: float = 0.0
+    tokens_used: int = 0
+    error: str = ""
+    data: Any = None  # the parsed reply of a structured node
+
+    @property
+    def ok(self) -> bool:
+        return self.status not in ("failed", "skipped")
+
+
+class CampaignDir:
+    """Node outputs and the manifest of their request keys in one directory."""
+
+    # A node is keyed by the hash of its rendered request (the response cache key).
+    # A node whose key is unchanged reuses its file, hand edits included, so editing
+    # a node's inputs or its output re-runs only that node and those downstream.
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        try:
+            data = json.loads((self.path / MANIFEST).read_text(encoding="utf-8"))
+            self.entries: dict[str, dict] = data.get("nodes", {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def reusable(self, node_id: str, key: str) -> str | None:
+        """The saved output of ``node_id`` if it was produced from ``key``."""
+        entry = self.entries.get(node_id)
+        if entry is None or entry.get("key") != key:
+            return None
+        try:
+            return (self.path / entry["file"]).read_text(encoding="utf-8")
+        except (OSError, KeyError):
+            return None
+
+    def save(self, result: NodeResult) -> None:
+        """Write the node's output (unless reused) and update the manifest.
+
+        Structured replies are saved as ``<node>.json``, others as ``<node>.md``.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        name = f"{result.node}.json" if result.data is not None else f"{result.node}.md"
+        if result.status != "reused":
+            _write_atomic(self.path / name, result.content)
+        self.entries[result.node] = {"template": result.template, "key": result.key, "file": name}
+        _write_atomic(self.path / MANIFEST, json.dumps({"nodes": self.entries}, indent=2))
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class _DependencyError(Exception):
+    """A referenced node failed, or its reply has no such field."""
+
+
+class _Outputs:
+    """Referenced node outputs and fields, awaited by the nodes that use them."""
+
+    def __init__(self, names: set[str]) -> None:
+        loop = asyncio.get_running_loop()
+        self._futures: dict[str, asyncio.Future] = {name: loop.create_future() for name in names}
+
+    async def get(self, name: str) -> str:
+        return await self._futures[name]
+
+    def resolve(self, name: str, value: str) -> None:
+        future = self._futures.get(name)
+        if future is not None and not future.done():
+            future.set_result(value)
+
+    def finish(self, result: NodeResult) -> None:
+        """Resolve everything still pending from a finished node, or fail it."""
+        for name, future in self._futures.items():
+            if future.done() or _root(name) != result.node:
+                continue
+            if not result.ok:
+                _fail(future, f"depends on {result.node}")
+            elif name == result.node:
+                future.set_result(result.content.strip())
+            else:
+                try:
+                    future.set_result(structured.as_text(_field(result.data, name)))
+                except (KeyError, IndexError, TypeError, ValueError):
+                    _fail(future, f"{result.node} has no field {name.split('.', 1)[1]}")
+
+
+def _fail(future: asyncio.Future, message: str) -> None:
+    future.set_exception(_DependencyError(message))
+    future.exception()  # marks it retrieved: a skipped node need not await all its inputs
+
+
+def _root(reference: str) -> str:
+    return reference.split(".", 1)[0]
+
+
+def _field(data: Any, reference: str) -> Any:
+    for part in reference.split(".")[1:]:
+        data = data[int(part)] if isinstance(data, list) else data[part]
+    return data
+
+
+async def _run_node(
+    prov: BaseProvider,
+    campaign: Campaign,
+    node: Node,
+    outputs: _Outputs,
+    temperature: float,
+    max_tokens: int,
+    store: CampaignDir | None,
+    record_history: bool,
+) -> NodeResult:
+    result = NodeResult(node.id, node.template, "failed")
+    values = dict(campaign.brief)
+    try:
+        for reference in sorted(node.references):
+            if _root(reference) in campaign.nodes:
+                values[reference] = await outputs.get(reference)
+    except _DependencyError as e:
+        result.status, result.error = "skipped", str(e)
+        return result
+
+    start = time.perf_counter()
+    try:
+        tpl = get_template(node.template)
+        is_structured = tpl.output_format == "structured"
+        system_prompt = structured.system_prompt(tpl) if is_structured else tpl.system_prompt
+        variables = {k: substitute(v, values) for k, v in node.variables.items()}
+        prompt = render_prompt(tpl, variables)
+        result.key = request_key(
+            prov.name, prov.model, system_prompt, prompt, temperature, max_tokens
+        )
+        saved = store.reusable(node.id, result.key) if store is not None else None
+        if saved is not None:
+            result.status, result.content = "reused", saved
+            if is_structured:
+                result.data = structured.parse(saved)
+        else:
+            with metrics.collecting(metrics.GenerationMetrics(template=tpl.id)) as m:
+                if is_structured:
+                    # Fields are handed to waiting nodes as soon as each one closes.
+                    parser = structured.JsonStreamParser()
+                    chunks: list[str] = []
+                    with structured.requesting(tpl.output_schema):
+                        async for chunk in prov.stream(
+                            prompt, system_prompt, temperature, max_tokens
+                        ):
+                            chunks.append(chunk)
+                            for path, value in parser.feed(chunk):
+                                if path:
+                                    name = f"{node.id}.{structured.path_name(path)}"
+                                    outputs.resolve(name, structured.as_text(value))
+                    result.data = parser.close()
+                    tokens = m.tokens_in + m.tokens_out
+                    generated = GenerationResult("".join(chunks), prov.name, prov.model, tokens)
+                else:
+                    generated = await prov.generate(prompt, system_prompt, temperature, max_tokens)
+            result.status = "cached" if m.cached else "generated"
+            result.content = generated.content
+            result.tokens_used = generated.tokens_used
+            if record_history:
+                history.record_result(generated, variables, m)
+        if store is not None:
+            store.save(result)
+    except Exception as e:
+        result.status, result.error = "failed", str(e) or type(e).__name__
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+async def run_campaign(
+    prov: BaseProvider,
+    campaign: Campaign,
+    temperature: float = 0.7,
+    max_tokens: int = 2000,
+    output_dir: str | Path | None = None,
+    reuse: bool = True,
+    on_result: Callable[[NodeResult], None] | None = None,
+    record_history: bool = False,
+) -> dict[str, NodeResult]:
+    """Run every node once its inputs are available; return results by node id.
+
+    A field reference is available as soon as that field closes in the stream.
+    Independent nodes run in parallel; a failed node only skips its dependents.
+
+    With ``output_dir``, outputs and their keys are saved there, and with
+    ``reuse`` unchanged nodes are read back instead of generated. ``on_result``
+    is called as each node finishes. Raises ValueError for an invalid campaign.
+    """
+    campaign.validate()
+    store = CampaignDir(output_dir) if output_dir is not None else None
+    if store is not None and not reuse:
+        store.entries = {}
+    outputs = _Outputs(
+        {
+            reference
+            for node in campaign.nodes.values()
+            for reference in node.references
+            if _root(reference) in campaign.nodes
+        }
+    )
+
+    async def run(node: Node) -> NodeResult:
+        result = await _run_node(
+            prov, campaign, node, outputs, temperature, max_tokens, store, record_history
+        )
+        outputs.finish(result)
+        return result
+
+    results: dict[str, NodeResult] = {}
+    tasks = [asyncio.create_task(run(node)) for node in campaign.nodes.values()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            results[result.node] = result
+            if on_result is not None:
+                on_result(result)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return results
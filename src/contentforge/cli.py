@@ -2,14 +2,73 @@
 
 from __future__ import annotations
 
+import importlib
+from typing import Any
+
 import typer
-from rich.console import Console
+from typer.core import TyperCommand, TyperGroup
 
 from contentforge import __app_name__, __version__
 
-console = Console(stderr=True)
+# name -> (module, Typer attribute, help). Command modules are imported only when
+# their sub-command is invoked, so e.g. `--version` never loads rich or httpx.
+_LAZY_COMMANDS: dict[str, tuple[str, str, str]] = {
+    "generate": (
+        "contentforge.commands.generate",
+        "generate_app",
+        "Generate content from templates.",
+    ),
+    "templates": (
+        "contentforge.commands.templates_cmd",
+        "templates_app",
+        "Browse available templates.",
+    ),
+    "providers": ("contentforge.commands.providers_cmd", "providers_app", "Manage LLM providers."),
+    "config": ("contentforge.commands.config_cmd", "config_app", "Manage configuration."),
+    "cache": ("contentforge.commands.cache_cmd", "cache_app", "Manage the local response cache."),
+    "history": (
+        "contentforge.commands.history_cmd",
+        "history_app",
+        "Search and export generation history.",
+    ),
+    "jobs": ("contentforge.commands.jobs_cmd", "jobs_app", "Manage offline Batch API jobs."),
+    "ollama": ("contentforge.commands.ollama_cmd", "ollama_app", "Manage local Ollama models."),
+    "serve": ("contentforge.commands.serve_cmd", "serve_app", "Serve a local HTTP API."),
+}
+
+
+class _LazyGroup(TyperGroup):
+    """Root group that resolves sub-command modules on first use."""
+
+    _listing_help = False
+
+    def list_commands(self, ctx: typer.Context) -> list[str]:
+        return [*super().list_commands(ctx), *_LAZY_COMMANDS]
+
+    def get_command(self, ctx: typer.Context, cmd_name: str) -> Any:
+        if cmd_name not in _LAZY_COMMANDS:
+            return super().get_command(ctx, cmd_name)
+        module, attr, help_text = _LAZY_COMMANDS[cmd_name]
+        if self._listing_help:
+            # The root help page only needs names and summaries.
+            return TyperCommand(cmd_name, help=help_text)
+        sub_app = getattr(importlib.import_module(module), attr)
+        cmd = typer.main.get_group(sub_app)
+        cmd.name = cmd_name
+        cmd.help = help_text
+        return cmd
+
+    def format_help(self, ctx: typer.Context, formatter: Any) -> None:
+        self._listing_help = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self._listing_help = False
+
+
 app = typer.Typer(
     name=__app_name__,
+    cls=_LazyGroup,
     help="Generate content using LLMs from your terminal.",
     no_args_is_help=True,
     rich_markup_mode="rich",
@@ -18,6 +77,7 @@ app = typer.Typer(
 
 def _version_callback(value: bool) -> None:
     if value:
+        from rich.console import Console
         from rich.text import Text
 
         out = Console()
@@ -37,18 +97,3 @@ def main(
     ),
 ) -> None:
     """ContentForge - generate content using LLMs from your terminal."""
-
-
-def _register_commands() -> None:
-    from contentforge.commands.config_cmd import config_app
-    from contentforge.commands.generate import generate_app
-    from contentforge.commands.providers_cmd import providers_app
-    from contentforge.commands.templates_cmd import templates_app
-
-    app.add_typer(generate_app, name="generate", help="Generate content from templates.")
-    app.add_typer(templates_app, name="templates", help="Browse available templates.")
-    app.add_typer(providers_app, name="providers", help="Manage LLM providers.")
-    app.add_typer(config_app, name="config", help="Manage configuration.")
-
-
-_register_commands()
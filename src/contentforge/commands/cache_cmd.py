@@ -0,0 +1,72 @@
+"""Response cache management commands."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from contentforge.cache import open_cache
+
+cache_app = typer.Typer(invoke_without_command=True)
+console = Console()
+
+
+def _fmt_size(n: int) -> str:
+    size = float(n)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def _fmt_time(ts: float | None) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M") if ts else "-"
+
+
+@cache_app.callback()
+def cache_default(ctx: typer.Context) -> None:
+    """Show response cache statistics."""
+    if ctx.invoked_subcommand is None:
+        stats()
+
+
+@cache_app.command("stats")
+def stats() -> None:
+    """Show response cache statistics."""
+    cache = open_cache()
+    s = cache.stats()
+    cache.close()
+
+    table = Table(title="Response Cache", border_style="cyan")
+    table.add_column("Key", style="cyan")
+    table.add_column("Value")
+    table.add_row("entries", str(s.entries))
+    table.add_row("size", f"{_fmt_size(s.size_bytes)} / {_fmt_size(s.max_bytes)}")
+    table.add_row("hits", str(s.hits))
+    table.add_row("oldest", _fmt_time(s.oldest))
+    table.add_row("newest", _fmt_time(s.newest))
+
+    console.print(table)
+    console.print(f"\n[dim]Cache file: {s.path}[/dim]")
+
+
+@cache_app.command("prune")
+def prune() -> None:
+    """Remove expired entries and enforce the size limit."""
+    cache = open_cache()
+    removed = cache.prune()
+    cache.close()
+    console.print(f"[green]Pruned[/green] {removed} entries")
+
+
+@cache_app.command("clear")
+def clear() -> None:
+    """Remove every cached response."""
+    cache = open_cache()
+    removed = cache.clear()
+    cache.close()
+    console.print(f"[green]Cleared[/green] {removed} entries")
@@ -1,15 +1,26 @@
-"""Generate subcommands - 8 content types."""
+"""Generate subcommands - 8 content types, any template via ``run``, campaigns and batch mode."""
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import json
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
 
 import typer
 
-from contentforge import output
+from contentforge import history, metrics, output, structured
 from contentforge.config import load_config
-from contentforge.providers import get_provider
-from contentforge.templates import get_template
+from contentforge.providers import (
+    BaseProvider,
+    GenerationResult,
+    MultiResult,
+    get_provider,
+    warm_up,
+)
+from contentforge.templates import TemplateError, get_template, render_prompt
 
 generate_app = typer.Typer(no_args_is_help=True)
 
@@ -23,6 +34,114 @@ _copy_opt = typer.Option(False, "--copy", help="Copy result to clipboard")
 _stream_opt = typer.Option(None, "--stream/--no-stream", help="Enable/disable streaming")
 _temp_opt = typer.Option(None, "--temperature", help="Sampling temperature (0.0-2.0)")
 _max_tokens_opt = typer.Option(None, "--max-tokens", help="Max output tokens")
+_cache_opt = typer.Option(
+    None, "--cache/--no-cache", help="Serve repeated requests from the local cache"
+)
+_refresh_opt = typer.Option(False, "--refresh", help="Ignore cached responses and store fresh ones")
+_metrics_opt = typer.Option(
+    False, "--metrics", help="Print timings and token counts as JSON (stderr)"
+)
+_hedge_opt = typer.Option(
+    None,
+    "--hedge",
+    help="Backup provider or provider/model raced if the first token is slow ('none' disables)",
+)
+_variants_opt = typer.Option(
+    1, "--variants", "-n", min=1, max=10, help="Generate N alternatives in one request"
+)
+_structured_opt = typer.Option(
+    None,
+    "--structured/--no-structured",
+    help="Ask for JSON fields and show each one as soon as it is complete",
+)
+
+
+async def _generate_and_close(
+    prov: BaseProvider, prompt: str, system_prompt: str, temperature: float, max_tokens: int
+) -> GenerationResult:
+    m = metrics.current()
+    async with prov:
+        if m is not None:
+            m.request_started()
+        result = await prov.generate(prompt, system_prompt, temperature, max_tokens)
+        if m is not None:
+            m.finish()
+        return result
+
+
+async def _stream_and_close(
+    prov: BaseProvider, prompt: str, system_prompt: str, temperature: float, max_tokens: int
+) -> AsyncIterator[str]:
+    # Closing inside the generator keeps the pool in the loop that consumes the stream.
+    m = metrics.current()
+    async with prov:
+        if m is not None:
+            m.request_started()
+        async for chunk in prov.stream(prompt, system_prompt, temperature, max_tokens):
+            if m is not None:
+                m.chunk()
+            yield chunk
+        if m is not None:
+            m.finish()
+
+
+async def _long_form_and_close(
+    prov: BaseProvider,
+    system_prompt: str,
+    variables: dict[str, str],
+    temperature: float,
+    max_tokens: int,
+) -> AsyncIterator[str]:
+    from contentforge.longform import stream_long_form
+
+    m = metrics.current()
+    async with prov:
+        if m is not None:
+            m.request_started()
+        async for chunk in stream_long_form(
+            prov, system_prompt, variables, temperature, max_tokens
+        ):
+            if m is not None:
+                m.chunk()
+            yield chunk
+        if m is not None:
+            m.finish()
+
+
+async def _collect(chunks: AsyncIterator[str]) -> str:
+    return "".join([chunk async for chunk in chunks])
+
+
+async def _variants_and_close(
+    prov: BaseProvider,
+    prompt: str,
+    system_prompt: str,
+    temperature: float,
+    max_tokens: int,
+    n: int,
+) -> MultiResult:
+    m = metrics.current()
+    async with prov:
+        if m is not None:
+            m.request_started()
+        result = await prov.generate_variants(prompt, system_prompt, temperature, max_tokens, n)
+        if m is not None:
+            m.finish()
+        return result
+
+
+def _structured_markdown(content: str) -> str:
+    """Render a JSON reply as markdown; a reply that is not valid JSON is shown as is."""
+    try:
+        return structured.to_markdown(structured.parse(content))
+    except ValueError:
+        output.err_console.print("[yellow]The reply is not valid JSON; showing it as is[/yellow]")
+        return content
+
+
+def _served_by(prov: BaseProvider, m: metrics.GenerationMetrics) -> tuple[str, str]:
+    """Provider and model that produced the response (the winner when hedged)."""
+    return (m.provider, m.model) if m.provider else (prov.name, prov.model)
 
 
 def _run_generation(
@@ -36,80 +155,183 @@ def _run_generation(
     do_stream: bool | None,
     temperature: float | None,
     max_tokens: int | None,
+    cache: bool | None = None,
+    refresh: bool = False,
+    hedge: str | None = None,
+    show_metrics: bool = False,
+    variants: int = 1,
+    long_form: bool = False,
+    structured_output: bool | None = None,
 ) -> None:
-    """Core generation logic shared by all subcommands."""
-    cfg = load_config()
+    """Core generation logic shared by all subcommands.
+
+    ``long_form`` (blog only) writes an outline, then all sections concurrently.
+    ``structured_output`` asks for JSON matching the template's output schema
+    (default: templates with ``output_format = "structured"``).
+    """
+    m = metrics.GenerationMetrics(template=template_id)
+    with m.phase("config_load"):
+        cfg = load_config()
     fmt = fmt or cfg.default_format
     do_stream = do_stream if do_stream is not None else cfg.stream
     temperature = temperature if temperature is not None else cfg.default_temperature
     max_tokens = max_tokens if max_tokens is not None else cfg.default_max_tokens
+    # Ollama loads the model while the template and prompt are prepared.
+    warm_up(provider, model, cfg)
 
     try:
         tpl = get_template(template_id)
     except KeyError as e:
         output.print_error(str(e))
         raise typer.Exit(1) from None
-
-    # Fill defaults for missing optional fields
-    for field in tpl.fields:
-        if field.name not in variables or not variables[field.name]:
-            if field.default:
-                variables[field.name] = field.default
-            elif not field.required:
-                variables[field.name] = ""
-
-    # Special handling for blog keywords line
-    if template_id == "blog":
-        kw = variables.get("keywords", "")
-        variables["keywords_line"] = f"Include these SEO keywords naturally: {kw}" if kw else ""
-    if "keywords_line" not in variables:
-        variables["keywords_line"] = ""
+    if structured_output is None:
+        structured_output = tpl.output_format == "structured"
+    elif structured_output and tpl.output_format != "structured":
+        output.print_error(f"Template '{tpl.id}' has no structured output")
+        raise typer.Exit(1)
+    system_prompt = structured.system_prompt(tpl) if structured_output else tpl.system_prompt
+    json_mode = (
+        structured.requesting(tpl.output_schema) if structured_output else contextlib.nullcontext()
+    )
 
     # Build prompt
     try:
-        user_prompt = tpl.user_prompt_template.format(**variables)
-    except KeyError as e:
-        output.print_error(f"Missing required field: {e}")
+        with m.phase("prompt_build"):
+            user_prompt = render_prompt(tpl, variables)
+    except TemplateError as e:
+        output.print_error(str(e))
         raise typer.Exit(1) from None
 
     try:
-        prov = get_provider(provider, model)
+        with m.phase("provider_init"):
+            prov = get_provider(provider, model, cache=cache, refresh=refresh, cfg=cfg, hedge=hedge)
     except ValueError as e:
         output.print_error(str(e))
         raise typer.Exit(1) from None
 
-    output.err_console.print(
-        f"[dim]Using {prov.name}/{prov.model} • template: {template_id}[/dim]"
-    )
+    output.err_console.print(f"[dim]Using {prov.name}/{prov.model} • template: {template_id}[/dim]")
 
     content = ""
     tokens = 0
+    generated: list[GenerationResult] = []
+    recorded = ""  # streamed structured replies are recorded as JSON
+    sink: output.FileSink | None = None
+
+    m.streamed = do_stream and fmt != "json" and variants == 1
+    if variants > 1:
+        with output.status(f"Generating {variants} variants..."), metrics.collecting(m), json_mode:
+            multi = asyncio.run(
+                _variants_and_close(
+                    prov, user_prompt, system_prompt, temperature, max_tokens, variants
+                )
+            )
+        contents = multi.contents
+        if structured_output and fmt != "json":
+            contents = [_structured_markdown(c) for c in contents]
+        content = output.join_variants(contents)
+        tokens = multi.tokens_used
+        generated = multi.variants
 
-    if do_stream and fmt != "json":
+        if fmt == "json":
+            output.render_variants_json(
+                multi.contents, multi.provider, multi.model, tokens, multi.requests
+            )
+        else:
+            output.render_variants(contents, fmt, title=tpl.name)
+        output.err_console.print(
+            f"[dim]{len(multi.variants)} variants in {multi.requests} "
+            f"request{'s' if multi.requests > 1 else ''} • {tokens} tokens[/dim]"
+        )
+    elif m.streamed:
         # Stream iterator must be created and consumed in the same event loop,
         # so we pass the provider directly and let output handle asyncio.run().
-        chunks = prov.stream(user_prompt, tpl.system_prompt, temperature, max_tokens)
-        content = (
-            output.run_stream_plain(chunks)
-            if fmt == "plain"
-            else output.run_stream_markdown(chunks)
+        chunks = (
+            _long_form_and_close(prov, system_prompt, variables, temperature, max_tokens)
+            if long_form
+            else _stream_and_close(prov, user_prompt, system_prompt, temperature, max_tokens)
         )
+        # Structured replies are shown field by field as each one is complete.
+        parser = structured.JsonStreamParser()
+        if structured_output:
+            chunks = structured.stream_markdown(chunks, parser)
+        # With -o, chunks are teed to the file as they arrive (kept as .partial on failure).
+        if output_file:
+            sink = output.FileSink(output_file)
+            chunks = sink.tee(chunks)
+        try:
+            with metrics.collecting(m), json_mode, sink or contextlib.nullcontext():
+                content = (
+                    output.run_stream_plain(chunks)
+                    if fmt == "plain"
+                    else output.run_stream_markdown(chunks)
+                )
+        except ValueError as e:  # long-form outline without sections, malformed JSON
+            output.print_error(str(e))
+            raise typer.Exit(1) from None
+        tokens = m.tokens_in + m.tokens_out
+        if parser.done:
+            recorded = json.dumps(parser.value, ensure_ascii=False)
+    elif long_form:
+        try:
+            with output.status("Writing outline and sections..."), metrics.collecting(m):
+                content = asyncio.run(
+                    _collect(
+                        _long_form_and_close(
+                            prov, system_prompt, variables, temperature, max_tokens
+                        )
+                    )
+                )
+        except ValueError as e:
+            output.print_error(str(e))
+            raise typer.Exit(1) from None
+        tokens = m.tokens_in + m.tokens_out
+
+        if fmt == "json":
+            output.render_json(content, *_served_by(prov, m), tokens)
+        elif fmt == "plain":
+            output.render_plain(content)
+        else:
+            output.render_markdown(content, title=tpl.name)
     else:
-        with output.status("Generating..."):
+        with output.status("Generating..."), metrics.collecting(m), json_mode:
             result = asyncio.run(
-                prov.generate(user_prompt, tpl.system_prompt, temperature, max_tokens)
+                _generate_and_close(prov, user_prompt, system_prompt, temperature, max_tokens)
             )
         content = result.content
         tokens = result.tokens_used
+        generated = [result]
+
+        if structured_output and fmt != "json":
+            content = _structured_markdown(content)
 
         if fmt == "json":
-            output.render_json(content, prov.name, prov.model, tokens)
+            output.render_json(content, *_served_by(prov, m), tokens)
         elif fmt == "plain":
             output.render_plain(content)
         else:
             output.render_markdown(content, title=tpl.name)
 
-    if output_file:
+    m.provider, m.model = _served_by(prov, m)
+    if m.hedged:
+        output.err_console.print(
+            f"[dim]Slow first token from {prov.name}/{prov.model} • "
+            f"answered by {m.provider}/{m.model}[/dim]"
+        )
+    if m.cached:
+        output.err_console.print("[dim]Served from local cache (use --refresh to regenerate)[/dim]")
+
+    if show_metrics:
+        output.err_console.print_json(json.dumps(m.to_dict()))
+    if cfg.metrics_log:
+        metrics.append_log(m)
+    if cfg.metrics_textfile:
+        metrics.update_textfile(m, Path(cfg.metrics_textfile).expanduser())
+    if cfg.history_enabled:
+        # Streamed output has no result object; variants are recorded one by one.
+        recorded = recorded or content
+        for result in generated or [GenerationResult(recorded, m.provider, m.model, tokens)]:
+            history.record_result(result, variables, m)
+    if output_file and sink is None:
         output.save_to_file(content, output_file)
     if copy:
         output.copy_to_clipboard(content)
@@ -121,7 +343,9 @@ def _run_generation(
 @generate_app.command()
 def blog(
     topic: str = typer.Option(..., "--topic", help="Blog topic"),
-    tone: str = typer.Option("professional", "--tone", help="Tone: professional/casual/academic/conversational"),
+    tone: str = typer.Option(
+        "professional", "--tone", help="Tone: professional/casual/academic/conversational"
+    ),
     word_count: int = typer.Option(800, "--word-count", help="Target word count"),
     keywords: str | None = typer.Option(None, "--keywords", help="SEO keywords (comma-separated)"),
     provider: str | None = _provider_opt,
@@ -132,20 +356,48 @@ def blog(
     stream: bool | None = _stream_opt,
     temperature: float | None = _temp_opt,
     max_tokens: int | None = _max_tokens_opt,
+    cache: bool | None = _cache_opt,
+    refresh: bool = _refresh_opt,
+    hedge: str | None = _hedge_opt,
+    show_metrics: bool = _metrics_opt,
+    variants: int = _variants_opt,
+    long_form: bool = typer.Option(
+        False, "--long-form", help="Outline first, then write all sections concurrently"
+    ),
 ) -> None:
     """Generate a blog post."""
+    if long_form and variants > 1:
+        output.print_error("--long-form cannot be combined with --variants")
+        raise typer.Exit(1)
     _run_generation(
         "blog",
         {"topic": topic, "tone": tone, "word_count": str(word_count), "keywords": keywords or ""},
-        provider, model, output_file, fmt, copy, stream, temperature, max_tokens,
+        provider,
+        model,
+        output_file,
+        fmt,
+        copy,
+        stream,
+        temperature,
+        max_tokens,
+        cache,
+        refresh,
+        hedge,
+        show_metrics,
+        variants,
+        long_form,
     )
 
 
 @generate_app.command()
 def social(
     topic: str = typer.Option(..., "--topic", help="Post topic"),
-    platform: str = typer.Option("linkedin", "--platform", help="Platform: linkedin/instagram/twitter/facebook"),
-    goal: str = typer.Option("engagement", "--goal", help="Goal: engagement/awareness/traffic/conversion"),
+    platform: str = typer.Option(
+        "linkedin", "--platform", help="Platform: linkedin/instagram/twitter/facebook"
+    ),
+    goal: str = typer.Option(
+        "engagement", "--goal", help="Goal: engagement/awareness/traffic/conversion"
+    ),
     hashtags: str = typer.Option("yes", "--hashtags", help="Include hashtags: yes/no"),
     provider: str | None = _provider_opt,
     model: str | None = _model_opt,
@@ -155,19 +407,40 @@ def social(
     stream: bool | None = _stream_opt,
     temperature: float | None = _temp_opt,
     max_tokens: int | None = _max_tokens_opt,
+    cache: bool | None = _cache_opt,
+    refresh: bool = _refresh_opt,
+    hedge: str | None = _hedge_opt,
+    show_metrics: bool = _metrics_opt,
+    variants: int = _variants_opt,
 ) -> None:
     """Generate a social media post."""
     _run_generation(
         "social",
         {"platform": platform, "topic": topic, "goal": goal, "include_hashtags": hashtags},
-        provider, model, output_file, fmt, copy, stream, temperature, max_tokens,
+        provider,
+        model,
+        output_file,
+        fmt,
+        copy,
+        stream,
+        temperature,
+        max_tokens,
+        cache,
+        refresh,
+        hedge,
+        show_metrics,
+        variants,
     )
 
 
 @generate_app.command()
 def email(
     subject: str = typer.Option(..., "--subject", help="Email subject/context"),
-    type: str = typer.Option("marketing", "--type", help="Type: marketing/cold-outreach/newsletter/follow-up/announcement"),
+    type: str = typer.Option(
+        "marketing",
+        "--type",
+        help="Type: marketing/cold-outreach/newsletter/follow-up/announcement",
+    ),
     recipient: str = typer.Option("customers", "--recipient", help="Target recipient"),
     cta: str | None = typer.Option(None, "--cta", help="Call to action"),
     provider: str | None = _provider_opt,
@@ -178,12 +451,29 @@ def email(
     stream: bool | None = _stream_opt,
     temperature: float | None = _temp_opt,
     max_tokens: int | None = _max_tokens_opt,
+    cache: bool | None = _cache_opt,
+    refresh: bool = _refresh_opt,
+    hedge: str | None = _hedge_opt,
+    show_metrics: bool = _metrics_opt,
+    variants: int = _variants_opt,
 ) -> None:
     """Generate an email with subject line."""
     _run_generation(
         "email",
         {"type": type, "subject": subject, "recipient": recipient, "cta": cta or ""},
-        provider, model, output_file, fmt, copy, stream, temperature, max_tokens,
+        provider,
+        model,
+        output_file,
+        fmt,
+        copy,
+        stream,
+        temperature,
+        max_tokens,
+        cache,
+        refresh,
+        hedge,
+        show_metrics,
+        variants,
     )
 
 
@@ -191,7 +481,9 @@ def email(
 def tweet_thread(
     topic: str = typer.Option(..., "--topic", help="Thread topic"),
     count: int = typer.Option(8, "--count", help="Number of tweets"),
-    style: str = typer.Option("educational", "--style", help="Style: educational/storytelling/listicle/controversial-take"),
+    style: str = typer.Option(
+        "educational", "--style", help="Style: educational/storytelling/listicle/controversial-take"
+    ),
     provider: str | None = _provider_opt,
     model: str | None = _model_opt,
     output_file: str | None = _output_opt,
@@ -200,12 +492,29 @@ def tweet_thread(
     stream: bool | None = _stream_opt,
     temperature: float | None = _temp_opt,
     max_tokens: int | None = _max_tokens_opt,
+    cache: bool | None = _cache_opt,
+    refresh: bool = _refresh_opt,
+    hedge: str | None = _hedge_opt,
+    show_metrics: bool = _metrics_opt,
+    variants: int = _variants_opt,
 ) -> None:
     """Generate a Twitter/X thread."""
     _run_generation(
         "tweet-thread",
         {"topic": topic, "count": str(count), "style": style},
-        provider, model, output_file, fmt, copy, stream, temperature, max_tokens,
+        provider,
+        model,
+        output_file,
+        fmt,
+        copy,
+        stream,
+        temperature,
+        max_tokens,
+        cache,
+        refresh,
+        hedge,
+        show_metrics,
+        variants,
     )
 
 
@@ -213,7 +522,11 @@ def tweet_thread(
 def ad(
     product: str = typer.Option(..., "--product", help="Product or service"),
     audience: str = typer.Option(..., "--audience", help="Target audience"),
-    platform: str = typer.Option("google-ads", "--platform", help="Platform: google-ads/facebook-ads/instagram-ads/linkedin-ads"),
+    platform: str = typer.Option(
+        "google-ads",
+        "--platform",
+        help="Platform: google-ads/facebook-ads/instagram-ads/linkedin-ads",
+    ),
     usp: str | None = typer.Option(None, "--usp", help="Unique selling point"),
     provider: str | None = _provider_opt,
     model: str | None = _model_opt,
@@ -223,20 +536,43 @@ def ad(
     stream: bool | None = _stream_opt,
     temperature: float | None = _temp_opt,
     max_tokens: int | None = _max_tokens_opt,
+    cache: bool | None = _cache_opt,
+    refresh: bool = _refresh_opt,
+    hedge: str | None = _hedge_opt,
+    show_metrics: bool = _metrics_opt,
+    variants: int = _variants_opt,
+    structured_output: bool | None = _structured_opt,
 ) -> None:
     """Generate ad copy for a platform."""
     _run_generation(
         "ad",
         {"platform": platform, "product": product, "audience": audience, "usp": usp or ""},
-        provider, model, output_file, fmt, copy, stream, temperature, max_tokens,
+        provider,
+        model,
+        output_file,
+        fmt,
+        copy,
+        stream,
+        temperature,
+        max_tokens,
+        cache,
+        refresh,
+        hedge,
+        show_metrics,
+        variants,
+        structured_output=structured_output,
     )
 
 
 @generate_app.command()
 def seo(
     keyword: str = typer.Option(..., "--keyword", help="Primary keyword"),
-    page_type: str = typer.Option("blog-post", "--page-type", help="Page type: blog-post/landing-page/product-page/homepage"),
-    secondary_keywords: str | None = typer.Option(None, "--secondary-keywords", help="Secondary keywords (comma-separated)"),
+    page_type: str = typer.Option(
+        "blog-post", "--page-type", help="Page type: blog-post/landing-page/product-page/homepage"
+    ),
+    secondary_keywords: str | None = typer.Option(
+        None, "--secondary-keywords", help="Secondary keywords (comma-separated)"
+    ),
     provider: str | None = _provider_opt,
     model: str | None = _model_opt,
     output_file: str | None = _output_opt,
@@ -245,12 +581,35 @@ def seo(
     stream: bool | None = _stream_opt,
     temperature: float | None = _temp_opt,
     max_tokens: int | None = _max_tokens_opt,
+    cache: bool | None = _cache_opt,
+    refresh: bool = _refresh_opt,
+    hedge: str | None = _hedge_opt,
+    show_metrics: bool = _metrics_opt,
+    variants: int = _variants_opt,
+    structured_output: bool | None = _structured_opt,
 ) -> None:
     """Generate SEO meta tags."""
     _run_generation(
         "seo",
-        {"keyword": keyword, "page_type": page_type, "secondary_keywords": secondary_keywords or ""},
-        provider, model, output_file, fmt, copy, stream, temperature, max_tokens,
+        {
+            "keyword": keyword,
+            "page_type": page_type,
+            "secondary_keywords": secondary_keywords or "",
+        },
+        provider,
+        model,
+        output_file,
+        fmt,
+        copy,
+        stream,
+        temperature,
+        max_tokens,
+        cache,
+        refresh,
+        hedge,
+        show_metrics,
+        variants,
+        structured_output=structured_output,
     )
 
 
@@ -259,7 +618,9 @@ def product(
     name: str = typer.Option(..., "--name", help="Product name"),
     features: str = typer.Option(..., "--features", help="Key features (comma-separated)"),
     audience: str | None = typer.Option(None, "--audience", help="Target audience"),
-    tone: str = typer.Option("friendly", "--tone", help="Tone: premium/friendly/technical/minimalist"),
+    tone: str = typer.Option(
+        "friendly", "--tone", help="Tone: premium/friendly/technical/minimalist"
+    ),
     provider: str | None = _provider_opt,
     model: str | None = _model_opt,
     output_file: str | None = _output_opt,
@@ -268,12 +629,29 @@ def product(
     stream: bool | None = _stream_opt,
     temperature: float | None = _temp_opt,
     max_tokens: int | None = _max_tokens_opt,
+    cache: bool | None = _cache_opt,
+    refresh: bool = _refresh_opt,
+    hedge: str | None = _hedge_opt,
+    show_metrics: bool = _metrics_opt,
+    variants: int = _variants_opt,
 ) -> None:
     """Generate a product description."""
     _run_generation(
         "product",
         {"name": name, "features": features, "audience": audience or "", "tone": tone},
-        provider, model, output_file, fmt, copy, stream, temperature, max_tokens,
+        provider,
+        model,
+        output_file,
+        fmt,
+        copy,
+        stream,
+        temperature,
+        max_tokens,
+        cache,
+        refresh,
+        hedge,
+        show_metrics,
+        variants,
     )
 
 
@@ -291,10 +669,345 @@ def youtube(
     stream: bool | None = _stream_opt,
     temperature: float | None = _temp_opt,
     max_tokens: int | None = _max_tokens_opt,
+    cache: bool | None = _cache_opt,
+    refresh: bool = _refresh_opt,
+    hedge: str | None = _hedge_opt,
+    show_metrics: bool = _metrics_opt,
+    variants: int = _variants_opt,
 ) -> None:
     """Generate a YouTube video description."""
     _run_generation(
         "youtube",
         {"title": title, "summary": summary, "keywords": keywords or "", "timestamps": timestamps},
-        provider, model, output_file, fmt, copy, stream, temperature, max_tokens,
+        provider,
+        model,
+        output_file,
+        fmt,
+        copy,
+        stream,
+        temperature,
+        max_tokens,
+        cache,
+        refresh,
+        hedge,
+        show_metrics,
+        variants,
     )
+
+
+_var_opt = typer.Option(None, "--var", "-V", help="Template variable as key=value (repeatable)")
+
+
+@generate_app.command("run")
+def run_template(
+    template_id: str = typer.Argument(
+        ..., help="Template ID (built-in or from a template directory)"
+    ),
+    var: list[str] | None = _var_opt,
+    provider: str | None = _provider_opt,
+    model: str | None = _model_opt,
+    output_file: str | None = _output_opt,
+    fmt: str | None = _format_opt,
+    copy: bool = _copy_opt,
+    stream: bool | None = _stream_opt,
+    temperature: float | None = _temp_opt,
+    max_tokens: int | None = _max_tokens_opt,
+    cache: bool | None = _cache_opt,
+    refresh: bool = _refresh_opt,
+    hedge: str | None = _hedge_opt,
+    show_metrics: bool = _metrics_opt,
+    variants: int = _variants_opt,
+    structured_output: bool | None = _structured_opt,
+) -> None:
+    """Generate from any template, including user templates."""
+    _run_generation(
+        template_id,
+        _parse_vars(var),
+        provider,
+        model,
+        output_file,
+        fmt,
+        copy,
+        stream,
+        temperature,
+        max_tokens,
+        cache,
+        refresh,
+        hedge,
+        show_metrics,
+        variants,
+        structured_output=structured_output,
+    )
+
+
+def _parse_vars(var: list[str] | None) -> dict[str, str]:
+    variables: dict[str, str] = {}
+    for item in var or []:
+        key, sep, value = item.partition("=")
+        if not sep or not key.strip():
+            output.print_error(f"Invalid --var {item!r}: expected key=value")
+            raise typer.Exit(1)
+        variables[key.strip()] = value
+    return variables
+
+
+_brief_var_opt = typer.Option(
+    None, "--var", "-V", help="Extra brief value as key=value (repeatable)"
+)
+
+
+@generate_app.command()
+def campaign(
+    topic: str | None = typer.Option(None, "--topic", help="Campaign topic (the brief)"),
+    tone: str | None = typer.Option(None, "--tone", help="Tone for the blog post"),
+    keywords: str | None = typer.Option(None, "--keywords", help="SEO keywords (comma-separated)"),
+    product: str | None = typer.Option(
+        None, "--product", help="Product for the ad (default: topic)"
+    ),
+    audience: str | None = typer.Option(None, "--audience", help="Target audience for the ad"),
+    var: list[str] | None = _brief_var_opt,
+    plan: str | None = typer.Option(
+        None, "--plan", help="TOML plan with \\[brief] and \\[nodes.<id>] tables"
+    ),
+    output_dir: str | None = typer.Option(
+        None,
+        "--output-dir",
+        "-o",
+        help="Save node outputs here and reuse unchanged ones on the next run",
+    ),
+    provider: str | None = _provider_opt,
+    model: str | None = _model_opt,
+    temperature: float | None = _temp_opt,
+    max_tokens: int | None = _max_tokens_opt,
+    cache: bool | None = _cache_opt,
+    refresh: bool = _refresh_opt,
+    hedge: str | None = _hedge_opt,
+) -> None:
+    """Turn one brief into a blog post, LinkedIn post, thread, SEO meta and ad copy.
+
+    Nodes run as soon as the nodes they build on are done. With --output-dir,
+    only nodes whose inputs changed since the last run are generated again.
+    """
+    from contentforge.campaign import (
+        DEFAULT_NODES,
+        Campaign,
+        NodeResult,
+        build_brief,
+        load_plan,
+        run_campaign,
+    )
+
+    cfg = load_config()
+    temperature = temperature if temperature is not None else cfg.default_temperature
+    max_tokens = max_tokens if max_tokens is not None else cfg.default_max_tokens
+    warm_up(provider, model, cfg)
+
+    nodes, plan_brief = DEFAULT_NODES, {}
+    if plan:
+        try:
+            nodes, plan_brief = load_plan(plan)
+        except ValueError as e:
+            output.print_error(str(e))
+            raise typer.Exit(1) from None
+    options = {
+        "topic": topic,
+        "tone": tone,
+        "keywords": keywords,
+        "product": product,
+        "audience": audience,
+    }
+    brief = build_brief(plan_brief, options, _parse_vars(var))
+    pipeline = Campaign({node.id: node for node in nodes}, brief)
+    try:
+        pipeline.validate()
+        prov = get_provider(provider, model, cache=cache, refresh=refresh, cfg=cfg, hedge=hedge)
+    except ValueError as e:
+        output.print_error(str(e))
+        raise typer.Exit(1) from None
+
+    output.err_console.print(
+        f"[dim]Using {prov.name}/{prov.model} • campaign: {', '.join(pipeline.nodes)}[/dim]"
+    )
+
+    with output.status("Running campaign...") as spinner:
+        remaining = set(pipeline.nodes)
+
+        def _show(result: NodeResult) -> None:
+            remaining.discard(result.node)
+            if result.ok:
+                text = (
+                    result.content if result.data is None else structured.to_markdown(result.data)
+                )
+                output.render_markdown(text, title=f"{result.node} ({result.template})")
+            if remaining:
+                spinner.update(f"Running campaign... waiting on {', '.join(sorted(remaining))}")
+
+        async def _run() -> dict[str, NodeResult]:
+            async with prov:
+                return await run_campaign(
+                    prov,
+                    pipeline,
+                    temperature,
+                    max_tokens,
+                    output_dir=output_dir,
+                    reuse=not refresh,
+                    on_result=_show,
+                    record_history=cfg.history_enabled,
+                )
+
+        results = asyncio.run(_run())
+
+    colors = {
+        "generated": "green",
+        "cached": "cyan",
+        "reused": "cyan",
+        "failed": "red",
+        "skipped": "yellow",
+    }
+    for result in (results[node_id] for node_id in pipeline.nodes):
+        detail = result.error or f"{result.seconds:.1f}s • {result.tokens_used} tokens"
+        output.err_console.print(
+            f"[{colors[result.status]}]{result.status:>9}[/] {result.node} ({result.template}) • {detail}"
+        )
+    if output_dir:
+        output.err_console.print(f"[green]Saved to {Path(output_dir).resolve()}[/green]")
+    if not all(r.ok for r in results.values()):
+        raise typer.Exit(1)
+
+
+@generate_app.command()
+def batch(
+    jobs_file: str = typer.Argument(..., help="JSONL or CSV file with one job per row"),
+    template: str | None = typer.Option(
+        None, "--template", "-t", help="Template for rows without a 'template' column"
+    ),
+    concurrency: int = typer.Option(8, "--concurrency", "-c", min=1, help="Max requests in flight"),
+    provider: str | None = _provider_opt,
+    model: str | None = _model_opt,
+    output_file: str | None = typer.Option(
+        None, "--output", "-o", help="Write JSONL results to file (default: stdout)"
+    ),
+    temperature: float | None = _temp_opt,
+    max_tokens: int | None = _max_tokens_opt,
+    cache: bool | None = _cache_opt,
+    refresh: bool = _refresh_opt,
+    hedge: str | None = _hedge_opt,
+    offline: bool = typer.Option(
+        False, "--offline", help="Use the OpenAI Batch API (half price, results within 24h)"
+    ),
+    no_wait: bool = typer.Option(
+        False, "--no-wait", help="With --offline: submit and exit (see `contentforge jobs`)"
+    ),
+) -> None:
+    """Generate content for every row of a JSONL/CSV job file."""
+    from contentforge.batch import BatchStats, iter_jobs, run_batch
+
+    cfg = load_config()
+    temperature = temperature if temperature is not None else cfg.default_temperature
+    max_tokens = max_tokens if max_tokens is not None else cfg.default_max_tokens
+
+    jobs_path = Path(jobs_file)
+    if not jobs_path.is_file():
+        output.print_error(f"Job file not found: {jobs_file}")
+        raise typer.Exit(1)
+    if not offline:
+        warm_up(provider, model, cfg)
+
+    if template is not None:
+        try:
+            get_template(template)
+        except KeyError as e:
+            output.print_error(str(e))
+            raise typer.Exit(1) from None
+
+    if offline:
+        from contentforge.commands.jobs_cmd import start_job
+
+        if provider not in (None, "openai"):
+            output.print_error("--offline uses the OpenAI Batch API; it cannot run on " + provider)
+            raise typer.Exit(1)
+        start_job(
+            jobs_path,
+            template,
+            model or cfg.openai_model,
+            temperature,
+            max_tokens,
+            output_file,
+            wait=not no_wait,
+        )
+        return
+
+    try:
+        prov = get_provider(
+            provider,
+            model,
+            cache=cache,
+            refresh=refresh,
+            cfg=cfg,
+            hedge=hedge,
+            coalesce=cfg.coalesce_requests,
+        )
+    except ValueError as e:
+        output.print_error(str(e))
+        raise typer.Exit(1) from None
+
+    output.err_console.print(
+        f"[dim]Using {prov.name}/{prov.model} • batch: {jobs_path.name} • concurrency {concurrency}[/dim]"
+    )
+
+    if output_file:
+        out_path = Path(output_file).resolve()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        sink = out_path.open("w", encoding="utf-8")
+    else:
+        sink = sys.stdout
+
+    def _write(record: dict) -> None:
+        sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+        sink.flush()
+
+    try:
+        with output.status("Processing batch...") as spinner:
+
+            def _progress(stats: BatchStats) -> None:
+                spinner.update(
+                    f"Processing batch... {stats.processed} rows "
+                    f"({stats.failed} failed) • {stats.rows_per_second:.1f} rows/s"
+                )
+
+            async def _run() -> BatchStats:
+                async with prov:
+                    return await run_batch(
+                        prov,
+                        iter_jobs(jobs_path),
+                        _write,
+                        template_id=template,
+                        concurrency=concurrency,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        progress=_progress,
+                        record_history=cfg.history_enabled,
+                    )
+
+            stats = asyncio.run(_run())
+    except ValueError as e:
+        output.print_error(str(e))
+        raise typer.Exit(1) from None
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+
+    summary = (
+        f"[green]Processed {stats.processed} rows[/green] "
+        f"({stats.failed} failed) in {stats.elapsed:.2f}s • "
+        f"{stats.rows_per_second:.1f} rows/s • {stats.tokens_used} tokens"
+    )
+    if stats.tokens_cached:
+        summary += f" • prefix cache {stats.prefix_cache_hit_rate:.0%} of prompt tokens"
+    if stats.coalesced:
+        summary += f" • {stats.coalesced} duplicates coalesced ({stats.dedup_ratio:.0%})"
+    output.err_console.print(summary)
+    if output_file:
+        output.err_console.print(f"[green]Saved to {out_path}[/green]")
+    if stats.failed:
+        raise typer.Exit(1)
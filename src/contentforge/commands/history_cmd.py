@@ -0,0 +1,178 @@
+"""Generation history commands."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+from datetime import datetime
+
+import typer
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from contentforge import output
+from contentforge.history import HistoryEntry, HistoryStore
+
+history_app = typer.Typer(invoke_without_command=True)
+console = Console()
+
+# Snippet highlight markers that cannot occur in text (turned into rich markup)
+_MARKS = ("\x02", "\x03")
+
+
+def _fmt_time(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+
+def _preview(text: str, width: int = 80) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= width else text[: width - 1] + "…"
+
+
+def _table(title: str) -> Table:
+    table = Table(title=title, border_style="cyan")
+    table.add_column("ID", style="bold", justify="right")
+    table.add_column("Created")
+    table.add_column("Template", style="cyan")
+    table.add_column("Model")
+    table.add_column("Content")
+    return table
+
+
+def _row(table: Table, entry: HistoryEntry, text: str) -> None:
+    table.add_row(
+        str(entry.id),
+        _fmt_time(entry.created),
+        entry.template,
+        f"{entry.provider}/{entry.model}",
+        text,
+    )
+
+
+@history_app.callback()
+def history_default(
+    ctx: typer.Context,
+    limit: int = typer.Option(20, "--limit", "-n", min=1, help="How many entries to show"),
+    template: str | None = typer.Option(None, "--template", "-t", help="Only this template"),
+) -> None:
+    """List the most recent generations."""
+    if ctx.invoked_subcommand is not None:
+        return
+    store = HistoryStore()
+    try:
+        entries = store.recent(limit, template)
+    except sqlite3.Error as e:
+        output.print_error(f"History unavailable: {e}")
+        raise typer.Exit(1) from None
+    finally:
+        store.close()
+    if not entries:
+        console.print("[dim]No history yet[/dim]")
+        return
+    table = _table("History")
+    for entry in entries:
+        _row(table, entry, escape(_preview(entry.content)))
+    console.print(table)
+
+
+@history_app.command("search")
+def search(
+    query: str = typer.Argument(..., help="Words to find (all must match; `word*` for a prefix)"),
+    limit: int = typer.Option(20, "--limit", "-n", min=1, help="Maximum results"),
+    template: str | None = typer.Option(None, "--template", "-t", help="Only this template"),
+    rank: bool = typer.Option(
+        False, "--rank", help="Best matches first (slower for very common words)"
+    ),
+) -> None:
+    """Full-text search over generated content and template variables (newest first)."""
+    store = HistoryStore()
+    try:
+        hits = store.search(query, limit, template, newest_first=not rank, marks=_MARKS)
+    except sqlite3.Error as e:
+        output.print_error(f"Search failed: {e}")
+        raise typer.Exit(1) from None
+    finally:
+        store.close()
+    if not hits:
+        console.print(f"[dim]No matches for {query!r}[/dim]")
+        return
+    table = _table(f"History matching {query!r}")
+    for hit in hits:
+        snippet = escape(" ".join(hit.snippet.split()))
+        snippet = snippet.replace(_MARKS[0], "[bold yellow]").replace(_MARKS[1], "[/bold yellow]")
+        _row(table, hit.entry, snippet)
+    console.print(table)
+
+
+@history_app.command("show")
+def show(
+    entry_id: int = typer.Argument(..., help="Entry id (see `contentforge history`)"),
+    fmt: str = typer.Option(
+        "markdown", "--format", "-f", help="Output format (markdown/plain/json)"
+    ),
+) -> None:
+    """Print one stored generation."""
+    store = HistoryStore()
+    try:
+        entry = store.get(entry_id)
+    finally:
+        store.close()
+    if entry is None:
+        output.print_error(f"No history entry {entry_id}")
+        raise typer.Exit(1)
+    if fmt == "json":
+        sys.stdout.write(json.dumps(entry.to_dict(), ensure_ascii=False, indent=2) + "\n")
+        return
+    variables = ", ".join(f"{k}={v!r}" for k, v in entry.variables.items())
+    output.err_console.print(
+        f"[dim]#{entry.id} • {_fmt_time(entry.created)} • {entry.template} • "
+        f"{entry.provider}/{entry.model} • {entry.tokens_used} tokens[/dim]"
+    )
+    if variables:
+        output.err_console.print(f"[dim]{escape(variables)}[/dim]")
+    if fmt == "plain":
+        output.render_plain(entry.content)
+    else:
+        output.render_markdown(entry.content, title=entry.template)
+
+
+@history_app.command("export")
+def export(
+    output_file: str | None = typer.Option(
+        None, "--output", "-o", help="Write JSONL here (default: stdout)"
+    ),
+    query: str | None = typer.Option(
+        None, "--query", "-q", help="Only entries matching this search"
+    ),
+    template: str | None = typer.Option(None, "--template", "-t", help="Only this template"),
+    since: str | None = typer.Option(
+        None, "--since", help="Only entries created from this date (YYYY-MM-DD[THH:MM])"
+    ),
+) -> None:
+    """Export history as JSONL, one generation per line (streamed, oldest first)."""
+    try:
+        start = datetime.fromisoformat(since).timestamp() if since else None
+    except ValueError:
+        output.print_error(f"Invalid --since date: {since!r}")
+        raise typer.Exit(1) from None
+    store = HistoryStore()
+    entries = store.iter_entries(query, template, start)
+    count = 0
+    try:
+        if output_file:
+            with output.FileSink(output_file) as sink:
+                for entry in entries:
+                    sink.write(json.dumps(entry.to_dict(), ensure_ascii=False) + "\n")
+                    count += 1
+        else:
+            for entry in entries:
+                sys.stdout.write(json.dumps(entry.to_dict(), ensure_ascii=False) + "\n")
+                count += 1
+    except sqlite3.Error as e:
+        output.print_error(f"Export failed: {e}")
+        raise typer.Exit(1) from None
+    finally:
+        store.close()
+    output.err_console.print(f"[dim]Exported {count} entries[/dim]")
@@ -0,0 +1,215 @@
+"""Offline (OpenAI Batch API) job commands."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import sys
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from pathlib import Path
+
+import typer
+from openai import APIError
+from rich.console import Console
+from rich.table import Table
+
+from contentforge import offline, output
+from contentforge.batch import BatchStats, iter_jobs
+from contentforge.config import Config, load_config
+from contentforge.offline import OfflineJob
+from contentforge.providers.openai_provider import OpenAIProvider
+
+jobs_app = typer.Typer(invoke_without_command=True)
+console = Console()
+
+_STATUS_STYLE = {"collected": "green", "finished": "cyan", "running": "yellow", "pending": "dim"}
+
+
+def _openai(cfg: Config, model: str) -> OpenAIProvider:
+    from contentforge.providers import _create_provider
+
+    try:
+        prov = _create_provider(cfg, "openai", model)
+    except ValueError as e:
+        output.print_error(str(e))
+        raise typer.Exit(1) from None
+    assert isinstance(prov, OpenAIProvider)
+    return prov
+
+
+def _load(job_id: str) -> OfflineJob:
+    try:
+        return OfflineJob.load(job_id)
+    except KeyError as e:
+        output.print_error(str(e.args[0]))
+        raise typer.Exit(1) from None
+
+
+def _progress_text(job: OfflineJob) -> str:
+    done = sum(p.status in offline.TERMINAL for p in job.parts)
+    answered = sum(p.completed + p.failed for p in job.parts)
+    requests = sum(p.requests for p in job.parts)
+    return (
+        f"Waiting for OpenAI batches... {done}/{len(job.parts)} finished • "
+        f"{answered}/{requests} requests done"
+    )
+
+
+@contextlib.contextmanager
+def _results(path: str) -> Iterator[Callable[[dict], None]]:
+    """A JSONL record writer: through a FileSink for ``path``, else to stdout."""
+    if not path:
+
+        def _print(record: dict) -> None:
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        yield _print
+        return
+    with output.FileSink(path) as sink:
+
+        def _write(record: dict) -> None:
+            sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        yield _write
+
+
+def run_job(job: OfflineJob, wait: bool = True, poll_interval: float | None = None) -> None:
+    """Submit what is not submitted yet, then (with ``wait``) poll and collect results."""
+    cfg = load_config()
+    prov = _openai(cfg, job.model)
+    interval = poll_interval if poll_interval is not None else cfg.offline_poll_interval
+
+    async def _run() -> BatchStats | None:
+        async with prov:
+            with output.status(f"Submitting {len(job.parts)} batch file(s)..."):
+                await offline.submit(prov.client, job)
+            if not wait:
+                return None
+            with output.status(_progress_text(job)) as spinner:
+                await offline.wait(
+                    prov.client,
+                    job,
+                    poll_interval=interval,
+                    progress=lambda j: spinner.update(_progress_text(j)),
+                )
+            with output.status("Downloading results..."), _results(job.output) as write:
+                return await offline.collect(prov.client, job, write)
+
+    resume = f"contentforge jobs resume {job.id}"
+    try:
+        stats = asyncio.run(_run())
+    except KeyboardInterrupt:
+        output.err_console.print(f"[yellow]Stopped waiting; resume with: {resume}[/yellow]")
+        raise typer.Exit(130) from None
+    except APIError as e:
+        output.print_error(f"{e} (resume with: {resume})")
+        raise typer.Exit(1) from None
+
+    if stats is None:
+        output.err_console.print(f"[green]Submitted job {job.id}[/green] • check with: {resume}")
+        return
+    output.err_console.print(
+        f"[green]Processed {stats.processed} rows[/green] ({stats.failed} failed) via the "
+        f"Batch API • {stats.tokens_used} tokens"
+    )
+    if stats.failed:
+        raise typer.Exit(1)
+
+
+def start_job(
+    jobs_path: Path,
+    template: str | None,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    output_file: str | None,
+    wait: bool = True,
+    poll_interval: float | None = None,
+) -> None:
+    """Render ``jobs_path`` into batch input files, then run the job."""
+    try:
+        with output.status("Rendering requests..."):
+            job = offline.prepare_job(
+                iter_jobs(jobs_path),
+                str(jobs_path.resolve()),
+                model,
+                template_id=template,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                output=str(Path(output_file).resolve()) if output_file else "",
+            )
+    except ValueError as e:
+        output.print_error(str(e))
+        raise typer.Exit(1) from None
+    output.err_console.print(
+        f"[dim]Offline job {job.id} • {job.rows} rows in {len(job.parts)} batch file(s) • "
+        f"openai/{model}[/dim]"
+    )
+    run_job(job, wait=wait, poll_interval=poll_interval)
+
+
+@jobs_app.callback()
+def jobs_default(ctx: typer.Context) -> None:
+    """List offline batch jobs."""
+    if ctx.invoked_subcommand is None:
+        list_cmd()
+
+
+@jobs_app.command("list")
+def list_cmd() -> None:
+    """List offline batch jobs."""
+    jobs = offline.list_jobs()
+    if not jobs:
+        console.print("[dim]No offline jobs[/dim]")
+        return
+    table = Table(title="Offline Jobs", border_style="cyan")
+    table.add_column("Job", style="bold")
+    table.add_column("Created")
+    table.add_column("Rows", justify="right")
+    table.add_column("Batches", justify="right")
+    table.add_column("Status")
+    table.add_column("Output")
+    for job in jobs:
+        style = _STATUS_STYLE.get(job.status, "red")
+        table.add_row(
+            job.id,
+            datetime.fromtimestamp(job.created).strftime("%Y-%m-%d %H:%M"),
+            str(job.rows),
+            str(len(job.parts)),
+            f"[{style}]{job.status}[/{style}]",
+            job.output or "[dim]stdout[/dim]",
+        )
+    console.print(table)
+
+
+@jobs_app.command("resume")
+def resume(
+    job_id: str = typer.Argument(..., help="Job id (see `contentforge jobs`)"),
+    output_file: str | None = typer.Option(
+        None, "--output", "-o", help="Write JSONL results here instead"
+    ),
+    poll_interval: float | None = typer.Option(
+        None, "--poll-interval", help="Seconds before the first re-check"
+    ),
+) -> None:
+    """Keep waiting for a job and download its results (again, if already collected)."""
+    job = _load(job_id)
+    if output_file:
+        job.output = str(Path(output_file).resolve())
+        job.save()
+    run_job(job, poll_interval=poll_interval)
+
+
+@jobs_app.command("cancel")
+def cancel(job_id: str = typer.Argument(..., help="Job id")) -> None:
+    """Cancel a job's unfinished batches."""
+    job = _load(job_id)
+    prov = _openai(load_config(), job.model)
+
+    async def _cancel() -> int:
+        async with prov:
+            return await offline.cancel(prov.client, job)
+
+    console.print(f"Cancelling {asyncio.run(_cancel())} batch(es) of {job.id}")
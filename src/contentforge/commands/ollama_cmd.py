@@ -0,0 +1,99 @@
+"""Local Ollama model management commands."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from datetime import datetime
+
+import httpx
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from contentforge import output
+from contentforge.config import load_config
+from contentforge.providers.ollama_provider import OllamaProvider
+
+ollama_app = typer.Typer(no_args_is_help=True)
+console = Console()
+
+_models_arg = typer.Argument(None, help="Models to load (default: ollama_model)")
+
+
+def _provider(model: str, keep_alive: str | None = None) -> OllamaProvider:
+    from contentforge.providers import _create_ollama
+
+    prov = _create_ollama(load_config(), model)
+    if keep_alive:
+        prov.keep_alive = keep_alive
+    return prov
+
+
+def _describe(e: httpx.HTTPError) -> str:
+    if isinstance(e, httpx.HTTPStatusError):
+        try:
+            return e.response.json()["error"]
+        except (ValueError, KeyError, TypeError):
+            return f"HTTP {e.response.status_code}"
+    return str(e) or type(e).__name__
+
+
+@ollama_app.command("preload")
+def preload(
+    models: list[str] | None = _models_arg,
+    keep_alive: str | None = typer.Option(
+        None, "--keep-alive", help="How long to keep the models loaded, e.g. 30m or -1 (forever)"
+    ),
+) -> None:
+    """Load models into memory so the next requests skip the load."""
+    models = models or [load_config().ollama_model]
+
+    async def _load(prov: OllamaProvider) -> float:
+        async with prov:
+            return await prov.preload()
+
+    failed = False
+    for model in models:
+        prov = _provider(model, keep_alive)
+        try:
+            with output.status(f"Loading {model}..."):
+                seconds = asyncio.run(_load(prov))
+        except httpx.HTTPError as e:
+            output.print_error(f"{model}: {_describe(e)}")
+            failed = True
+            continue
+        loaded = f"loaded in {seconds:.2f}s" if seconds else "already loaded"
+        console.print(f"[green]{model}[/green] {loaded} [dim](keep_alive {prov.keep_alive})[/dim]")
+    if failed:
+        raise typer.Exit(1)
+
+
+@ollama_app.command("ps")
+def ps() -> None:
+    """Show the models Ollama holds in memory and when they unload."""
+    prov = _provider(load_config().ollama_model)
+
+    async def _list() -> list[dict]:
+        async with prov:
+            return await prov.loaded_models()
+
+    try:
+        models = asyncio.run(_list())
+    except httpx.HTTPError as e:
+        output.print_error(_describe(e))
+        raise typer.Exit(1) from None
+
+    if not models:
+        console.print("[dim]No models loaded[/dim]")
+        return
+    table = Table(title="Loaded Ollama Models", border_style="cyan")
+    table.add_column("Model", style="bold")
+    table.add_column("VRAM", justify="right")
+    table.add_column("Unloads")
+    for m in models:
+        expires = m.get("expires_at", "")
+        with contextlib.suppress(ValueError):
+            expires = datetime.fromisoformat(expires).astimezone().strftime("%Y-%m-%d %H:%M")
+        table.add_row(m.get("name", "?"), f"{m.get('size_vram', 0) / 2**30:.1f} GB", expires)
+    console.print(table)
@@ -13,28 +13,41 @@ providers_app = typer.Typer(invoke_without_command=True)
 console = Console()
 
 
+_STATUS_STYLE = {"available": "green", "unreachable": "red", "not configured": "red"}
+
+
+def _fmt_latency(latency_ms: float | None) -> str:
+    return f"{latency_ms:.0f} ms" if latency_ms is not None else "-"
+
+
 @providers_app.callback()
-def providers_list(ctx: typer.Context) -> None:
+def providers_list(
+    ctx: typer.Context,
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached health results"),
+) -> None:
     """List available LLM providers and their status."""
     if ctx.invoked_subcommand is not None:
         return
 
     cfg = load_config()
-    providers = list_providers()
+    providers = list_providers(cfg, refresh=refresh)
 
     table = Table(title="LLM Providers", border_style="cyan")
     table.add_column("Provider", style="bold")
     table.add_column("Status")
+    table.add_column("Latency", justify="right")
     table.add_column("Default Model")
     table.add_column("Models")
     table.add_column("Default", justify="center")
 
     for p in providers:
-        status = "[green]available[/green]" if p["available"] else "[red]not configured[/red]"
+        style = _STATUS_STYLE[p["status"]]
+        status = f"[{style}]{p['status']}[/{style}]"
         is_default = "[cyan]*[/cyan]" if p["name"] == cfg.default_provider else ""
         table.add_row(
             p["name"],
             status,
+            _fmt_latency(p["latency_ms"]),
             p.get("default_model", p["models"][0]),
             ", ".join(p["models"][:3]) + ("..." if len(p["models"]) > 3 else ""),
             is_default,
@@ -45,13 +58,24 @@ def providers_list(ctx: typer.Context) -> None:
 
 
 @providers_app.command("check")
-def check() -> None:
+def check(
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached health results"),
+    timeout: float | None = typer.Option(
+        None, "--timeout", help="Per-provider deadline in seconds"
+    ),
+) -> None:
     """Test connectivity to all providers."""
-    providers = list_providers()
+    from contentforge.providers.health import get_health
 
-    for p in providers:
-        name = p["name"]
-        if p["available"]:
-            console.print(f"  [green]✓[/green] {name}: connected")
+    results = get_health(load_config(), refresh=refresh, timeout=timeout)
+
+    for h in results:
+        suffix = " [dim](cached)[/dim]" if h.cached else ""
+        if h.available:
+            console.print(
+                f"  [green]✓[/green] {h.name}: connected ({_fmt_latency(h.latency_ms)}){suffix}"
+            )
+        elif not h.configured:
+            console.print(f"  [red]✗[/red] {h.name}: not configured{suffix}")
         else:
-            console.print(f"  [red]✗[/red] {name}: not available")
+            console.print(f"  [red]✗[/red] {h.name}: {h.error or 'not available'}{suffix}")
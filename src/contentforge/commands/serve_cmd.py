@@ -0,0 +1,39 @@
+"""Local HTTP API command."""
+
+from __future__ import annotations
+
+import asyncio
+
+import typer
+
+from contentforge import output
+from contentforge.server import ContentServer
+
+serve_app = typer.Typer(invoke_without_command=True)
+
+
+@serve_app.callback()
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind"),
+    port: int = typer.Option(8765, "--port", help="Port to listen on (0 picks a free one)"),
+) -> None:
+    """Serve templates and generation over a local HTTP API."""
+    server = ContentServer(host=host, port=port)
+
+    async def _run() -> None:
+        async with server:
+            output.err_console.print(
+                f"[green]Serving on {server.base_url}[/green] [dim](Ctrl+C to stop)[/dim]"
+            )
+            await server.serve_forever()
+
+    try:
+        asyncio.run(_run())
+    except OSError as e:
+        output.print_error(str(e))
+        raise typer.Exit(1) from None
+    except KeyboardInterrupt:
+        output.err_console.print(
+            f"[dim]Stopped • {server.generations} generations, {server.coalesced} "
+            f"coalesced with an identical request ({server.dedup_ratio:.0%})[/dim]"
+        )
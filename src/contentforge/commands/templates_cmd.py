@@ -8,6 +8,7 @@ from rich.panel import Panel
 from rich.table import Table
 
 from contentforge.templates import get_template, list_templates
+from contentforge.templates.registry import TEMPLATES
 
 templates_app = typer.Typer(invoke_without_command=True)
 console = Console()
@@ -37,6 +38,11 @@ def templates_list(ctx: typer.Context) -> None:
         )
 
     console.print(table)
+
+    from contentforge.templates.loader import load_index
+
+    for error in load_index(reserved=frozenset(TEMPLATES)).errors.values():
+        console.print(f"[yellow]Skipped template file[/yellow] {error}")
     console.print(
         "\n[dim]Use [cyan]contentforge templates <id>[/cyan] to see details for a template.[/dim]"
     )
@@ -82,8 +88,10 @@ def _show_template(template_id: str) -> None:
     console.print(fields_table)
 
     # Show example command
-    cmd_parts = [f"contentforge generate {t.id}"]
-    for f in t.fields:
-        if f.required:
-            cmd_parts.append(f'--{f.name} "..."')
+    if t.id in TEMPLATES:
+        cmd_parts = [f"contentforge generate {t.id}"]
+        cmd_parts += [f'--{f.name} "..."' for f in t.fields if f.required]
+    else:
+        cmd_parts = [f"contentforge generate run {t.id}"]
+        cmd_parts += [f'--var {f.name}="..."' for f in t.fields if f.required and not f.default]
     console.print(f"\n[dim]Example:[/dim] {' '.join(cmd_parts)}")
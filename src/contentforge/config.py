@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import copy
 import os
 import sys
 from dataclasses import dataclass, field, fields
@@ -42,6 +43,9 @@ class Config:
 
     # Ollama
     ollama_base_url: str = "http://localhost:11434"
+    ollama_keep_alive: str = "10m"  # how long Ollama keeps the model (and its prompt cache) loaded
+    ollama_model_keep_alive: str = ""  # per-model overrides: "llama3.2=1h,mistral=-1"
+    ollama_warm_up: bool = True  # start loading the model while the prompt is assembled
 
     # Defaults
     default_provider: str = "openai"
@@ -50,6 +54,49 @@ class Config:
     default_max_tokens: int = 2000
     stream: bool = True
 
+    # Response cache
+    cache_enabled: bool = True
+    cache_max_mb: int = 256
+    cache_ttl_days: float = 30.0
+
+    # HTTP connection pool
+    http_max_connections: int = 100
+    http_max_keepalive: int = 20
+    http_keepalive_expiry: float = 30.0
+    http2: bool = False
+
+    # Rate limits (requests/tokens per minute, 0 = unlimited) and retries
+    openai_rpm: int = 0
+    openai_tpm: int = 0
+    gemini_rpm: int = 0
+    gemini_tpm: int = 0
+    max_retries: int = 4
+    retry_max_backoff: float = 60.0
+
+    # Concurrent identical requests share one upstream call (batch and serve)
+    coalesce_requests: bool = True
+
+    # Offline (OpenAI Batch API) jobs: first status re-check, doubling up to 5 minutes
+    offline_poll_interval: float = 10.0
+
+    # Provider health checks
+    health_timeout: float = 3.0
+    health_cache_ttl: float = 30.0
+
+    # Hedged requests: backup "provider[/model]" raced when the primary is slow
+    hedge_provider: str = ""
+    hedge_after_ms: float = 2000.0
+
+    # Extra user template directories (os.pathsep-separated); APP_DIR/templates is always searched
+    template_dirs: str = ""
+
+    # Per-generation metrics: JSONL log and optional Prometheus textfile path
+    metrics_log: bool = True
+    metrics_textfile: str = ""
+
+    # Searchable history of every generation (history.sqlite)
+    history_enabled: bool = True
+
     # Internal: tracks which fields came from env so we don't persist them
     _env_overrides: set = field(default_factory=set, repr=False)
 
@@ -66,8 +113,48 @@ def _ensure_dir() -> None:
     APP_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# Process-level memo: (fingerprint, parsed config)
+_cached: tuple[tuple, Config] | None = None
+
+
+def _fingerprint() -> tuple:
+    """Identify the config sources: file path/mtime/size plus CONTENTFORGE_* env vars."""
+    try:
+        st = CONFIG_FILE.stat()
+        file_fp = (str(CONFIG_FILE), st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        file_fp = (str(CONFIG_FILE), None, None)
+    env_fp = tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith(_ENV_PREFIX)))
+    return file_fp, env_fp
+
+
+def _snapshot(cfg: Config) -> Config:
+    snap = copy.copy(cfg)
+    object.__setattr__(snap, "_env_overrides", set(cfg._env_overrides))
+    return snap
+
+
+def invalidate_config_cache() -> None:
+    """Forget the memoized config so the next load re-reads disk and env."""
+    global _cached
+    _cached = None
+
+
 def load_config() -> Config:
-    """Load config from TOML file, then override with env vars."""
+    """Load config from TOML file, then override with env vars.
+
+    The parsed result is memoized per process and reused until the config
+    file's mtime/size or the ``CONTENTFORGE_*`` environment changes. Each call
+    returns an independent copy, so callers may modify it freely.
+    """
+    global _cached
+    fp = _fingerprint()
+    if _cached is None or _cached[0] != fp:
+        _cached = (fp, _read_config())
+    return _snapshot(_cached[1])
+
+
+def _read_config() -> Config:
     cfg = Config()
 
     # Load from TOML
@@ -106,6 +193,8 @@ def save_config(cfg: Config) -> None:
         if val != default_val:
             data[f.name] = val
     CONFIG_FILE.write_bytes(tomli_w.dumps(data).encode())
+    # mtime granularity can hide a rewrite of the same size, so drop the memo.
+    invalidate_config_cache()
 
 
 def set_value(key: str, value: str) -> Config:
@@ -0,0 +1,336 @@
+"""Searchable history of every generation (SQLite + FTS5)."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from contentforge import config
+
+if TYPE_CHECKING:
+    from contentforge.metrics import GenerationMetrics
+    from contentforge.providers.base import GenerationResult
+
+# The FTS5 index is external-content over the content and variables columns, so
+# search is fast without storing the text twice.
+_SCHEMA = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+CREATE TABLE IF NOT EXISTS generations (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    template TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    variables TEXT NOT NULL,
+    content TEXT NOT NULL,
+    tokens_used INTEGER NOT NULL DEFAULT 0,
+    finish_reason TEXT NOT NULL DEFAULT 'stop',
+    metrics TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS generations_template ON generations (template, created);
+CREATE VIRTUAL TABLE IF NOT EXISTS generations_fts USING fts5(
+    content, variables, content='generations', content_rowid='id',
+    tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS generations_ai AFTER INSERT ON generations BEGIN
+    INSERT INTO generations_fts (rowid, content, variables)
+    VALUES (new.id, new.content, new.variables);
+END;
+CREATE TRIGGER IF NOT EXISTS generations_ad AFTER DELETE ON generations BEGIN
+    INSERT INTO generations_fts (generations_fts, rowid, content, variables)
+    VALUES ('delete', old.id, old.content, old.variables);
+END;
+"""
+
+_COLUMNS = "id, created, template, provider, model, variables, content, tokens_used, finish_reason, metrics"
+
+
+def history_path() -> Path:
+    """Return the path to the history database."""
+    return config.APP_DIR / "history.sqlite"
+
+
+@dataclass
+class HistoryEntry:
+    """One stored generation."""
+
+    template: str
+    provider: str
+    model: str
+    content: str
+    variables: dict[str, str] = field(default_factory=dict)
+    tokens_used: int = 0
+    finish_reason: str = "stop"
+    metrics: dict = field(default_factory=dict)
+    created: float = field(default_factory=time.time)
+    id: int | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "created": self.created,
+            "template": self.template,
+            "provider": self.provider,
+            "model": self.model,
+            "variables": self.variables,
+            "content": self.content,
+            "tokens_used": self.tokens_used,
+            "finish_reason": self.finish_reason,
+            "metrics": self.metrics,
+        }
+
+
+@dataclass
+class SearchHit:
+    entry: HistoryEntry
+    snippet: str
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching every word.
+
+    Words are quoted so punctuation is never read as query syntax; a trailing
+    ``*`` keeps its prefix-match meaning.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _entry(row: tuple) -> HistoryEntry:
+    return HistoryEntry(
+        id=row[0],
+        created=row[1],
+        template=row[2],
+        provider=row[3],
+        model=row[4],
+        variables=json.loads(row[5]),
+        content=row[6],
+        tokens_used=row[7],
+        finish_reason=row[8],
+        metrics=json.loads(row[9]),
+    )
+
+
+class HistoryStore:
+    """Reads and writes the history database (opened lazily)."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or history_path()
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def add_many(self, entries: list[HistoryEntry]) -> None:
+        """Insert ``entries`` in a single transaction."""
+        db = self._db()
+        with db:
+            db.executemany(
+                "INSERT INTO generations (created, template, provider, model, variables, "
+                "content, tokens_used, finish_reason, metrics) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        e.created,
+                        e.template,
+                        e.provider,
+                        e.model,
+                        json.dumps(e.variables, ensure_ascii=False),
+                        e.content,
+                        e.tokens_used,
+                        e.finish_reason,
+                        json.dumps(e.metrics, ensure_ascii=False),
+                    )
+                    for e in entries
+                ],
+            )
+
+    def get(self, entry_id: int) -> HistoryEntry | None:
+        row = (
+            self._db()
+            .execute(f"SELECT {_COLUMNS} FROM generations WHERE id = ?", (entry_id,))
+            .fetchone()
+        )
+        return _entry(row) if row else None
+
+    def recent(self, limit: int = 20, template: str | None = None) -> list[HistoryEntry]:
+        sql = f"SELECT {_COLUMNS} FROM generations"
+        params: list = []
+        if template:
+            sql += " WHERE template = ?"
+            params.append(template)
+        sql += " ORDER BY id DESC LIMIT ?"
+        return [_entry(r) for r in self._db().execute(sql, [*params, limit])]
+
+    def search(
+        self,
+        text: str,
+        limit: int = 20,
+        template: str | None = None,
+        newest_first: bool = False,
+        marks: tuple[str, str] = ("[", "]"),
+    ) -> list[SearchHit]:
+        """Entries whose content or variables contain every word of ``text``.
+
+        Results are ranked by relevance (bm25), or newest first, which only
+        walks the index in rowid order and stays fast for very common words.
+        Matched words in the snippets are wrapped in ``marks``.
+        """
+        query = fts_query(text)
+        if not query:
+            return []
+        cols = ", ".join(f"g.{c.strip()}" for c in _COLUMNS.split(","))
+        sql = (
+            f"SELECT {cols}, snippet(generations_fts, 0, ?, ?, '…', 12) "
+            "FROM generations_fts JOIN generations g ON g.id = generations_fts.rowid "
+            "WHERE generations_fts MATCH ?"
+        )
+        params: list = [*marks, query]
+        if template:
+            sql += " AND g.template = ?"
+            params.append(template)
+        sql += " ORDER BY generations_fts.rowid DESC" if newest_first else " ORDER BY rank"
+        sql += " LIMIT ?"
+        rows = self._db().execute(sql, [*params, limit])
+        return [SearchHit(_entry(r[:-1]), r[-1]) for r in rows]
+
+    def iter_entries(
+        self, text: str | None = None, template: str | None = None, since: float | None = None
+    ) -> Iterator[HistoryEntry]:
+        """Stream matching entries oldest first without loading them all."""
+        sql = f"SELECT {_COLUMNS} FROM generations WHERE 1"
+        params: list = []
+        if text:
+            sql += " AND id IN (SELECT rowid FROM generations_fts WHERE generations_fts MATCH ?)"
+            params.append(fts_query(text))
+        if template:
+            sql += " AND template = ?"
+            params.append(template)
+        if since is not None:
+            sql += " AND created >= ?"
+            params.append(since)
+        for row in self._db().execute(sql + " ORDER BY id", params):
+            yield _entry(row)
+
+    def count(self) -> int:
+        return self._db().execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+
+
+class HistoryWriter:
+    """Writes queued entries from a background thread, batching whatever has queued up.
+
+    Under load (batch and server modes) many entries share one transaction;
+    a lone CLI generation costs the caller only a queue put.
+    """
+
+    def __init__(self, store: HistoryStore, max_batch: int = 500) -> None:
+        self.store = store
+        self.max_batch = max_batch
+        self.transactions = 0
+        self._queue: queue.Queue[HistoryEntry | None] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, entry: HistoryEntry) -> None:
+        self._queue.put(entry)
+
+    def _run(self) -> None:
+        while (first := self._queue.get()) is not None:
+            batch = [first]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            try:
+                self.store.add_many(batch)
+                self.transactions += 1
+            except sqlite3.Error:
+                pass  # history is best-effort; never fail a generation over it
+            if stop:
+                break
+        self.store.close()
+
+    def close(self) -> None:
+        """Write everything queued so far and stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+
+_writer: HistoryWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def record(entry: HistoryEntry) -> None:
+    """Queue ``entry`` for the history database (written in the background)."""
+    global _writer
+    path = history_path()
+    with _writer_lock:
+        if _writer is not None and _writer.store.path != path:
+            _writer.close()  # the app directory moved (tests); finish writing the old one
+            _writer = None
+        if _writer is None:
+            _writer = HistoryWriter(HistoryStore(path))
+            atexit.register(flush)
+        writer = _writer
+    writer.add(entry)
+
+
+def flush() -> None:
+    """Wait until every recorded entry is written."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
+
+
+def record_result(
+    result: GenerationResult, variables: dict[str, str], m: GenerationMetrics
+) -> None:
+    """Record a generation with its metrics.
+
+    Cache hits and coalesced duplicates are skipped: the request that produced
+    the content is recorded already.
+    """
+    if m.cached or m.coalesced:
+        return
+    record(
+        HistoryEntry(
+            template=m.template,
+            provider=result.provider,
+            model=result.model,
+            content=result.content,
+            variables=variables,
+            tokens_used=result.tokens_used,
+            finish_reason=result.finish_reason,
+            metrics={**m.to_dict(), "provider": result.provider, "model": result.model},
+        )
+    )
@@ -0,0 +1,172 @@
+"""Long-form blog posts: an outline first, then every section concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from contentforge import metrics
+from contentforge.providers.base import BaseProvider
+from contentforge.providers.coalesce import ChunkFeed
+
+MIN_SECTIONS = 3
+MAX_SECTIONS = 12
+WORDS_PER_SECTION = 450  # the outline asks for about word_count / this many sections
+OUTLINE_MAX_TOKENS = 1000
+
+OUTLINE_SYSTEM_PROMPT = (
+    "You are an expert content strategist. You plan blog posts as concise markdown "
+    "outlines and reply with the outline only."
+)
+
+_HEADING = re.compile(r"^(#{1,2})\s+(.+?)\s*#*\s*$")
+_NOTE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.+?)\s*$")
+
+
+@dataclass
+class Section:
+    heading: str
+    notes: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Outline:
+    title: str
+    sections: list[Section]
+
+    def to_markdown(self) -> str:
+        lines = [f"# {self.title}"]
+        for section in self.sections:
+            lines.append(f"## {section.heading}")
+            lines.extend(f"- {note}" for note in section.notes)
+        return "\n".join(lines)
+
+
+def section_count(word_count: int) -> int:
+    return max(MIN_SECTIONS, min(MAX_SECTIONS, round(word_count / WORDS_PER_SECTION)))
+
+
+def outline_prompt(variables: dict[str, str]) -> str:
+    word_count = int(variables.get("word_count") or 800)
+    prompt = (
+        f"Plan a {variables.get('tone') or 'professional'} blog post about: "
+        f"{variables['topic']}\n\n"
+        f"It will be about {word_count} words long. Reply in markdown: first the title as "
+        f"'# Title', then {section_count(word_count)} sections as '## Heading' lines, each "
+        "followed by 1-3 '- ' bullet notes on what the section covers. Start with an "
+        "introduction and end with a conclusion. No other text."
+    )
+    if variables.get("keywords"):
+        prompt += f"\nWork these SEO keywords into the plan: {variables['keywords']}"
+    return prompt
+
+
+def parse_outline(text: str, fallback_title: str) -> Outline:
+    """Parse a markdown outline. Raises ValueError if it has no H2 sections."""
+    title = ""
+    sections: list[Section] = []
+    for line in text.splitlines():
+        if heading := _HEADING.match(line):
+            level, value = heading.groups()
+            value = value.strip("*_ ")
+            if level == "#" and not title and not sections:
+                title = value
+            else:
+                sections.append(Section(value))
+        elif (note := _NOTE.match(line)) and sections:
+            sections[-1].notes.append(note.group(1))
+    if not sections:
+        raise ValueError("The outline has no '## ' sections; try again or without --long-form")
+    return Outline(title or fallback_title, sections[:MAX_SECTIONS])
+
+
+def section_prompt(outline: Outline, index: int, variables: dict[str, str]) -> str:
+    """The request for one section. The outline comes first, so every section
+    request shares the same prompt prefix."""
+    words = int(variables.get("word_count") or 800) // len(outline.sections)
+    section = outline.sections[index]
+    prompt = (
+        f"We are writing a {variables.get('tone') or 'professional'} blog post from this "
+        f"outline, one section at a time:\n\n{outline.to_markdown()}\n\n"
+        f'Write section {index + 1} of {len(outline.sections)}: "{section.heading}", '
+        f"about {words} words."
+    )
+    if section.notes:
+        prompt += " Cover: " + "; ".join(section.notes) + "."
+    prompt += (
+        " Start directly with the section body: no '#' title and no heading for this "
+        "section (it is added for you); use '###' for any sub-headings. Do not repeat what "
+        "other sections cover."
+    )
+    if variables.get("keywords"):
+        prompt += f" Use these SEO keywords where they fit naturally: {variables['keywords']}"
+    return prompt
+
+
+async def stream_long_form(
+    prov: BaseProvider,
+    system_prompt: str,
+    variables: dict[str, str],
+    temperature: float = 0.7,
+    max_tokens: int = 2000,
+) -> AsyncIterator[str]:
+    """Yield the post in order: title, then each section as soon as it may stream.
+
+    Every section is written by its own request, all in flight at once, so a long
+    post takes about the outline plus the slowest section rather than one serial
+    generation that ``max_tokens`` may cut off.
+
+    ``max_tokens`` applies to every section request. Token usage of the outline
+    and all sections is summed into the current generation metrics.
+    """
+    parent = metrics.current()
+    usage: list[metrics.GenerationMetrics] = []
+
+    start = time.perf_counter()
+    with metrics.collecting(metrics.GenerationMetrics()) as m:
+        usage.append(m)
+        result = await prov.generate(
+            outline_prompt(variables),
+            OUTLINE_SYSTEM_PROMPT,
+            temperature,
+            min(max_tokens, OUTLINE_MAX_TOKENS),
+        )
+    metrics.record_phase("outline", (time.perf_counter() - start) * 1000)
+    outline = parse_outline(result.content, variables["topic"])
+
+    async def write(index: int, feed: ChunkFeed) -> None:
+        prompt = section_prompt(outline, index, variables)
+        with metrics.collecting(metrics.GenerationMetrics()) as m:
+            usage.append(m)
+            try:
+                async for chunk in prov.stream(prompt, system_prompt, temperature, max_tokens):
+                    feed.push(chunk)
+            except Exception as e:
+                feed.finish(e)
+            else:
+                feed.finish()
+
+    feeds = [ChunkFeed() for _ in outline.sections]
+    for i, feed in enumerate(feeds):
+        feed.task = asyncio.create_task(write(i, feed))
+    try:
+        yield f"# {outline.title}\n\n"
+        for section, feed in zip(outline.sections, feeds, strict=True):
+            yield f"## {section.heading}\n\n"
+            async for chunk in feed.follow():
+                yield chunk
+            yield "\n\n"
+    finally:
+        for feed in feeds:
+            if feed.task is not None:
+                feed.task.cancel()
+        if parent is not None:
+            parent.cached = all(u.cached for u in usage)
+            parent.usage(
+                sum(u.tokens_in for u in usage),
+                sum(u.tokens_out for u in usage),
+                sum(u.tokens_cached for u in usage),
+            )
@@ -0,0 +1,351 @@
+"""Per-generation timings and token counts, with JSONL and Prometheus sinks."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from contentforge import config
+
+_current: ContextVar[GenerationMetrics | None] = ContextVar("contentforge_metrics", default=None)
+
+# Histogram buckets (seconds) for the Prometheus textfile
+BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_STATE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS state (id INTEGER PRIMARY KEY CHECK (id = 0), data TEXT)"
+)
+
+
+def metrics_log_path() -> Path:
+    """Return the path to the append-only metrics log."""
+    return config.APP_DIR / "metrics.jsonl"
+
+
+def metrics_state_path() -> Path:
+    """Return the path to the cumulative totals behind the Prometheus textfile."""
+    return config.APP_DIR / "metrics_state.sqlite"
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+@dataclass
+class GenerationMetrics:
+    """Timings (milliseconds) and token counts for one generation."""
+
+    template: str = ""
+    provider: str = ""
+    model: str = ""
+    streamed: bool = False
+    cached: bool = False
+    coalesced: bool = False  # answered by an identical request already in flight
+    hedged: bool = False  # a backup provider was raced against a slow primary
+    timestamp: float = field(default_factory=time.time)
+    phases: dict[str, float] = field(default_factory=dict)
+    ttft_ms: float | None = None
+    total_ms: float | None = None
+    chunks: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    tokens_cached: int = 0
+    prefix_saved_ms: float | None = None
+    _gaps: list[float] = field(default_factory=list, repr=False)
+    _start: float | None = field(default=None, repr=False)
+    _last_chunk: float | None = field(default=None, repr=False)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as ``name`` (repeated phases accumulate)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, (time.perf_counter() - start) * 1000)
+
+    def add_phase(self, name: str, ms: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + ms
+
+    def request_started(self) -> None:
+        self._start = time.perf_counter()
+
+    def connected(self) -> None:
+        """Response headers arrived (first call wins)."""
+        if self._start is not None and "connect" not in self.phases:
+            self.phases["connect"] = (time.perf_counter() - self._start) * 1000
+
+    def chunk(self) -> None:
+        now = time.perf_counter()
+        if self._start is not None and self.ttft_ms is None:
+            self.ttft_ms = (now - self._start) * 1000
+        elif self._last_chunk is not None:
+            self._gaps.append((now - self._last_chunk) * 1000)
+        self._last_chunk = now
+        self.chunks += 1
+
+    def finish(self) -> None:
+        if self._start is not None:
+            self.total_ms = (time.perf_counter() - self._start) * 1000
+
+    def usage(self, tokens_in: int, tokens_out: int, tokens_cached: int = 0) -> None:
+        """Add one request's token counts (a generation may make several)."""
+        self.tokens_in += tokens_in or 0
+        self.tokens_out += tokens_out or 0
+        self.tokens_cached += tokens_cached or 0
+
+    @property
+    def prefix_cache_hit_rate(self) -> float | None:
+        """Share of prompt tokens the provider served from its prefix cache."""
+        if not self.tokens_in:
+            return None
+        return min(1.0, self.tokens_cached / self.tokens_in)
+
+    @property
+    def tokens_per_second(self) -> float | None:
+        """Output tokens per second of generation (after the first token when streamed)."""
+        if not self.tokens_out or not self.total_ms:
+            return None
+        window = self.total_ms
+        if self.ttft_ms is not None and self.total_ms > self.ttft_ms:
+            window = self.total_ms - self.ttft_ms
+        return self.tokens_out / (window / 1000)
+
+    def gap_stats(self) -> dict[str, float] | None:
+        if not self._gaps:
+            return None
+        return {
+            "mean": sum(self._gaps) / len(self._gaps),
+            "p95": _percentile(self._gaps, 95),
+            "max": max(self._gaps),
+        }
+
+    def to_dict(self) -> dict:
+        tps = self.tokens_per_second
+        hit = self.prefix_cache_hit_rate
+        return {
+            "timestamp": self.timestamp,
+            "template": self.template,
+            "provider": self.provider,
+            "model": self.model,
+            "streamed": self.streamed,
+            "cached": self.cached,
+            "coalesced": self.coalesced,
+            "hedged": self.hedged,
+            "phases_ms": {k: round(v, 3) for k, v in self.phases.items()},
+            "ttft_ms": None if self.ttft_ms is None else round(self.ttft_ms, 3),
+            "total_ms": None if self.total_ms is None else round(self.total_ms, 3),
+            "chunks": self.chunks,
+            "inter_chunk_ms": (
+                {k: round(v, 3) for k, v in gaps.items()} if (gaps := self.gap_stats()) else None
+            ),
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "tokens_per_second": None if tps is None else round(tps, 2),
+            "tokens_cached": self.tokens_cached,
+            "prefix_cache_hit_rate": None if hit is None else round(hit, 4),
+            "prefix_saved_ms": (
+                None if self.prefix_saved_ms is None else round(self.prefix_saved_ms, 3)
+            ),
+        }
+
+
+# Providers report what only they can see (response headers arriving, token usage)
+# through the record_* helpers, which are no-ops when nothing is being collected.
+def current() -> GenerationMetrics | None:
+    """The metrics being collected in this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def collecting(metrics: GenerationMetrics) -> Iterator[GenerationMetrics]:
+    """Make ``metrics`` current; tasks and streams started inside report into it."""
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def record_connect() -> None:
+    if (m := _current.get()) is not None:
+        m.connected()
+
+
+def record_usage(tokens_in: int, tokens_out: int, tokens_cached: int = 0) -> None:
+    if (m := _current.get()) is not None:
+        m.usage(tokens_in, tokens_out, tokens_cached)
+
+
+def record_prefix_savings(ms: float) -> None:
+    """Estimated prompt-processing time saved by the provider's prefix cache."""
+    if (m := _current.get()) is not None:
+        m.prefix_saved_ms = (m.prefix_saved_ms or 0.0) + ms
+
+
+def record_phase(name: str, ms: float) -> None:
+    if (m := _current.get()) is not None:
+        m.add_phase(name, ms)
+
+
+def mark_cached() -> None:
+    if (m := _current.get()) is not None:
+        m.cached = True
+
+
+def mark_coalesced() -> None:
+    if (m := _current.get()) is not None:
+        m.coalesced = True
+
+
+def record_hedge(hedged: bool, provider: str, model: str) -> None:
+    """Outcome of a hedged request: whether a backup was raced and who answered."""
+    if (m := _current.get()) is not None:
+        m.hedged = m.hedged or hedged
+        m.provider, m.model = provider, model
+
+
+def append_log(metrics: GenerationMetrics, path: Path | None = None) -> None:
+    """Append one JSON line to the metrics log (best-effort)."""
+    path = path or metrics_log_path()
+    line = json.dumps(metrics.to_dict(), ensure_ascii=False) + "\n"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError:
+        pass
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _observe(hist: dict, seconds: float) -> None:
+    counts = hist.setdefault("buckets", [0] * len(BUCKETS))
+    for i, bound in enumerate(BUCKETS):
+        if seconds <= bound:
+            counts[i] += 1
+    hist["sum"] = hist.get("sum", 0.0) + seconds
+    hist["count"] = hist.get("count", 0) + 1
+
+
+def _update_state(state: dict, m: GenerationMetrics) -> None:
+    key = f"{m.provider}\t{m.model}"
+    series = state.setdefault(key, {"generations": {}, "tokens_in": 0, "tokens_out": 0})
+    label = "cached" if m.cached else "live"
+    series["generations"][label] = series["generations"].get(label, 0) + 1
+    series["tokens_in"] += m.tokens_in
+    series["tokens_out"] += m.tokens_out
+    series["tokens_cached"] = series.get("tokens_cached", 0) + m.tokens_cached
+    if m.prefix_saved_ms:
+        series["prefix_saved_seconds"] = (
+            series.get("prefix_saved_seconds", 0.0) + m.prefix_saved_ms / 1000
+        )
+    if m.total_ms is not None:
+        _observe(series.setdefault("duration", {}), m.total_ms / 1000)
+    if m.ttft_ms is not None:
+        _observe(series.setdefault("ttft", {}), m.ttft_ms / 1000)
+    if (tps := m.tokens_per_second) is not None:
+        series["last_tokens_per_second"] = tps
+
+
+def _render_histogram(lines: list[str], name: str, labels: dict[str, str], hist: dict) -> None:
+    for bound, count in zip(BUCKETS, hist["buckets"], strict=True):
+        lines.append(f"{name}_bucket{_labels(**labels, le=f'{bound:g}')} {count}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist['count']}")
+    lines.append(f"{name}_sum{_labels(**labels)} {hist['sum']:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {hist['count']}")
+
+
+def render_textfile(state: dict) -> str:
+    """Render cumulative totals in the Prometheus text exposition format."""
+    lines = [
+        "# HELP contentforge_generations_total Generations completed.",
+        "# TYPE contentforge_generations_total counter",
+    ]
+    for key, s in sorted(state.items()):
+        provider, model = key.split("\t")
+        for source, count in sorted(s["generations"].items()):
+            labels = _labels(provider=provider, model=model, source=source)
+            lines.append(f"contentforge_generations_total{labels} {count}")
+    lines += [
+        "# HELP contentforge_tokens_total Tokens processed (cached: prompt tokens served from a prefix cache).",
+        "# TYPE contentforge_tokens_total counter",
+    ]
+    for key, s in sorted(state.items()):
+        provider, model = key.split("\t")
+        for direction in ("in", "out", "cached"):
+            labels = _labels(provider=provider, model=model, direction=direction)
+            lines.append(f"contentforge_tokens_total{labels} {s.get(f'tokens_{direction}', 0)}")
+    lines += [
+        "# HELP contentforge_prefix_saved_seconds_total Estimated prompt time saved by prefix caching.",
+        "# TYPE contentforge_prefix_saved_seconds_total counter",
+    ]
+    for key, s in sorted(state.items()):
+        if "prefix_saved_seconds" in s:
+            provider, model = key.split("\t")
+            labels = _labels(provider=provider, model=model)
+            lines.append(
+                f"contentforge_prefix_saved_seconds_total{labels} {s['prefix_saved_seconds']:.6f}"
+            )
+    for metric, name, help_text in (
+        ("duration", "contentforge_generation_seconds", "Total generation latency."),
+        ("ttft", "contentforge_ttft_seconds", "Time to first streamed token."),
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for key, s in sorted(state.items()):
+            if metric in s:
+                provider, model = key.split("\t")
+                _render_histogram(lines, name, {"provider": provider, "model": model}, s[metric])
+    lines += [
+        "# HELP contentforge_tokens_per_second Output tokens/sec of the latest generation.",
+        "# TYPE contentforge_tokens_per_second gauge",
+    ]
+    for key, s in sorted(state.items()):
+        if "last_tokens_per_second" in s:
+            provider, model = key.split("\t")
+            labels = _labels(provider=provider, model=model)
+            lines.append(
+                f"contentforge_tokens_per_second{labels} {s['last_tokens_per_second']:.3f}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def update_textfile(metrics: GenerationMetrics, path: Path, state_path: Path | None = None) -> None:
+    """Fold ``metrics`` into the cumulative totals and rewrite the textfile atomically."""
+    state_path = state_path or metrics_state_path()
+    db = None
+    try:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(state_path, timeout=30.0, isolation_level=None)
+        db.execute(_STATE_SCHEMA)
+        # One write transaction around read, update and rewrite: processes finishing
+        # together queue here instead of losing increments or writing older totals.
+        db.execute("BEGIN IMMEDIATE")
+        row = db.execute("SELECT data FROM state WHERE id = 0").fetchone()
+        state = json.loads(row[0]) if row else {}
+        _update_state(state, metrics)
+        db.execute("INSERT OR REPLACE INTO state (id, data) VALUES (0, ?)", (json.dumps(state),))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(render_textfile(state), encoding="utf-8")
+        os.replace(tmp, path)  # scrapers never see a half-written file
+        db.execute("COMMIT")
+    except (OSError, ValueError, sqlite3.Error):
+        pass  # best-effort; an open transaction is rolled back on close
+    finally:
+        if db is not None:
+            db.close()
@@ -0,0 +1,356 @@
+"""Offline generation through the OpenAI Batch API (``generate batch --offline``)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import secrets
+import shutil
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from contentforge import config
+from contentforge.batch import _RESERVED_KEYS, BatchStats
+from contentforge.providers.prefix import chat_messages, prefix_key
+from contentforge.templates import TemplateError, get_template, render_prompt
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+MAX_REQUESTS = 50_000  # per batch input file (API limit)
+MAX_BYTES = 190 * 1024 * 1024  # API limit is 200 MB
+ENDPOINT = "/v1/chat/completions"
+
+# Batch statuses after which nothing changes any more
+TERMINAL = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+# Each job lives in batches/<job id>/: job.json (settings and per-part state, saved
+# after every step, so ``jobs resume`` picks up an interrupted run), rows.jsonl (index,
+# id and template of every row, or its render error) and the part-NNNN.jsonl inputs.
+def jobs_dir() -> Path:
+    """Return the directory holding offline job state."""
+    return config.APP_DIR / "batches"
+
+
+@dataclass
+class BatchPart:
+    """One batch input file and the batch created from it."""
+
+    input_file: str
+    requests: int
+    file_id: str = ""
+    batch_id: str = ""
+    status: str = "pending"  # until the batch exists, then the API's status
+    output_file_id: str = ""
+    error_file_id: str = ""
+    completed: int = 0
+    failed: int = 0
+
+
+@dataclass
+class OfflineJob:
+    """A tracked Batch API job; ``save`` after every change so it can be resumed."""
+
+    id: str
+    jobs_file: str
+    model: str
+    template: str | None = None
+    temperature: float = 0.7
+    max_tokens: int = 2000
+    output: str = ""  # JSONL results path ("" = stdout)
+    created: float = field(default_factory=time.time)
+    rows: int = 0
+    render_errors: int = 0
+    collected: bool = False
+    parts: list[BatchPart] = field(default_factory=list)
+
+    @property
+    def path(self) -> Path:
+        return jobs_dir() / self.id
+
+    @property
+    def finished(self) -> bool:
+        return all(p.status in TERMINAL for p in self.parts)
+
+    @property
+    def status(self) -> str:
+        if self.collected:
+            return "collected"
+        if not self.parts:
+            return "empty"
+        if self.finished:
+            return "finished"
+        if any(p.batch_id == "" for p in self.parts):
+            return "pending"
+        return "running"
+
+    def save(self, directory: Path | None = None) -> None:
+        directory = directory or self.path
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / "job.json.tmp"
+        tmp.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+        os.replace(tmp, directory / "job.json")
+
+    @classmethod
+    def load(cls, job_id: str) -> OfflineJob:
+        """Load a tracked job. Raises KeyError if there is no such job."""
+        try:
+            data = json.loads((jobs_dir() / job_id / "job.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raise KeyError(f"Offline job not found: {job_id!r}") from None
+        parts = [BatchPart(**p) for p in data.pop("parts")]
+        return cls(**data, parts=parts)
+
+
+def list_jobs() -> list[OfflineJob]:
+    """All tracked jobs, newest first."""
+    try:
+        names = (p.name for p in jobs_dir().iterdir() if p.is_dir())
+        ids = sorted((n for n in names if not n.startswith(".")), reverse=True)
+    except OSError:
+        return []
+    jobs = []
+    for job_id in ids:
+        try:
+            jobs.append(OfflineJob.load(job_id))
+        except KeyError:
+            continue
+    return jobs
+
+
+def _request_line(job: OfflineJob, index: int, system_prompt: str, prompt: str) -> bytes:
+    body: dict[str, Any] = {
+        "model": job.model,
+        "messages": chat_messages(system_prompt, prompt),
+        "temperature": job.temperature,
+        "max_tokens": job.max_tokens,
+    }
+    if system_prompt:
+        body["prompt_cache_key"] = prefix_key(job.model, system_prompt)
+    line = {"custom_id": str(index), "method": "POST", "url": ENDPOINT, "body": body}
+    return (json.dumps(line, ensure_ascii=False) + "\n").encode()
+
+
+def prepare_job(
+    jobs: Iterable[dict[str, str]],
+    jobs_file: str,
+    model: str,
+    template_id: str | None = None,
+    temperature: float = 0.7,
+    max_tokens: int = 2000,
+    output: str = "",
+    max_requests: int = MAX_REQUESTS,
+    max_bytes: int = MAX_BYTES,
+) -> OfflineJob:
+    """Render every row into batch input files and start tracking the job.
+
+    Rows are streamed to disk, so memory stays flat for any number of rows.
+    Rows that fail to render are recorded and reported with the results. The
+    files are written to a staging directory that becomes the job directory
+    only once complete, so an error while reading ``jobs`` leaves nothing behind.
+    """
+    job = OfflineJob(
+        id=f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}",
+        jobs_file=jobs_file,
+        model=model,
+        template=template_id,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        output=output,
+    )
+    staging = job.path.with_name(f".{job.id}.tmp")
+    staging.mkdir(parents=True)
+    part_fh = None
+    part_bytes = 0
+    try:
+        with (staging / "rows.jsonl").open("w", encoding="utf-8") as rows_fh:
+            for index, row in enumerate(jobs):
+                tid = row.get("template") or template_id or ""
+                meta: dict[str, Any] = {"index": index}
+                if "id" in row:
+                    meta["id"] = row["id"]
+                meta["template"] = tid
+                try:
+                    tpl = get_template(tid)
+                    variables = {k: v for k, v in row.items() if k not in _RESERVED_KEYS}
+                    line = _request_line(
+                        job, index, tpl.system_prompt, render_prompt(tpl, variables)
+                    )
+                except (KeyError, TemplateError) as e:
+                    meta["error"] = str(e)
+                    job.render_errors += 1
+                else:
+                    if (
+                        part_fh is None
+                        or job.parts[-1].requests >= max_requests
+                        or part_bytes + len(line) > max_bytes
+                    ):
+                        if part_fh is not None:
+                            part_fh.close()
+                        name = f"part-{len(job.parts) + 1:04d}.jsonl"
+                        job.parts.append(BatchPart(input_file=name, requests=0))
+                        part_fh = (staging / name).open("wb")
+                        part_bytes = 0
+                    part = job.parts[-1]
+                    part_fh.write(line)
+                    part_bytes += len(line)
+                    part.requests += 1
+                rows_fh.write(json.dumps(meta, ensure_ascii=False) + "\n")
+                job.rows += 1
+        if part_fh is not None:
+            part_fh.close()
+        job.save(staging)
+        staging.rename(job.path)
+    except BaseException:
+        if part_fh is not None:
+            part_fh.close()
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return job
+
+
+async def submit(client: AsyncOpenAI, job: OfflineJob) -> None:
+    """Upload input files and create batches for parts that have none yet."""
+    for part in job.parts:
+        if not part.file_id:
+            with (job.path / part.input_file).open("rb") as fh:
+                uploaded = await client.files.create(file=fh, purpose="batch")
+            part.file_id = uploaded.id
+            job.save()
+        if not part.batch_id:
+            batch = await client.batches.create(
+                input_file_id=part.file_id,
+                endpoint=ENDPOINT,
+                completion_window="24h",
+                metadata={"contentforge_job": job.id, "part": part.input_file},
+            )
+            part.batch_id = batch.id
+            part.status = batch.status
+            job.save()
+
+
+async def refresh(client: AsyncOpenAI, job: OfflineJob) -> None:
+    """Fetch the current status of every unfinished batch."""
+    for part in job.parts:
+        if not part.batch_id or part.status in TERMINAL:
+            continue
+        batch = await client.batches.retrieve(part.batch_id)
+        part.status = batch.status
+        part.output_file_id = batch.output_file_id or ""
+        part.error_file_id = batch.error_file_id or ""
+        if batch.request_counts is not None:
+            part.completed = batch.request_counts.completed
+            part.failed = batch.request_counts.failed
+    job.save()
+
+
+async def wait(
+    client: AsyncOpenAI,
+    job: OfflineJob,
+    poll_interval: float = 10.0,
+    max_interval: float = 300.0,
+    progress: Callable[[OfflineJob], None] | None = None,
+) -> None:
+    """Poll until every batch is finished, doubling the interval up to ``max_interval``."""
+    interval = poll_interval
+    while True:
+        await refresh(client, job)
+        if progress:
+            progress(job)
+        if job.finished:
+            return
+        await asyncio.sleep(interval)
+        interval = min(interval * 2, max_interval)
+
+
+async def cancel(client: AsyncOpenAI, job: OfflineJob) -> int:
+    """Cancel every unfinished batch; returns how many were cancelled."""
+    cancelled = 0
+    for part in job.parts:
+        if part.batch_id and part.status not in TERMINAL and part.status != "cancelling":
+            batch = await client.batches.cancel(part.batch_id)
+            part.status = batch.status
+            cancelled += 1
+    job.save()
+    return cancelled
+
+
+def _result_record(meta: dict, job: OfflineJob, line: dict) -> dict:
+    record = dict(meta)
+    response = line.get("response") or {}
+    body = response.get("body") or {}
+    if line.get("error") or response.get("status_code") != 200:
+        error = line.get("error") or body.get("error") or {}
+        record["error"] = error.get("message") or f"HTTP {response.get('status_code')}"
+        return record
+    choice = body["choices"][0]
+    usage = body.get("usage") or {}
+    record.update(
+        content=choice["message"].get("content") or "",
+        provider="openai",
+        model=body.get("model", job.model),
+        tokens_used=usage.get("total_tokens", 0),
+        finish_reason=choice.get("finish_reason") or "stop",
+    )
+    return record
+
+
+async def _stream_lines(client: AsyncOpenAI, file_id: str):
+    async with client.files.with_streaming_response.content(file_id) as response:
+        async for line in response.iter_lines():
+            if line.strip():
+                yield json.loads(line)
+
+
+async def collect(
+    client: AsyncOpenAI, job: OfflineJob, write: Callable[[dict], None]
+) -> BatchStats:
+    """Stream every finished batch's results (and errors) to ``write``.
+
+    Rows that were never answered (the batch failed, expired or was cancelled)
+    and rows that could not be rendered are written as error records. Collecting
+    is idempotent: every finished batch's output file is read again.
+    """
+    stats = BatchStats()
+    rows: dict[str, dict] = {}
+    with (job.path / "rows.jsonl").open(encoding="utf-8") as fh:
+        for line in fh:
+            meta = json.loads(line)
+            rows[str(meta["index"])] = meta
+
+    def _emit(record: dict) -> None:
+        if "error" in record:
+            stats.failed += 1
+        else:
+            stats.succeeded += 1
+            stats.tokens_used += record["tokens_used"]
+        write(record)
+
+    for part in job.parts:
+        for file_id in (part.output_file_id, part.error_file_id):
+            if not file_id:
+                continue
+            async for line in _stream_lines(client, file_id):
+                meta = rows.pop(line.get("custom_id", ""), None)
+                if meta is None:
+                    continue
+                usage = ((line.get("response") or {}).get("body") or {}).get("usage") or {}
+                stats.tokens_in += usage.get("prompt_tokens", 0)
+                details = usage.get("prompt_tokens_details") or {}
+                stats.tokens_cached += details.get("cached_tokens") or 0
+                _emit(_result_record(meta, job, line))
+
+    statuses = {p.status for p in job.parts if p.status != "completed"}
+    reason = f"batch {', '.join(sorted(statuses))}" if statuses else "no result returned"
+    for meta in rows.values():
+        _emit(meta if "error" in meta else {**meta, "error": reason})
+
+    job.collected = True
+    job.save()
+    stats.finished = time.perf_counter()
+    return stats
@@ -3,13 +3,20 @@
 from __future__ import annotations
 
 import asyncio
+import os
+import re
+import time
 from collections.abc import AsyncIterator
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from rich.console import Console
-from rich.live import Live
-from rich.markdown import Markdown
-from rich.panel import Panel
+
+if TYPE_CHECKING:
+    from rich.console import ConsoleOptions, RenderResult
+
+# rich.markdown (markdown-it + pygments) and rich.live are imported inside the
+# functions that render, keeping `import contentforge.output` cheap.
 
 console = Console()
 err_console = Console(stderr=True)
@@ -17,6 +24,9 @@ err_console = Console(stderr=True)
 
 def render_markdown(content: str, title: str = "") -> None:
     """Render content as a Rich markdown panel."""
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+
     md = Markdown(content)
     if title:
         console.print(Panel(md, title=title, border_style="cyan", padding=(1, 2)))
@@ -42,19 +52,178 @@ def render_json(content: str, provider: str, model: str, tokens: int) -> None:
     console.print_json(json.dumps(data))
 
 
-def run_stream_markdown(chunks: AsyncIterator[str]) -> str:
+def render_variants(contents: list[str], fmt: str = "markdown", title: str = "") -> None:
+    """Render alternatives side by side, one panel per variant."""
+    from rich.columns import Columns
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+    from rich.text import Text
+
+    label = f"{title} • " if title else ""
+    panels = [
+        Panel(
+            Markdown(content) if fmt == "markdown" else Text(content),
+            title=f"{label}Variant {i}",
+            border_style="cyan",
+            padding=(1, 2),
+        )
+        for i, content in enumerate(contents, start=1)
+    ]
+    console.print(Columns(panels, equal=True, expand=True))
+
+
+def render_variants_json(
+    contents: list[str], provider: str, model: str, tokens: int, requests: int
+) -> None:
+    """Print alternatives as structured JSON."""
+    import json
+
+    data = {
+        "variants": [{"index": i, "content": c} for i, c in enumerate(contents)],
+        "provider": provider,
+        "model": model,
+        "tokens_used": tokens,
+        "requests": requests,
+    }
+    console.print_json(json.dumps(data))
+
+
+def join_variants(contents: list[str]) -> str:
+    """Alternatives as one markdown document, for saving or copying."""
+    return "\n\n---\n\n".join(
+        f"## Variant {i}\n\n{content.strip()}" for i, content in enumerate(contents, start=1)
+    )
+
+
+_LIST_ITEM = re.compile(r" {0,3}(?:[-*+]|\d{1,9}[.)])(?:[ \t]|$)")
+_THEMATIC_BREAK = re.compile(r" {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+
+
+def _is_list_item(line: str) -> bool:
+    return bool(_LIST_ITEM.match(line)) and not _THEMATIC_BREAK.match(line)
+
+
+class MarkdownStreamBuffer:
+    """Split streamed markdown into finished blocks and an open tail.
+
+    A block is finished at the first blank line outside a fenced code block,
+    except inside a list: there it ends only when the next line is neither a
+    list item nor indented, so loose lists and item continuations stay whole.
+    Only complete lines are scanned, and each line is scanned once, so feeding
+    a whole document costs time linear in its length.
+    """
+
+    def __init__(self) -> None:
+        self._block: list[str] = []
+        self._partial = ""
+        self._fence = ""
+        self._in_list = False
+        self._blank = False  # a blank line followed an open list; it may still continue
+
+    def feed(self, text: str) -> list[str]:
+        """Add streamed text and return any blocks it completed."""
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        done: list[str] = []
+        for line in lines:
+            stripped = line.lstrip()
+            if self._fence:
+                self._block.append(line)
+                if stripped.startswith(self._fence):
+                    self._fence = ""
+                continue
+            if not stripped:
+                if self._in_list:
+                    self._blank = True
+                elif self._block:
+                    done.append("\n".join(self._block))
+                    self._block = []
+                continue
+            item = _is_list_item(line)
+            if self._blank:
+                self._blank = False
+                if item or line[0] in " \t":
+                    self._block.append("")
+                else:
+                    done.append("\n".join(self._block))
+                    self._block, self._in_list = [], False
+            if item:
+                self._in_list = True
+            if stripped.startswith(("```", "~~~")):
+                self._fence = stripped[:3]
+            self._block.append(line)
+        return done
+
+    @property
+    def tail(self) -> str:
+        """The unfinished block, including any partial last line."""
+        if not self._block:
+            return self._partial
+        return "\n".join([*self._block, *([""] if self._blank else []), self._partial])
+
+
+class _MarkdownBlock:
+    """Render one markdown block as it appears after ``previous`` (None: first block)."""
+
+    def __init__(self, markdown: str, previous: str | None) -> None:
+        self.markdown = markdown
+        self.previous = previous
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        from rich.markdown import Markdown
+        from rich.segment import SegmentLines
+
+        if self.previous is None:
+            yield Markdown(self.markdown)
+            return
+        # Render behind a one-line placeholder and drop it, so the block gets exactly
+        # the inter-block spacing a full-document render has. A rule is followed by
+        # no blank line, so it stands in for itself; any other block for a paragraph.
+        stub = "---" if _THEMATIC_BREAK.match(self.previous) else "x"
+        lines = console.render_lines(Markdown(f"{stub}\n\n{self.markdown}"), options, pad=False)
+        yield SegmentLines(lines[1:], new_lines=True)
+
+
+def run_stream_markdown(chunks: AsyncIterator[str], refresh_per_second: float = 8) -> str:
     """Stream chunks with live markdown rendering. Returns full content.
 
     Runs the entire async iteration inside a single asyncio.run() call
     so the async iterator is created and consumed in the same event loop.
+
+    Finished blocks are rendered once and printed above the live region; only
+    the open tail block is re-parsed, at most ``refresh_per_second`` times.
     """
+    from rich.live import Live
+    from rich.markdown import Markdown
+
     collected: list[str] = []
+    buffer = MarkdownStreamBuffer()
+    interval = 1.0 / refresh_per_second
 
     async def _consume() -> None:
-        with Live(Markdown(""), console=console, refresh_per_second=8) as live:
+        pending: list[str] = []
+        last_frame = 0.0
+
+        previous: str | None = None
+
+        with Live(Markdown(""), console=console, auto_refresh=False) as live:
+
+            def _frame() -> None:
+                nonlocal previous
+                for block in buffer.feed("".join(pending)):
+                    live.console.print(_MarkdownBlock(block, previous))
+                    previous = block
+                pending.clear()
+                live.update(_MarkdownBlock(buffer.tail, previous), refresh=True)
+
             async for chunk in chunks:
                 collected.append(chunk)
-                live.update(Markdown("".join(collected)))
+                pending.append(chunk)
+                now = time.monotonic()
+                if now - last_frame >= interval:
+                    _frame()
+                    last_frame = now
+            _frame()
 
     asyncio.run(_consume())
     return "".join(collected)
@@ -77,13 +246,85 @@ def run_stream_plain(chunks: AsyncIterator[str]) -> str:
     return "".join(collected)
 
 
+class FileSink:
+    """Write a response to ``path`` as it is generated.
+
+    Chunks go to ``<path>.partial`` through an in-memory buffer that is flushed
+    once it holds ``flush_bytes`` characters or ``flush_interval`` seconds after
+    the last flush, so a crash loses at most that much. Used as a context manager, a
+    clean exit renames the partial file over ``path`` atomically; an exception
+    leaves ``path`` untouched and keeps the ``.partial`` file.
+    """
+
+    def __init__(
+        self, path: str | Path, flush_bytes: int = 16 * 1024, flush_interval: float = 0.5
+    ) -> None:
+        self.path = Path(path).resolve()
+        self.partial_path = self.path.with_name(self.path.name + ".partial")
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.flushes = 0
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.partial_path.open("w", encoding="utf-8")
+
+    def write(self, chunk: str) -> None:
+        self._buffer.append(chunk)
+        self._buffered += len(chunk)
+        if (
+            self._buffered >= self.flush_bytes
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._fh.write("".join(self._buffer))
+            self._fh.flush()
+            self._buffer.clear()
+            self._buffered = 0
+            self.flushes += 1
+        self._last_flush = time.monotonic()
+
+    async def tee(self, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Pass ``chunks`` through, writing each one to the file."""
+        async for chunk in chunks:
+            self.write(chunk)
+            yield chunk
+
+    def commit(self) -> Path:
+        """Flush, sync and move the partial file into place."""
+        self.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+        os.replace(self.partial_path, self.path)
+        err_console.print(f"[green]Saved to {self.path}[/green]")
+        return self.path
+
+    def abort(self) -> Path:
+        """Flush what was received and keep it in the partial file."""
+        self.flush()
+        self._fh.close()
+        err_console.print(f"[yellow]Partial output kept in {self.partial_path}[/yellow]")
+        return self.partial_path
+
+    def __enter__(self) -> FileSink:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
 def save_to_file(content: str, path: str) -> Path:
-    """Save content to a file and return the resolved path."""
-    p = Path(path).resolve()
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(content, encoding="utf-8")
-    err_console.print(f"[green]Saved to {p}[/green]")
-    return p
+    """Save content to a file atomically and return the resolved path."""
+    with FileSink(path) as sink:
+        sink.write(content)
+    return sink.path
 
 
 def copy_to_clipboard(content: str) -> bool:
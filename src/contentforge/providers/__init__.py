@@ -2,19 +2,102 @@
 
 from __future__ import annotations
 
-from contentforge.config import load_config
-from contentforge.providers.base import BaseProvider, GenerationResult
+from typing import TYPE_CHECKING
 
-__all__ = ["BaseProvider", "GenerationResult", "get_provider", "list_providers"]
+from contentforge.config import Config, load_config
+from contentforge.providers.base import BaseProvider, GenerationResult, MultiResult
 
+if TYPE_CHECKING:
+    import threading
 
-def get_provider(name: str | None = None, model: str | None = None) -> BaseProvider:
+    from contentforge.providers.ollama_provider import OllamaProvider
+
+__all__ = [
+    "BaseProvider",
+    "GenerationResult",
+    "MultiResult",
+    "get_provider",
+    "list_providers",
+    "warm_up",
+]
+
+
+def get_provider(
+    name: str | None = None,
+    model: str | None = None,
+    cache: bool | None = None,
+    refresh: bool = False,
+    cfg: Config | None = None,
+    hedge: str | None = None,
+    coalesce: bool = False,
+) -> BaseProvider:
     """Create and return a provider instance.
 
     Uses a factory-per-call pattern (CLI is short-lived, no singleton needed).
+    The provider is wrapped with the scheduler from ``providers.ratelimit``
+    (RPM/TPM budgets, retries on 429/5xx). When caching is enabled (``cache`` or
+    the ``cache_enabled`` config key) it is wrapped again so repeated requests
+    are served from the local cache without touching the rate limits. With
+    ``coalesce`` (batch and server modes) concurrent identical requests share
+    one upstream call through ``providers.coalesce``.
+    Pass ``cfg`` to reuse a config snapshot the caller already loaded.
+
+    ``hedge`` (default: the ``hedge_provider`` config key) names a backup
+    ``provider[/model]`` that is raced against the primary when it has not
+    produced a first token within the adaptive hedge threshold; ``"none"``
+    disables hedging.
     """
-    cfg = load_config()
+    from contentforge.providers.ratelimit import RateLimitedProvider
+
+    cfg = cfg or load_config()
     name = name or cfg.default_provider
+    provider: BaseProvider = RateLimitedProvider(
+        _create_provider(cfg, name, model),
+        rpm=getattr(cfg, f"{name}_rpm", 0),
+        tpm=getattr(cfg, f"{name}_tpm", 0),
+        max_retries=cfg.max_retries,
+        max_backoff=cfg.retry_max_backoff,
+    )
+
+    use_cache = cache if cache is not None else cfg.cache_enabled
+    if use_cache:
+        from contentforge.cache import open_cache
+        from contentforge.providers.cached import CachedProvider
+
+        provider = CachedProvider(provider, open_cache(cfg), refresh=refresh)
+
+    if coalesce:
+        from contentforge.providers.coalesce import CoalescingProvider
+
+        provider = CoalescingProvider(provider)
+
+    hedge = hedge if hedge is not None else cfg.hedge_provider
+    if hedge and hedge != "none":
+        from contentforge.providers.hedge import HedgedProvider, TTFTTracker, ttft_path
+
+        backup_name, _, backup_model = hedge.partition("/")
+        backup = get_provider(
+            backup_name, backup_model or None, cache=cache, refresh=refresh, cfg=cfg, hedge="none"
+        )
+        provider = HedgedProvider(provider, backup, cfg.hedge_after_ms, TTFTTracker(ttft_path()))
+    return provider
+
+
+def warm_up(
+    name: str | None = None, model: str | None = None, cfg: Config | None = None
+) -> threading.Thread | None:
+    """Start loading a local model in the background so the first request skips the load.
+
+    Only Ollama loads models on demand; returns the loading thread, or None.
+    """
+    cfg = cfg or load_config()
+    if (name or cfg.default_provider) != "ollama" or not cfg.ollama_warm_up:
+        return None
+    return _create_ollama(cfg, model).warm_up()
+
+
+def _create_provider(cfg: Config, name: str, model: str | None) -> BaseProvider:
+    from contentforge.providers.http import PoolSettings
 
     if name == "openai":
         from contentforge.providers.openai_provider import OpenAIProvider
@@ -24,7 +107,12 @@ def get_provider(name: str | None = None, model: str | None = None) -> BaseProvi
                 "OpenAI API key not configured. "
                 "Run: contentforge config set openai_api_key YOUR_KEY"
             )
-        return OpenAIProvider(api_key=cfg.openai_api_key, model=model or cfg.openai_model)
+        return OpenAIProvider(
+            api_key=cfg.openai_api_key,
+            model=model or cfg.openai_model,
+            pool=PoolSettings.from_config(cfg),
+            max_retries=0,  # retries are handled by RateLimitedProvider
+        )
 
     if name == "gemini":
         from contentforge.providers.gemini_provider import GeminiProvider
@@ -37,40 +125,55 @@ def get_provider(name: str | None = None, model: str | None = None) -> BaseProvi
         return GeminiProvider(api_key=cfg.gemini_api_key, model=model or cfg.gemini_model)
 
     if name == "ollama":
-        from contentforge.providers.ollama_provider import OllamaProvider
-
-        return OllamaProvider(base_url=cfg.ollama_base_url, model=model or cfg.ollama_model)
+        return _create_ollama(cfg, model)
 
     raise ValueError(f"Unknown provider: {name!r}. Available: openai, gemini, ollama")
 
 
-def list_providers() -> list[dict]:
-    """Return metadata for all known providers."""
-    cfg = load_config()
-    providers = []
-
-    # OpenAI
-    from contentforge.providers.openai_provider import OpenAIProvider
+def _create_ollama(cfg: Config, model: str | None) -> OllamaProvider:
+    from contentforge.providers.http import PoolSettings
+    from contentforge.providers.ollama_provider import OllamaProvider, keep_alive_for
 
-    if cfg.openai_api_key:
-        p = OpenAIProvider(api_key=cfg.openai_api_key, model=cfg.openai_model)
-    else:
-        p = type("_Stub", (), {"name": "openai", "models": OpenAIProvider.models, "is_available": lambda self: False})()  # type: ignore[assignment]
-    providers.append({"name": "openai", "models": OpenAIProvider.models, "available": p.is_available(), "default_model": cfg.openai_model})
+    model = model or cfg.ollama_model
+    return OllamaProvider(
+        base_url=cfg.ollama_base_url,
+        model=model,
+        pool=PoolSettings.from_config(cfg),
+        keep_alive=keep_alive_for(model, cfg.ollama_keep_alive, cfg.ollama_model_keep_alive),
+    )
 
-    # Gemini
-    from contentforge.providers.gemini_provider import GeminiProvider
 
-    if cfg.gemini_api_key:
-        p = GeminiProvider(api_key=cfg.gemini_api_key, model=cfg.gemini_model)
-    else:
-        p = type("_Stub", (), {"name": "gemini", "models": GeminiProvider.models, "is_available": lambda self: False})()  # type: ignore[assignment]
-    providers.append({"name": "gemini", "models": GeminiProvider.models, "available": p.is_available(), "default_model": cfg.gemini_model})
+def list_providers(cfg: Config | None = None, refresh: bool = False) -> list[dict]:
+    """Return metadata and health for all known providers.
 
-    # Ollama
+    Providers are probed concurrently (see ``providers.health``) and results are
+    cached on disk for ``health_cache_ttl`` seconds unless ``refresh`` is set.
+    """
+    from contentforge.providers.gemini_provider import GeminiProvider
+    from contentforge.providers.health import get_health
     from contentforge.providers.ollama_provider import OllamaProvider
+    from contentforge.providers.openai_provider import OpenAIProvider
 
-    op = OllamaProvider(base_url=cfg.ollama_base_url, model=cfg.ollama_model)
-    providers.append({"name": "ollama", "models": OllamaProvider.models, "available": op.is_available(), "default_model": cfg.ollama_model})
-
+    cfg = cfg or load_config()
+    models = {
+        "openai": (OpenAIProvider.models, cfg.openai_model),
+        "gemini": (GeminiProvider.models, cfg.gemini_model),
+        "ollama": (OllamaProvider.models, cfg.ollama_model),
+    }
+    providers = []
+    for h in get_health(cfg, refresh=refresh):
+        available_models, default_model = models[h.name]
+        providers.append(
+            {
+                "name": h.name,
+                "models": available_models,
+                "available": h.available,
+                "configured": h.configured,
+                "status": h.status,
+                "latency_ms": h.latency_ms,
+                "error": h.error,
+                "cached": h.cached,
+                "default_model": default_model,
+            }
+        )
     return providers
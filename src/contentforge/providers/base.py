@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
@@ -18,8 +19,28 @@ class GenerationResult:
     finish_reason: str = "stop"
 
 
+@dataclass
+class MultiResult:
+    """Alternative generations for one prompt (``--variants``)."""
+
+    variants: list[GenerationResult]
+    provider: str
+    model: str
+    tokens_used: int = 0  # across all variants
+    requests: int = 1  # round trips it took
+
+    @property
+    def contents(self) -> list[str]:
+        return [v.content for v in self.variants]
+
+
 class BaseProvider(ABC):
-    """Abstract base class for LLM providers."""
+    """Abstract base class for LLM providers.
+
+    Providers are async context managers: ``async with provider:`` releases
+    any pooled connections on exit. Reusing one instance across many requests
+    inside a single event loop keeps those connections alive.
+    """
 
     name: str
     models: list[str]
@@ -45,10 +66,48 @@ class BaseProvider(ABC):
         """Yield content chunks for streaming."""
         yield ""  # pragma: no cover
 
+    async def generate_variants(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        n: int = 2,
+    ) -> MultiResult:
+        """Generate ``n`` alternatives.
+
+        This default sends ``n`` concurrent requests; providers whose API can
+        return several candidates for one prompt override it to make one call.
+        """
+        results = await asyncio.gather(
+            *(self.generate(prompt, system_prompt, temperature, max_tokens) for _ in range(n))
+        )
+        return MultiResult(
+            variants=list(results),
+            provider=results[0].provider,
+            model=results[0].model,
+            tokens_used=sum(r.tokens_used for r in results),
+            requests=n,
+        )
+
     @abstractmethod
     def is_available(self) -> bool:
         """Check if this provider is configured / reachable."""
 
+    async def probe(self, timeout: float = 5.0) -> None:
+        """Make one cheap round trip to the provider, raising on failure."""
+        if not self.is_available():
+            raise RuntimeError(f"{self.name} is not available")
+
+    async def aclose(self) -> None:  # noqa: B027 - optional hook
+        """Release pooled connections. Safe to call more than once."""
+
+    async def __aenter__(self) -> BaseProvider:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
     def info(self) -> dict:
         """Provider metadata."""
         return {
@@ -56,3 +115,73 @@ class BaseProvider(ABC):
             "models": self.models,
             "available": self.is_available(),
         }
+
+
+class ProviderWrapper(BaseProvider):
+    """Base for providers that decorate another provider.
+
+    Everything is delegated to ``inner``; subclasses override what they change.
+    """
+
+    def __init__(self, inner: BaseProvider) -> None:
+        self.inner = inner
+
+    @property
+    def name(self) -> str:  # type: ignore[override]
+        return self.inner.name
+
+    @property
+    def models(self) -> list[str]:  # type: ignore[override]
+        return self.inner.models
+
+    @property
+    def model(self) -> str:
+        return self.inner.model  # type: ignore[attr-defined]
+
+    def __getattr__(self, item: str):
+        if item == "inner":
+            raise AttributeError(item)
+        return getattr(self.inner, item)
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> GenerationResult:
+        return await self.inner.generate(prompt, system_prompt, temperature, max_tokens)
+
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> AsyncIterator[str]:
+        async for chunk in self.inner.stream(prompt, system_prompt, temperature, max_tokens):
+            yield chunk
+
+    async def generate_variants(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        n: int = 2,
+    ) -> MultiResult:
+        return await self.inner.generate_variants(prompt, system_prompt, temperature, max_tokens, n)
+
+    def is_available(self) -> bool:
+        return self.inner.is_available()
+
+    async def probe(self, timeout: float = 5.0) -> None:
+        await self.inner.probe(timeout)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    def unwrap(self) -> BaseProvider:
+        """Return the innermost (real) provider."""
+        inner = self.inner
+        return inner.unwrap() if isinstance(inner, ProviderWrapper) else inner
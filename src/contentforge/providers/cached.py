@@ -0,0 +1,101 @@
+"""Provider wrapper that serves repeated requests from the response cache."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+from contentforge import metrics
+from contentforge.cache import CacheEntry, ResponseCache, request_key
+from contentforge.providers.base import BaseProvider, GenerationResult, ProviderWrapper
+
+
+class CachedProvider(ProviderWrapper):
+    """Wrap a provider so identical requests are answered from disk.
+
+    With ``refresh=True`` lookups are skipped but fresh responses are still
+    stored, replacing whatever was cached before.
+    """
+
+    def __init__(self, inner: BaseProvider, cache: ResponseCache, refresh: bool = False) -> None:
+        super().__init__(inner)
+        self.cache = cache
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> str:
+        return request_key(self.name, self.model, system_prompt, prompt, temperature, max_tokens)
+
+    def _lookup(self, key: str) -> CacheEntry | None:
+        entry = None if self.refresh else self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            metrics.mark_cached()
+        return entry
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> GenerationResult:
+        key = self._key(prompt, system_prompt, temperature, max_tokens)
+        entry = self._lookup(key)
+        if entry is not None:
+            return GenerationResult(
+                content=entry.content,
+                provider=entry.provider,
+                model=entry.model,
+                tokens_used=entry.tokens_used,
+                finish_reason=entry.finish_reason,
+            )
+
+        result = await self.inner.generate(prompt, system_prompt, temperature, max_tokens)
+        self.cache.put(
+            key,
+            CacheEntry(
+                content=result.content,
+                chunks=[result.content],
+                provider=result.provider,
+                model=result.model,
+                tokens_used=result.tokens_used,
+                finish_reason=result.finish_reason,
+            ),
+        )
+        return result
+
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> AsyncIterator[str]:
+        key = self._key(prompt, system_prompt, temperature, max_tokens)
+        entry = self._lookup(key)
+        if entry is not None:
+            for chunk in entry.chunks:
+                yield chunk
+            return
+
+        # Only complete streams are stored; an interrupted one never reaches put().
+        chunks: list[str] = []
+        async for chunk in self.inner.stream(prompt, system_prompt, temperature, max_tokens):
+            chunks.append(chunk)
+            yield chunk
+        self.cache.put(
+            key,
+            CacheEntry(
+                content="".join(chunks),
+                chunks=chunks,
+                provider=self.name,
+                model=self.model,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+        self.cache.close()
@@ -0,0 +1,156 @@
+"""Single-flight coalescing of identical in-flight requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from contentforge import metrics
+from contentforge.cache import request_key
+from contentforge.providers.base import BaseProvider, GenerationResult, ProviderWrapper
+
+
+class ChunkFeed:
+    """Chunks of one in-progress call, replayable to any number of followers.
+
+    Also tracks the task producing them and how many subscribers are attached.
+    """
+
+    def __init__(self) -> None:
+        self.task: asyncio.Task | None = None
+        self.subscribers = 0
+        self.chunks: list[str] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self._changed = asyncio.Event()
+
+    def push(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        self._notify()
+
+    def finish(self, error: BaseException | None = None) -> None:
+        self.done = True
+        self.error = error
+        self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self) -> AsyncIterator[str]:
+        """Yield every chunk from the start, then new ones as they arrive."""
+        sent = 0
+        while True:
+            if sent < len(self.chunks):
+                sent += 1
+                yield self.chunks[sent - 1]
+            elif self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            else:
+                await self._changed.wait()
+
+
+class CoalescingProvider(ProviderWrapper):
+    """Wrap a provider so concurrent identical requests share one upstream call.
+
+    ``requests`` counts calls and ``coalesced`` those that attached to a call
+    already in flight; followers are marked in their generation metrics.
+    """
+
+    def __init__(self, inner: BaseProvider) -> None:
+        super().__init__(inner)
+        self.requests = 0
+        self.coalesced = 0
+        self._calls: dict[str, ChunkFeed] = {}
+        self._streams: dict[str, ChunkFeed] = {}
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Share of requests answered by another request's upstream call."""
+        return self.coalesced / self.requests if self.requests else 0.0
+
+    def _key(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> str:
+        return request_key(self.name, self.model, system_prompt, prompt, temperature, max_tokens)
+
+    def _join(self, table: dict[str, ChunkFeed], key: str) -> ChunkFeed | None:
+        self.requests += 1
+        flight = table.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            metrics.mark_coalesced()
+        return flight
+
+    # The upstream call runs in its own task, so one subscriber going away does not
+    # cut the others off; it is cancelled only when nobody is listening any more.
+    def _leave(self, table: dict[str, ChunkFeed], key: str, flight: ChunkFeed) -> None:
+        flight.subscribers -= 1
+        if flight.subscribers == 0 and flight.task is not None and not flight.task.done():
+            flight.task.cancel()
+            if table.get(key) is flight:
+                del table[key]
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> GenerationResult:
+        key = self._key(prompt, system_prompt, temperature, max_tokens)
+        flight = self._join(self._calls, key)
+        if flight is None:
+            flight = self._calls[key] = ChunkFeed()
+            flight.task = asyncio.ensure_future(
+                self.inner.generate(prompt, system_prompt, temperature, max_tokens)
+            )
+            flight.task.add_done_callback(
+                lambda _: self._calls.pop(key) if self._calls.get(key) is flight else None
+            )
+        flight.subscribers += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            self._leave(self._calls, key, flight)
+
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> AsyncIterator[str]:
+        key = self._key(prompt, system_prompt, temperature, max_tokens)
+        flight = self._join(self._streams, key)
+        if flight is None:
+            flight = self._streams[key] = ChunkFeed()
+            flight.task = asyncio.create_task(
+                self._pump(key, flight, prompt, system_prompt, temperature, max_tokens)
+            )
+        flight.subscribers += 1
+        try:
+            async for chunk in flight.follow():
+                yield chunk
+        finally:
+            self._leave(self._streams, key, flight)
+
+    async def _pump(
+        self,
+        key: str,
+        flight: ChunkFeed,
+        prompt: str,
+        system_prompt: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> None:
+        try:
+            async for chunk in self.inner.stream(prompt, system_prompt, temperature, max_tokens):
+                flight.push(chunk)
+        except Exception as e:
+            flight.finish(e)
+        else:
+            flight.finish()
+        finally:
+            if self._streams.get(key) is flight:
+                del self._streams[key]
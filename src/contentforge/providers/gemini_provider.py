@@ -2,29 +2,91 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
 from collections.abc import AsyncIterator
-from typing import ClassVar
+from typing import Any, ClassVar
 
-from contentforge.providers.base import BaseProvider, GenerationResult
+from contentforge import metrics, structured
+from contentforge.providers.base import BaseProvider, GenerationResult, MultiResult
+
+
+def _record_usage(usage) -> None:
+    metrics.record_usage(
+        getattr(usage, "prompt_token_count", 0),
+        getattr(usage, "candidates_token_count", 0),
+        getattr(usage, "cached_content_token_count", 0),
+    )
+
+
+def _json_mode() -> dict:
+    # Only the JSON response type: Gemini's schema dialect lacks keywords such as
+    # additionalProperties, so the schema itself goes in the system prompt.
+    return {"response_mime_type": "application/json"} if structured.current() is not None else {}
 
 
 class GeminiProvider(BaseProvider):
+    """Gemini through ``google.generativeai`` with per-instance credentials.
+
+    The library's ``genai.configure`` sets a process-wide API key, so instead
+    each provider owns its API clients (created on first use, so the gRPC
+    channel binds to the event loop that uses it) and hands them to the
+    ``GenerativeModel`` handles it builds. Handles are kept per
+    ``(model, system_prompt)`` in an LRU of ``max_models`` entries, so a batch or
+    server reuses one handle per template.
+    """
+
     name = "gemini"
     models: ClassVar[list[str]] = ["gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-pro"]
 
-    def __init__(self, api_key: str, model: str = "gemini-2.0-flash") -> None:
+    def __init__(self, api_key: str, model: str = "gemini-2.0-flash", max_models: int = 32) -> None:
         import google.generativeai as genai
 
-        genai.configure(api_key=api_key)
         self._genai = genai
         self._api_key = api_key
         self.model = model
+        self.max_models = max_models
+        self._handles: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._client: Any = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._model_client: Any = None
+
+    def _async_client(self):
+        # gRPC asyncio channels belong to the loop they were created on.
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            from google.ai import generativelanguage as glm
+
+            self._handles.clear()
+            self._client = glm.GenerativeServiceAsyncClient(
+                client_options={"api_key": self._api_key}
+            )
+            self._client_loop = loop
+        return self._client
 
     def _get_model(self, system_prompt: str = ""):
+        client = self._async_client()
+        key = (self.model, system_prompt)
+        handle = self._handles.get(key)
+        if handle is not None:
+            self._handles.move_to_end(key)
+            return handle
         kwargs = {"model_name": self.model}
         if system_prompt:
             kwargs["system_instruction"] = system_prompt
-        return self._genai.GenerativeModel(**kwargs)
+        handle = self._genai.GenerativeModel(**kwargs)
+        # The handle would otherwise fetch the global client set by genai.configure.
+        handle._async_client = client
+        self._handles[key] = handle
+        if len(self._handles) > self.max_models:
+            self._handles.popitem(last=False)
+        return handle
+
+    async def aclose(self) -> None:
+        self._handles.clear()
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.transport.close()
 
     async def generate(
         self,
@@ -39,11 +101,13 @@ class GeminiProvider(BaseProvider):
             generation_config=self._genai.GenerationConfig(
                 temperature=temperature,
                 max_output_tokens=max_tokens,
+                **_json_mode(),
             ),
         )
         tokens = 0
         if hasattr(response, "usage_metadata") and response.usage_metadata:
             tokens = getattr(response.usage_metadata, "total_token_count", 0)
+            _record_usage(response.usage_metadata)
         return GenerationResult(
             content=response.text,
             provider=self.name,
@@ -51,6 +115,50 @@ class GeminiProvider(BaseProvider):
             tokens_used=tokens,
         )
 
+    async def generate_variants(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        n: int = 2,
+    ) -> MultiResult:
+        from google.api_core import exceptions
+
+        model = self._get_model(system_prompt)
+        try:
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=self._genai.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=max_tokens,
+                    **_json_mode(),
+                    candidate_count=n,
+                ),
+            )
+        except exceptions.InvalidArgument:
+            # Models without multi-candidate support: fall back to n requests.
+            return await super().generate_variants(
+                prompt, system_prompt, temperature, max_tokens, n
+            )
+        tokens = 0
+        if getattr(response, "usage_metadata", None):
+            tokens = getattr(response.usage_metadata, "total_token_count", 0)
+            _record_usage(response.usage_metadata)
+        return MultiResult(
+            variants=[
+                GenerationResult(
+                    content="".join(part.text for part in candidate.content.parts),
+                    provider=self.name,
+                    model=self.model,
+                )
+                for candidate in response.candidates
+            ],
+            provider=self.name,
+            model=self.model,
+            tokens_used=tokens,
+        )
+
     async def stream(
         self,
         prompt: str,
@@ -64,12 +172,31 @@ class GeminiProvider(BaseProvider):
             generation_config=self._genai.GenerationConfig(
                 temperature=temperature,
                 max_output_tokens=max_tokens,
+                **_json_mode(),
             ),
             stream=True,
         )
+        metrics.record_connect()
+        usage = None
         async for chunk in response:
+            # Each chunk reports cumulative usage; the last one has the totals.
+            usage = getattr(chunk, "usage_metadata", None) or usage
             if chunk.text:
                 yield chunk.text
+        if usage is not None:
+            _record_usage(usage)
+
+    async def probe(self, timeout: float = 5.0) -> None:
+        if self._model_client is None:
+            from google.ai import generativelanguage as glm
+
+            self._model_client = glm.ModelServiceClient(client_options={"api_key": self._api_key})
+        await asyncio.to_thread(
+            self._genai.get_model,
+            f"models/{self.model}",
+            client=self._model_client,
+            request_options={"timeout": timeout},
+        )
 
     def is_available(self) -> bool:
         return bool(self._api_key)
@@ -0,0 +1,129 @@
+"""Concurrent provider health checks with latency and a short-lived disk cache."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from contentforge import config
+from contentforge.config import Config
+
+PROVIDER_NAMES = ("openai", "gemini", "ollama")
+
+
+@dataclass
+class ProviderHealth:
+    """Outcome of probing one provider."""
+
+    name: str
+    configured: bool
+    available: bool
+    latency_ms: float | None = None
+    error: str = ""
+    cached: bool = False
+
+    @property
+    def status(self) -> str:
+        if not self.configured:
+            return "not configured"
+        return "available" if self.available else "unreachable"
+
+
+def health_cache_path() -> Path:
+    """Return the path to the health check cache file."""
+    return config.APP_DIR / "health.json"
+
+
+def _is_configured(cfg: Config, name: str) -> bool:
+    if name == "openai":
+        return bool(cfg.openai_api_key)
+    if name == "gemini":
+        return bool(cfg.gemini_api_key)
+    return True
+
+
+def _fingerprint(cfg: Config) -> str:
+    """Hash the settings that affect reachability (keys are never stored in clear)."""
+    parts = [cfg.openai_api_key, cfg.gemini_api_key, cfg.ollama_base_url]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+async def _check_one(cfg: Config, name: str, timeout: float) -> ProviderHealth:
+    from contentforge.providers import _create_provider
+
+    if not _is_configured(cfg, name):
+        return ProviderHealth(name=name, configured=False, available=False)
+
+    try:
+        prov = _create_provider(cfg, name, None)
+    except ValueError as e:
+        return ProviderHealth(name=name, configured=False, available=False, error=str(e))
+
+    async with prov:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(prov.probe(timeout), timeout)
+        except asyncio.TimeoutError:
+            return ProviderHealth(
+                name=name, configured=True, available=False, error=f"timed out after {timeout:g}s"
+            )
+        except Exception as e:
+            return ProviderHealth(
+                name=name, configured=True, available=False, error=str(e) or type(e).__name__
+            )
+        latency = (time.perf_counter() - start) * 1000
+    return ProviderHealth(name=name, configured=True, available=True, latency_ms=latency)
+
+
+async def check_providers(cfg: Config, timeout: float | None = None) -> list[ProviderHealth]:
+    """Probe every provider concurrently, each with its own deadline."""
+    timeout = timeout if timeout is not None else cfg.health_timeout
+    return list(await asyncio.gather(*(_check_one(cfg, n, timeout) for n in PROVIDER_NAMES)))
+
+
+def _read_cache(cfg: Config) -> list[ProviderHealth] | None:
+    try:
+        data = json.loads(health_cache_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("fingerprint") != _fingerprint(cfg):
+        return None
+    if time.time() - data.get("checked_at", 0) > cfg.health_cache_ttl:
+        return None
+    try:
+        return [ProviderHealth(**{**r, "cached": True}) for r in data["results"]]
+    except (KeyError, TypeError):
+        return None
+
+
+def _write_cache(cfg: Config, results: list[ProviderHealth]) -> None:
+    data = {
+        "checked_at": time.time(),
+        "fingerprint": _fingerprint(cfg),
+        "results": [{k: v for k, v in asdict(r).items() if k != "cached"} for r in results],
+    }
+    path = health_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data), encoding="utf-8")
+    except OSError:
+        pass  # caching is best-effort
+
+
+def get_health(
+    cfg: Config | None = None, refresh: bool = False, timeout: float | None = None
+) -> list[ProviderHealth]:
+    """Return provider health, reusing results younger than ``health_cache_ttl``."""
+    cfg = cfg or config.load_config()
+    if not refresh and cfg.health_cache_ttl > 0:
+        cached = _read_cache(cfg)
+        if cached is not None:
+            return cached
+    results = asyncio.run(check_providers(cfg, timeout))
+    if cfg.health_cache_ttl > 0:
+        _write_cache(cfg, results)
+    return results
@@ -0,0 +1,245 @@
+"""Hedged requests: race a backup provider when the primary is slow to start."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from contentforge import config, metrics
+from contentforge.providers.base import BaseProvider, GenerationResult, ProviderWrapper
+
+# Below this many samples the configured threshold is used instead of p95
+MIN_SAMPLES = 20
+
+
+def ttft_path() -> Path:
+    """Return the path to the persisted time-to-first-token samples."""
+    return config.APP_DIR / "ttft.json"
+
+
+class TTFTTracker:
+    """Rolling time-to-first-token samples per ``provider/model``.
+
+    Samples are persisted so short-lived CLI runs still adapt over time.
+    """
+
+    def __init__(self, path: Path | None = None, window: int = 200) -> None:
+        self.path = path
+        self.window = window
+        self.samples: dict[str, deque[float]] = {}
+        if path is not None:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))  # type: ignore[union-attr]
+        except (OSError, ValueError):
+            return
+        for key, values in data.items():
+            self.samples[key] = deque((float(v) for v in values), maxlen=self.window)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            data = {k: list(v) for k, v in self.samples.items()}
+            self.path.write_text(json.dumps(data), encoding="utf-8")
+        except OSError:
+            pass  # best-effort
+
+    def record(self, key: str, ms: float) -> None:
+        self.samples.setdefault(key, deque(maxlen=self.window)).append(ms)
+
+    def percentile(self, key: str, pct: float) -> float | None:
+        values = sorted(self.samples.get(key, ()))
+        if not values:
+            return None
+        index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+        return values[index]
+
+    def threshold(self, key: str, default_ms: float) -> float:
+        """p95 TTFT once enough samples exist, otherwise ``default_ms``."""
+        if len(self.samples.get(key, ())) < MIN_SAMPLES:
+            return default_ms
+        return self.percentile(key, 95) or default_ms
+
+
+def provider_key(prov: BaseProvider, kind: str = "ttft") -> str:
+    """Tracker key: streams record time to first chunk, ``generate`` total latency."""
+    return f"{prov.name}/{getattr(prov, 'model', '')}:{kind}"
+
+
+_DONE = object()
+
+
+class _Racer:
+    """Pump one provider's stream into a queue from its own task.
+
+    Keeping each stream inside a single task means a loser can be cancelled
+    cleanly without closing a generator from a different task.
+    """
+
+    def __init__(self, prov: BaseProvider, args: tuple) -> None:
+        self.prov = prov
+        self.started = time.perf_counter()
+        self.failed = False
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        self.task = asyncio.ensure_future(self._pump(args))
+
+    async def _pump(self, args: tuple) -> None:
+        try:
+            async for chunk in self.prov.stream(*args):
+                await self.queue.put(chunk)
+        except Exception as e:
+            await self.queue.put(e)
+        else:
+            await self.queue.put(_DONE)
+
+    async def cancel(self) -> None:
+        self.task.cancel()
+        with contextlib.suppress(BaseException):
+            await self.task
+
+
+async def _cancel(task: asyncio.Future) -> None:
+    task.cancel()
+    with contextlib.suppress(BaseException):
+        await task
+
+
+class HedgedProvider(ProviderWrapper):
+    """Start ``inner``; if it yields nothing within the threshold, also start ``backup``.
+
+    Whichever produces the first chunk (or result) first wins, and the loser is
+    cancelled. If one side fails, the other is awaited. The threshold adapts to
+    the primary's observed p95 time-to-first-token. Each racer's latency is
+    measured from its own launch; a cancelled loser records the time it had
+    been running, a lower bound that keeps a slow primary's p95 from drifting
+    down. Whether a call hedged and who answered is reported to the current
+    metrics (``metrics.record_hedge``), not kept on the shared provider.
+    """
+
+    def __init__(
+        self,
+        inner: BaseProvider,
+        backup: BaseProvider,
+        hedge_after_ms: float = 2000.0,
+        tracker: TTFTTracker | None = None,
+    ) -> None:
+        super().__init__(inner)
+        self.backup = backup
+        self.hedge_after_ms = hedge_after_ms
+        self.tracker = tracker or TTFTTracker()
+
+    def threshold_ms(self, kind: str = "ttft") -> float:
+        return self.tracker.threshold(provider_key(self.inner, kind), self.hedge_after_ms)
+
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> AsyncIterator[str]:
+        args = (prompt, system_prompt, temperature, max_tokens)
+        racers: list[_Racer] = []
+        pending: dict[asyncio.Future, _Racer] = {}
+
+        def _launch(prov: BaseProvider) -> None:
+            racer = _Racer(prov, args)
+            racers.append(racer)
+            pending[asyncio.ensure_future(racer.queue.get())] = racer
+
+        _launch(self.inner)
+        done, _ = await asyncio.wait(set(pending), timeout=self.threshold_ms() / 1000)
+        if not done:
+            _launch(self.backup)
+
+        winner: _Racer | None = None
+        first: object = None
+        error: Exception | None = None
+        try:
+            while pending and winner is None:
+                done, _ = await asyncio.wait(set(pending), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    racer = pending.pop(task)
+                    item = task.result()
+                    if isinstance(item, Exception):
+                        error, racer.failed = item, True
+                        if len(racers) == 1:
+                            # Primary failed before the threshold: hedge immediately.
+                            _launch(self.backup)
+                        continue
+                    winner, first = racer, item
+                    now = time.perf_counter()
+                    for other in racers:
+                        if other is winner or not other.failed:
+                            elapsed = (now - other.started) * 1000
+                            self.tracker.record(provider_key(other.prov), elapsed)
+                    break
+        finally:
+            for task in pending:
+                await _cancel(task)
+            for racer in racers:
+                if racer is not winner:
+                    await racer.cancel()
+
+        if winner is None:
+            raise error or RuntimeError("no provider produced a response")
+
+        metrics.record_hedge(len(racers) > 1, winner.prov.name, winner.prov.model)
+        try:
+            item = first
+            while item is not _DONE:
+                if isinstance(item, Exception):
+                    raise item
+                yield item  # type: ignore[misc]
+                item = await winner.queue.get()
+        finally:
+            await winner.cancel()
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> GenerationResult:
+        args = (prompt, system_prompt, temperature, max_tokens)
+        primary = asyncio.ensure_future(self.inner.generate(*args))
+        racers = {primary: (self.inner, time.perf_counter())}
+        done, _ = await asyncio.wait({primary}, timeout=self.threshold_ms("total") / 1000)
+        hedged = not done or primary.exception() is not None
+        if hedged:
+            backup = asyncio.ensure_future(self.backup.generate(*args))
+            racers[backup] = (self.backup, time.perf_counter())
+
+        error: BaseException | None = None
+        try:
+            while racers:
+                done, _ = await asyncio.wait(set(racers), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    prov, started = racers.pop(task)
+                    if task.exception() is None:
+                        now = time.perf_counter()
+                        # Losers still running get their time so far as a (censored) sample.
+                        for racer, racer_started in [(prov, started), *racers.values()]:
+                            elapsed = (now - racer_started) * 1000
+                            self.tracker.record(provider_key(racer, "total"), elapsed)
+                        metrics.record_hedge(hedged, prov.name, prov.model)
+                        return task.result()
+                    error = task.exception()
+        finally:
+            for task in racers:
+                await _cancel(task)
+        raise error or RuntimeError("no provider produced a response")
+
+    async def aclose(self) -> None:
+        self.tracker.save()
+        await asyncio.gather(self.inner.aclose(), self.backup.aclose())
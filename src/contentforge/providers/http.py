@@ -0,0 +1,60 @@
+"""Shared keep-alive HTTP transport settings for providers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import httpx
+
+from contentforge.config import Config
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool limits for a provider's HTTP client."""
+
+    max_connections: int = 100
+    max_keepalive: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> PoolSettings:
+        return cls(
+            max_connections=cfg.http_max_connections,
+            max_keepalive=cfg.http_max_keepalive,
+            keepalive_expiry=cfg.http_keepalive_expiry,
+            http2=cfg.http2,
+        )
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+def http2_supported() -> bool:
+    """Return True if the optional ``h2`` package is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def make_async_client(
+    pool: PoolSettings, timeout: float = 120.0, **kwargs: object
+) -> httpx.AsyncClient:
+    """Build a pooled ``httpx.AsyncClient``.
+
+    HTTP/2 is only enabled when requested and ``h2`` is available
+    (``pip install contentforge[http2]``); otherwise HTTP/1.1 keep-alive is used.
+    """
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=pool.limits(),
+        http2=pool.http2 and http2_supported(),
+        **kwargs,  # type: ignore[arg-type]
+    )
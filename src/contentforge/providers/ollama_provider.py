@@ -2,13 +2,64 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
+import threading
 from collections.abc import AsyncIterator
 from typing import ClassVar
 
 import httpx
 
+from contentforge import metrics, structured
 from contentforge.providers.base import BaseProvider, GenerationResult
+from contentforge.providers.http import PoolSettings, make_async_client
+from contentforge.providers.prefix import ollama_cached_tokens
+
+
+def _record_final(data: dict) -> int:
+    """Report usage, prefix-cache reuse and timings from the final response object.
+
+    Returns the total tokens used. ``prompt_eval_count`` excludes prompt tokens
+    served from the KV cache, so those are added back for the input count.
+    """
+    evaluated = data.get("prompt_eval_count", 0)
+    cached = ollama_cached_tokens(data)
+    metrics.record_usage(evaluated + cached, data.get("eval_count", 0), cached)
+    if data.get("load_duration"):
+        metrics.record_phase("model_load", data["load_duration"] / 1e6)
+    if cached and evaluated and data.get("prompt_eval_duration"):
+        # Estimate: cached tokens would have cost the measured per-token prompt time.
+        metrics.record_prefix_savings(cached * data["prompt_eval_duration"] / evaluated / 1e6)
+    return evaluated + cached + data.get("eval_count", 0)
+
+
+def keep_alive_for(model: str, default: str, per_model: str = "") -> str:
+    """The keep_alive for ``model`` from ``per_model`` (``"llama3.2=1h,mistral=-1"``).
+
+    An entry without a tag matches every tag of that model; an exact
+    ``name:tag`` entry wins over it. Unlisted models get ``default``.
+    """
+    base = model.partition(":")[0]
+    found = default
+    for item in per_model.split(","):
+        name, sep, value = item.partition("=")
+        name = name.strip()
+        if not sep:
+            continue
+        if name == model:
+            return value.strip()
+        if name == base:
+            found = value.strip()
+    return found
+
+
+def _keep_alive_json(value: str) -> str | float:
+    # Ollama reads a number as seconds (negative keeps the model loaded
+    # indefinitely) but requires a unit in strings, so "-1" is sent as -1.
+    try:
+        return float(value)
+    except ValueError:
+        return value
 
 
 class OllamaProvider(BaseProvider):
@@ -19,9 +70,73 @@ class OllamaProvider(BaseProvider):
         self,
         base_url: str = "http://localhost:11434",
         model: str = "llama3.2",
+        pool: PoolSettings | None = None,
+        keep_alive: str = "",
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.model = model
+        self.keep_alive = keep_alive
+        self.pool = pool or PoolSettings()
+        self._client: httpx.AsyncClient | None = None
+
+    def _http(self) -> httpx.AsyncClient:
+        # Created lazily so the pool binds to the event loop that first uses it.
+        if self._client is None or self._client.is_closed:
+            self._client = make_async_client(self.pool, timeout=120.0)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _prepare(self, payload: dict, system_prompt: str) -> None:
+        # The system prompt is sent separately so Ollama templates it ahead of the
+        # per-row prompt; that shared prefix stays in the model's KV cache as long
+        # as keep_alive holds the model loaded.
+        if system_prompt:
+            payload["system"] = system_prompt
+        if self.keep_alive:
+            payload["keep_alive"] = _keep_alive_json(self.keep_alive)
+        if (schema := structured.current()) is not None:
+            payload["format"] = schema or "json"
+
+    def _load_payload(self) -> dict:
+        # A generate request without a prompt only loads the model.
+        payload: dict = {"model": self.model}
+        self._prepare(payload, "")
+        return payload
+
+    async def preload(self) -> float:
+        """Load the model without generating anything.
+
+        Returns Ollama's load time in seconds (0.0 if it was already loaded).
+        """
+        resp = await self._http().post(f"{self.base_url}/api/generate", json=self._load_payload())
+        resp.raise_for_status()
+        return resp.json().get("load_duration", 0) / 1e9
+
+    def warm_up(self) -> threading.Thread:
+        """Start loading the model in a background thread.
+
+        Failures are ignored; the real request reports them. Ollama queues
+        requests for a model that is still loading, so this never loads twice.
+        """
+        url, payload = f"{self.base_url}/api/generate", self._load_payload()
+
+        def _load() -> None:
+            with contextlib.suppress(httpx.HTTPError):
+                httpx.post(url, json=payload, timeout=120.0)
+
+        thread = threading.Thread(target=_load, name="ollama-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    async def loaded_models(self) -> list[dict]:
+        """Models Ollama currently holds in memory (``/api/ps``)."""
+        resp = await self._http().get(f"{self.base_url}/api/ps")
+        resp.raise_for_status()
+        return resp.json().get("models", [])
 
     async def generate(
         self,
@@ -36,15 +151,13 @@ class OllamaProvider(BaseProvider):
             "stream": False,
             "options": {"temperature": temperature, "num_predict": max_tokens},
         }
-        if system_prompt:
-            payload["system"] = system_prompt
+        self._prepare(payload, system_prompt)
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            resp = await client.post(f"{self.base_url}/api/generate", json=payload)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await self._http().post(f"{self.base_url}/api/generate", json=payload)
+        resp.raise_for_status()
+        data = resp.json()
 
-        tokens = data.get("eval_count", 0) + data.get("prompt_eval_count", 0)
+        tokens = _record_final(data)
         return GenerationResult(
             content=data.get("response", ""),
             provider=self.name,
@@ -65,23 +178,29 @@ class OllamaProvider(BaseProvider):
             "stream": True,
             "options": {"temperature": temperature, "num_predict": max_tokens},
         }
-        if system_prompt:
-            payload["system"] = system_prompt
+        self._prepare(payload, system_prompt)
 
-        async with httpx.AsyncClient(timeout=120.0) as client, client.stream(
+        async with self._http().stream(
             "POST", f"{self.base_url}/api/generate", json=payload
         ) as resp:
             resp.raise_for_status()
+            metrics.record_connect()
             async for line in resp.aiter_lines():
                 if not line:
                     continue
                 data = json.loads(line)
                 if data.get("done"):
+                    # The final line carries the token counts, context and timings.
+                    _record_final(data)
                     break
                 chunk = data.get("response", "")
                 if chunk:
                     yield chunk
 
+    async def probe(self, timeout: float = 5.0) -> None:
+        resp = await self._http().get(f"{self.base_url}/api/tags", timeout=timeout)
+        resp.raise_for_status()
+
     def is_available(self) -> bool:
         try:
             resp = httpx.get(f"{self.base_url}/api/tags", timeout=2.0)
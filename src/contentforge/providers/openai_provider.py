@@ -5,19 +5,72 @@ from __future__ import annotations
 from collections.abc import AsyncIterator
 from typing import ClassVar
 
-from contentforge.providers.base import BaseProvider, GenerationResult
+from contentforge import metrics, structured
+from contentforge.providers.base import BaseProvider, GenerationResult, MultiResult
+from contentforge.providers.http import PoolSettings, make_async_client
+from contentforge.providers.prefix import chat_messages, prefix_key
+
+
+def _record_usage(usage) -> None:
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", 0) or 0
+    metrics.record_usage(usage.prompt_tokens, usage.completion_tokens, cached)
+
+
+# Structured Outputs (a strict json_schema) needs gpt-4o-2024-08-06 or later; older
+# chat models have JSON mode at most, and gpt-4 itself has no response_format. The
+# schema is in the system prompt either way (structured.system_prompt).
+_JSON_SCHEMA_MODELS = ("gpt-4o", "chatgpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4")
+_JSON_OBJECT_MODELS = ("gpt-4-turbo", "gpt-4-1106", "gpt-4-0125", "gpt-3.5-turbo")
+
+
+def _response_format(model: str) -> dict:
+    schema = structured.current()
+    if schema is None:
+        return {}
+    if schema and model.startswith(_JSON_SCHEMA_MODELS) and model != "gpt-4o-2024-05-13":
+        return {
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"name": "reply", "schema": schema, "strict": True},
+            }
+        }
+    if model.startswith(_JSON_SCHEMA_MODELS + _JSON_OBJECT_MODELS):
+        return {"response_format": {"type": "json_object"}}
+    return {}
 
 
 class OpenAIProvider(BaseProvider):
     name = "openai"
     models: ClassVar[list[str]] = ["gpt-4o", "gpt-4o-mini", "gpt-4-turbo", "gpt-4", "gpt-3.5-turbo"]
 
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        pool: PoolSettings | None = None,
+        max_retries: int = 2,
+    ) -> None:
         from openai import AsyncOpenAI
 
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.pool = pool or PoolSettings()
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=max_retries,
+            http_client=make_async_client(self.pool, timeout=600.0, follow_redirects=True),
+        )
         self.model = model
 
+    async def aclose(self) -> None:
+        await self.client.close()
+
+    def _cache_hint(self, system_prompt: str) -> dict:
+        # Requests sharing a system prompt are routed to the same prefix cache. Sent as
+        # extra_body: older 1.x SDKs have no prompt_cache_key parameter.
+        if not system_prompt:
+            return {}
+        return {"extra_body": {"prompt_cache_key": prefix_key(self.model, system_prompt)}}
+
     async def generate(
         self,
         prompt: str,
@@ -25,19 +78,21 @@ class OpenAIProvider(BaseProvider):
         temperature: float = 0.7,
         max_tokens: int = 2000,
     ) -> GenerationResult:
-        messages: list[dict[str, str]] = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        messages = chat_messages(system_prompt, prompt)
 
         response = await self.client.chat.completions.create(
             model=self.model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
+            **self._cache_hint(system_prompt),
+            **_response_format(self.model),
         )
         choice = response.choices[0]
-        tokens = response.usage.total_tokens if response.usage else 0
+        tokens = 0
+        if response.usage:
+            tokens = response.usage.total_tokens
+            _record_usage(response.usage)
         return GenerationResult(
             content=choice.message.content or "",
             provider=self.name,
@@ -46,6 +101,43 @@ class OpenAIProvider(BaseProvider):
             finish_reason=choice.finish_reason or "stop",
         )
 
+    async def generate_variants(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        n: int = 2,
+    ) -> MultiResult:
+        # One request with n choices: the prompt is sent and billed once.
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=chat_messages(system_prompt, prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            n=n,
+            **self._cache_hint(system_prompt),
+            **_response_format(self.model),
+        )
+        tokens = 0
+        if response.usage:
+            tokens = response.usage.total_tokens
+            _record_usage(response.usage)
+        return MultiResult(
+            variants=[
+                GenerationResult(
+                    content=choice.message.content or "",
+                    provider=self.name,
+                    model=self.model,
+                    finish_reason=choice.finish_reason or "stop",
+                )
+                for choice in sorted(response.choices, key=lambda c: c.index)
+            ],
+            provider=self.name,
+            model=self.model,
+            tokens_used=tokens,
+        )
+
     async def stream(
         self,
         prompt: str,
@@ -53,10 +145,7 @@ class OpenAIProvider(BaseProvider):
         temperature: float = 0.7,
         max_tokens: int = 2000,
     ) -> AsyncIterator[str]:
-        messages: list[dict[str, str]] = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        messages = chat_messages(system_prompt, prompt)
 
         response = await self.client.chat.completions.create(
             model=self.model,
@@ -64,11 +153,23 @@ class OpenAIProvider(BaseProvider):
             temperature=temperature,
             max_tokens=max_tokens,
             stream=True,
+            stream_options={"include_usage": True},
+            **self._cache_hint(system_prompt),
+            **_response_format(self.model),
         )
+        metrics.record_connect()
         async for chunk in response:
+            # With include_usage the final chunk carries usage and no choices.
+            if chunk.usage:
+                _record_usage(chunk.usage)
+            if not chunk.choices:
+                continue
             delta = chunk.choices[0].delta
             if delta.content:
                 yield delta.content
 
+    async def probe(self, timeout: float = 5.0) -> None:
+        await self.client.models.list(timeout=timeout)
+
     def is_available(self) -> bool:
         return bool(self.client.api_key)
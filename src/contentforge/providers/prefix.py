@@ -0,0 +1,36 @@
+"""Prefix-cache-aware request building."""
+
+from __future__ import annotations
+
+import hashlib
+
+
+def prefix_key(model: str, system_prompt: str) -> str:
+    """A short stable id for the cacheable prefix of a request."""
+    return hashlib.sha256(f"{model}\0{system_prompt}".encode()).hexdigest()[:32]
+
+
+# Provider prompt caches (OpenAI prefix caching, Gemini implicit caching, Ollama's
+# KV cache) only reuse a byte-identical leading prefix, so the shared system prompt
+# goes first and nothing request-specific is ever placed ahead of it.
+def chat_messages(system_prompt: str, prompt: str) -> list[dict[str, str]]:
+    """Chat messages with the shared system prompt ahead of the per-row prompt."""
+    messages: list[dict[str, str]] = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def ollama_cached_tokens(data: dict) -> int:
+    """Prompt tokens Ollama served from its KV cache, from a final response object.
+
+    ``context`` holds the tokens of the whole exchange (prompt then response)
+    while ``prompt_eval_count`` only counts prompt tokens that were evaluated,
+    so the difference is the prefix that was reused.
+    """
+    context = data.get("context")
+    if not context:
+        return 0
+    prompt_tokens = len(context) - data.get("eval_count", 0)
+    return max(0, prompt_tokens - data.get("prompt_eval_count", 0))
@@ -0,0 +1,234 @@
+"""Per-provider RPM/TPM token buckets with retry on 429/5xx."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from email.utils import parsedate_to_datetime
+from typing import TypeVar
+
+from contentforge import metrics
+from contentforge.providers.base import (
+    BaseProvider,
+    GenerationResult,
+    MultiResult,
+    ProviderWrapper,
+)
+
+_R = TypeVar("_R", GenerationResult, MultiResult)
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``per_minute / 60`` per second.
+
+    ``acquire`` takes the requested amount immediately and, if that leaves the
+    bucket in debt, sleeps until the debt is repaid. Callers are served in
+    FIFO order, so sustained throughput equals the rate and never exceeds it
+    by more than ``burst``.
+    """
+
+    def __init__(self, per_minute: float, burst: float | None = None) -> None:
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, self.rate)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        async with self._lock:
+            self._refill()
+            self.level -= amount
+            if self.level < 0:
+                await asyncio.sleep(-self.level / self.rate)
+                self._refill()
+
+    def refund(self, amount: float) -> None:
+        """Return unused budget (e.g. reserved output tokens that weren't generated)."""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out budget for ``seconds`` (used when the server says 429)."""
+        self._refill()
+        self.level = min(self.level, -seconds * self.rate)
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Read a ``Retry-After`` header (seconds or HTTP date) from an SDK/httpx error."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def status_code(exc: BaseException) -> int | None:
+    """Best-effort HTTP status of an httpx, OpenAI or Google API error."""
+    for candidate in (
+        getattr(exc, "status_code", None),
+        getattr(getattr(exc, "response", None), "status_code", None),
+        getattr(exc, "code", None),
+    ):
+        if candidate is None:
+            continue
+        try:
+            return int(candidate)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    if type(exc).__name__ in {
+        "ConnectError",
+        "ReadTimeout",
+        "APIConnectionError",
+        "APITimeoutError",
+    }:
+        return True
+    return status_code(exc) in RETRYABLE_STATUS
+
+
+def estimate_tokens(prompt: str, system_prompt: str, max_tokens: int) -> int:
+    """Rough request cost for TPM budgeting: ~4 chars per prompt token plus the output cap."""
+    return (len(prompt) + len(system_prompt)) // 4 + max_tokens
+
+
+class RateLimitedProvider(ProviderWrapper):
+    """Wrap a provider with RPM/TPM budgets and retries with exponential backoff.
+
+    Retries use full jitter (``uniform(0, base * 2**attempt)``) capped at
+    ``max_backoff`` unless the server sent ``Retry-After``, which is honoured
+    and also pauses the shared buckets so concurrent callers back off too.
+    Streams are only retried if they fail before the first chunk.
+    """
+
+    def __init__(
+        self,
+        inner: BaseProvider,
+        rpm: float = 0,
+        tpm: float = 0,
+        max_retries: int = 4,
+        base_backoff: float = 0.5,
+        max_backoff: float = 60.0,
+    ) -> None:
+        super().__init__(inner)
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm, burst=tpm / 6) if tpm > 0 else None
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.retries = 0
+
+    async def _acquire(self, cost: int) -> None:
+        if self.requests is None and self.tokens is None:
+            return
+        start = time.perf_counter()
+        if self.requests is not None:
+            await self.requests.acquire()
+        if self.tokens is not None:
+            await self.tokens.acquire(cost)
+        metrics.record_phase("rate_limit_wait", (time.perf_counter() - start) * 1000)
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        retry_after = retry_after_seconds(exc)
+        if retry_after is not None:
+            for bucket in (self.requests, self.tokens):
+                if bucket is not None:
+                    bucket.pause(retry_after)
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2**attempt))
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> GenerationResult:
+        cost = estimate_tokens(prompt, system_prompt, max_tokens)
+        return await self._retrying(
+            lambda: self.inner.generate(prompt, system_prompt, temperature, max_tokens), cost
+        )
+
+    async def generate_variants(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        n: int = 2,
+    ) -> MultiResult:
+        # One request that is charged the prompt once and the output cap n times.
+        cost = estimate_tokens(prompt, system_prompt, max_tokens * n)
+        return await self._retrying(
+            lambda: self.inner.generate_variants(prompt, system_prompt, temperature, max_tokens, n),
+            cost,
+        )
+
+    async def _retrying(self, call: Callable[[], Awaitable[_R]], cost: int) -> _R:
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(cost)
+            try:
+                result = await call()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                self.retries += 1
+                delay = self._backoff(attempt, e)
+                metrics.record_phase("retry_backoff", delay * 1000)
+                await asyncio.sleep(delay)
+                continue
+            if self.tokens is not None and 0 < result.tokens_used < cost:
+                self.tokens.refund(cost - result.tokens_used)
+            return result
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> AsyncIterator[str]:
+        cost = estimate_tokens(prompt, system_prompt, max_tokens)
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(cost)
+            started = False
+            try:
+                async for chunk in self.inner.stream(
+                    prompt, system_prompt, temperature, max_tokens
+                ):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or attempt == self.max_retries or not is_retryable(e):
+                    raise
+                self.retries += 1
+                delay = self._backoff(attempt, e)
+                metrics.record_phase("retry_backoff", delay * 1000)
+                await asyncio.sleep(delay)
@@ -0,0 +1,415 @@
+"""Local HTTP API over the templates and warm providers (``contentforge serve``)."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from urllib.parse import parse_qsl
+
+from contentforge import history, metrics
+from contentforge.config import Config, load_config
+from contentforge.providers import BaseProvider, GenerationResult, get_provider
+from contentforge.templates import (
+    ContentTemplate,
+    TemplateError,
+    get_template,
+    list_templates,
+    render_prompt,
+)
+
+MAX_BODY = 1024 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+}
+
+
+class HTTPError(Exception):
+    """An error answered to the client as ``{"error": message}``."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Request:
+    """A parsed HTTP request."""
+
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+    def json(self) -> dict:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON body: {e}") from None
+        if not isinstance(data, dict):
+            raise HTTPError(400, "JSON body must be an object")
+        return data
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request | None:
+    """Read one request, or return None when the client closed the connection."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise HTTPError(400, "Incomplete request") from None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(400, "Request headers too large") from None
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "Malformed request line") from None
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HTTPError(400, "Chunked request bodies are not supported")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length") from None
+    if length > MAX_BODY:
+        raise HTTPError(413, f"Request body exceeds {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+    path, _, qs = target.partition("?")
+    return Request(method.upper(), path, dict(parse_qsl(qs)), headers, body, keep_alive)
+
+
+def _head(status: int, content_type: str, keep_alive: bool, extra: str = "") -> bytes:
+    return (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"{extra}\r\n"
+    ).encode()
+
+
+async def send_json(
+    writer: asyncio.StreamWriter, status: int, data: object, keep_alive: bool
+) -> None:
+    body = json.dumps(data, ensure_ascii=False).encode()
+    writer.write(
+        _head(status, "application/json", keep_alive, f"Content-Length: {len(body)}\r\n") + body
+    )
+    await writer.drain()
+
+
+class _EventStream:
+    """Server-sent events over chunked transfer encoding."""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+
+    async def open(self, keep_alive: bool) -> None:
+        self.writer.write(
+            _head(
+                200,
+                "text/event-stream",
+                keep_alive,
+                "Cache-Control: no-cache\r\nTransfer-Encoding: chunked\r\n",
+            )
+        )
+        await self.writer.drain()
+
+    async def send(self, data: object, event: str = "") -> None:
+        payload = (f"event: {event}\n" if event else "") + f"data: {json.dumps(data)}\n\n"
+        raw = payload.encode()
+        self.writer.write(f"{len(raw):x}\r\n".encode() + raw + b"\r\n")
+        await self.writer.drain()
+
+    async def close(self) -> None:
+        self.writer.write(b"0\r\n\r\n")
+        await self.writer.drain()
+
+
+def _template_summary(tpl: ContentTemplate) -> dict:
+    return {
+        "id": tpl.id,
+        "name": tpl.name,
+        "description": tpl.description,
+        "category": tpl.category,
+    }
+
+
+class ContentServer:
+    """Serve templates and generation over HTTP with warm, shared providers."""
+
+    # A small HTTP/1.1 server on asyncio streams, so serving needs no extra
+    # dependencies. Connections are kept alive and the config is read once.
+
+    def __init__(
+        self,
+        cfg: Config | None = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        max_providers: int = 16,
+    ) -> None:
+        self.cfg = cfg or load_config()
+        self.host = host
+        self.port = port
+        self.max_providers = max_providers
+        self.requests = 0
+        self.generations = 0
+        self.coalesced = 0  # generations answered by an identical request in flight
+        self._providers: OrderedDict[tuple[str, str | None], BaseProvider] = OrderedDict()
+        self._in_use: dict[BaseProvider, int] = {}  # requests running on each provider
+        self._evicted: list[BaseProvider] = []  # closed once no request uses them
+        self._server: asyncio.base_events.Server | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def provider(self, name: str | None = None, model: str | None = None) -> BaseProvider:
+        """Return the warm provider for ``(name, model)``, creating it on first use.
+
+        Clients choose the pair, so only ``max_providers`` are kept; the least
+        recently used is evicted and closed when no request is using it.
+        """
+        key = (name or self.cfg.default_provider, model)
+        prov = self._providers.get(key)
+        if prov is not None:
+            self._providers.move_to_end(key)
+            return prov
+        prov = get_provider(key[0], model, cfg=self.cfg, coalesce=self.cfg.coalesce_requests)
+        self._providers[key] = prov
+        if len(self._providers) > self.max_providers:
+            self._evicted.append(self._providers.popitem(last=False)[1])
+        return prov
+
+    async def _release(self, prov: BaseProvider) -> None:
+        """A request is done with ``prov``; close evicted providers nobody uses."""
+        self._in_use[prov] -= 1
+        if not self._in_use[prov]:
+            del self._in_use[prov]
+        idle = [p for p in self._evicted if p not in self._in_use]
+        self._evicted = [p for p in self._evicted if p in self._in_use]
+        await asyncio.gather(*(p.aclose() for p in idle), return_exceptions=True)
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        # Warm the default provider; if it isn't configured, requests naming
+        # another provider still work.
+        with contextlib.suppress(ValueError):
+            self.provider()
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()  # idle keep-alive connections would block wait_closed
+            await self._server.wait_closed()
+            self._server = None
+        providers = [*self._providers.values(), *self._evicted]
+        self._providers, self._evicted = OrderedDict(), []
+        await asyncio.gather(*(p.aclose() for p in providers), return_exceptions=True)
+
+    async def __aenter__(self) -> ContentServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    req = await read_request(reader)
+                except HTTPError as e:
+                    await send_json(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+                if req is None:
+                    break
+                self.requests += 1
+                try:
+                    await self._dispatch(req, writer)
+                except HTTPError as e:
+                    await send_json(writer, e.status, {"error": e.message}, req.keep_alive)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e:
+                    await send_json(writer, 500, {"error": str(e)}, req.keep_alive)
+                if not req.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    # GET  /health             liveness
+    # GET  /v1/templates        template summaries
+    # GET  /v1/templates/{id}   one template with its fields
+    # POST /v1/generate/{id}    {"variables", "provider", "model", "temperature",
+    #                           "max_tokens", "stream"}: JSON, or an event stream when
+    #                           "stream" is true or the client accepts text/event-stream
+    async def _dispatch(self, req: Request, writer: asyncio.StreamWriter) -> None:
+        parts = [p for p in req.path.split("/") if p]
+
+        if parts == ["health"]:
+            _require(req, "GET")
+            await send_json(writer, 200, {"status": "ok"}, req.keep_alive)
+        elif parts == ["v1", "templates"]:
+            _require(req, "GET")
+            data = [_template_summary(t) for t in list_templates()]
+            await send_json(writer, 200, data, req.keep_alive)
+        elif len(parts) == 3 and parts[:2] == ["v1", "templates"]:
+            _require(req, "GET")
+            tpl = _lookup_template(parts[2])
+            data = {**_template_summary(tpl), "fields": [asdict(f) for f in tpl.fields]}
+            await send_json(writer, 200, data, req.keep_alive)
+        elif len(parts) == 3 and parts[:2] == ["v1", "generate"]:
+            _require(req, "POST")
+            await self._generate(req, writer, parts[2])
+        else:
+            raise HTTPError(404, f"No route for {req.path}")
+
+    async def _generate(self, req: Request, writer: asyncio.StreamWriter, template_id: str) -> None:
+        tpl = _lookup_template(template_id)
+        body = req.json()
+        variables = body.get("variables", {})
+        if not isinstance(variables, dict):
+            raise HTTPError(400, "'variables' must be an object")
+        variables = {k: str(v) for k, v in variables.items()}
+        try:
+            prompt = render_prompt(tpl, variables)
+        except TemplateError as e:
+            raise HTTPError(400, str(e)) from None
+
+        try:
+            temperature = float(body.get("temperature", self.cfg.default_temperature))
+            max_tokens = int(body.get("max_tokens", self.cfg.default_max_tokens))
+        except (TypeError, ValueError):
+            raise HTTPError(400, "'temperature' and 'max_tokens' must be numbers") from None
+        args = (prompt, tpl.system_prompt, temperature, max_tokens)
+
+        stream = body.get("stream")
+        if stream is None:
+            stream = "text/event-stream" in req.headers.get("accept", "")
+        elif not isinstance(stream, bool):
+            raise HTTPError(400, "'stream' must be true or false")
+
+        try:
+            prov = self.provider(body.get("provider"), body.get("model"))
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+        self._in_use[prov] = self._in_use.get(prov, 0) + 1
+        try:
+            await self._respond(req, writer, tpl, prov, variables, args, stream)
+        finally:
+            await self._release(prov)
+
+    async def _respond(
+        self,
+        req: Request,
+        writer: asyncio.StreamWriter,
+        tpl: ContentTemplate,
+        prov: BaseProvider,
+        variables: dict[str, str],
+        args: tuple,
+        stream: bool,
+    ) -> None:
+        m = metrics.GenerationMetrics(template=tpl.id)
+        if not stream:
+            try:
+                with metrics.collecting(m):
+                    result = await prov.generate(*args)
+            except Exception as e:
+                raise HTTPError(502, f"{prov.name}: {e}") from None
+            self._generated(result, variables, m)
+            await send_json(
+                writer,
+                200,
+                {
+                    "template": tpl.id,
+                    "content": result.content,
+                    "provider": result.provider,
+                    "model": result.model,
+                    "tokens_used": result.tokens_used,
+                    "finish_reason": result.finish_reason,
+                },
+                req.keep_alive,
+            )
+            return
+
+        events = _EventStream(writer)
+        await events.open(req.keep_alive)
+        parts: list[str] = []
+        try:
+            with metrics.collecting(m):
+                async for chunk in prov.stream(*args):
+                    parts.append(chunk)
+                    await events.send({"text": chunk})
+        except (ConnectionError, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            await events.send({"error": f"{prov.name}: {e}"}, event="error")
+        else:
+            await events.send(
+                {"template": tpl.id, "provider": prov.name, "model": prov.model}, "done"
+            )
+            tokens = m.tokens_in + m.tokens_out
+            result = GenerationResult("".join(parts), prov.name, prov.model, tokens)
+            self._generated(result, variables, m)
+        await events.close()
+
+    def _generated(
+        self, result: GenerationResult, variables: dict[str, str], m: metrics.GenerationMetrics
+    ) -> None:
+        self.generations += 1
+        self.coalesced += m.coalesced
+        if self.cfg.history_enabled:
+            history.record_result(result, variables, m)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Share of generations that shared an identical request's upstream call."""
+        return self.coalesced / self.generations if self.generations else 0.0
+
+
+def _require(req: Request, method: str) -> None:
+    if req.method != method:
+        raise HTTPError(405, f"{req.path} only accepts {method}")
+
+
+def _lookup_template(template_id: str) -> ContentTemplate:
+    try:
+        return get_template(template_id)
+    except KeyError as e:
+        raise HTTPError(404, str(e.args[0])) from None
@@ -0,0 +1,310 @@
+"""Structured output: JSON replies that are parsed field by field as they stream."""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from contentforge.templates.models import ContentTemplate
+
+Path = tuple[str | int, ...]
+
+# While a schema is current, providers ask for JSON their own way: OpenAI
+# ``response_format`` (strict where the model allows it), Ollama ``format`` and
+# Gemini's JSON response type. system_prompt() spells the schema out as well, for
+# models that only follow instructions.
+_schema: ContextVar[dict | None] = ContextVar("contentforge_structured", default=None)
+
+
+@contextmanager
+def requesting(schema: dict) -> Iterator[dict]:
+    """Ask providers for JSON matching ``schema`` (``{}``: any JSON object) in this context."""
+    token = _schema.set(schema)
+    try:
+        yield schema
+    finally:
+        _schema.reset(token)
+
+
+def current() -> dict | None:
+    """The schema of the structured request in progress, or None for free text."""
+    return _schema.get()
+
+
+def system_prompt(tpl: ContentTemplate) -> str:
+    """The template's system prompt plus the instruction to reply in JSON."""
+    instruction = "Reply with a single JSON object and nothing else."
+    if tpl.output_schema:
+        instruction += " It must match this JSON schema:\n" + json.dumps(
+            tpl.output_schema, separators=(",", ":")
+        )
+    return f"{tpl.system_prompt}\n\n{instruction}" if tpl.system_prompt else instruction
+
+
+# ── Incremental parsing ─────────────────────────────────────────
+
+_WHITESPACE = frozenset(" \t\r\n")
+_STRING_RUN = re.compile(r'[^"\\]+')
+_SCALAR_RUN = re.compile(r"[\w.+-]+")
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+class JsonStreamParser:
+    """Incremental JSON parser that reports each value as soon as it is complete.
+
+    ``feed`` takes the next chunk and returns ``(path, value)`` for every value
+    the chunk completed, innermost first. A path holds object keys and array
+    indexes, e.g. ``("variations", 0, "headlines", 1)``; the whole document has
+    the path ``()``. Text before the first ``{`` or ``[`` (a code fence, say)
+    and after the document is ignored. Raises ValueError for malformed JSON.
+    """
+
+    def __init__(self) -> None:
+        self._frames: list[list] = []  # [container, key of the value being read]
+        self._expect = "start"  # start | value | key | colon | comma | done
+        self._string: list[str] | None = None
+        self._escaped = False
+        self._is_key = False
+        self._scalar: str | None = None
+        self.value: Any = None
+
+    @property
+    def done(self) -> bool:
+        return self._expect == "done"
+
+    def _path(self) -> Path:
+        return tuple(
+            key if isinstance(container, dict) else len(container)
+            for container, key in self._frames
+        )
+
+    def _complete(self, value: Any, events: list[tuple[Path, Any]]) -> None:
+        events.append((self._path(), value))
+        if not self._frames:
+            self.value = value
+            self._expect = "done"
+            return
+        container, key = self._frames[-1]
+        if isinstance(container, dict):
+            container[key] = value
+        else:
+            container.append(value)
+        self._expect = "comma"
+
+    def _open(self, char: str) -> None:
+        self._frames.append([{} if char == "{" else [], None])
+        self._expect = "key" if char == "{" else "value"
+
+    def _close(self, char: str, events: list[tuple[Path, Any]]) -> None:
+        container, _ = self._frames[-1]
+        if isinstance(container, dict) != (char == "}"):
+            raise ValueError(f"Invalid JSON: unexpected {char!r}")
+        self._frames.pop()
+        self._complete(container, events)
+
+    def _end_string(self, events: list[tuple[Path, Any]]) -> None:
+        raw = "".join(self._string or ())
+        self._string = None
+        text = json.loads(f'"{raw}"', strict=False) if "\\" in raw else raw
+        if self._is_key:
+            self._frames[-1][1] = text
+            self._expect = "colon"
+        else:
+            self._complete(text, events)
+
+    def _end_scalar(self, events: list[tuple[Path, Any]]) -> None:
+        token, self._scalar = self._scalar or "", None
+        if token in _LITERALS:
+            self._complete(_LITERALS[token], events)
+            return
+        try:
+            value = json.loads(token)
+        except ValueError:
+            raise ValueError(f"Invalid JSON value {token!r}") from None
+        if not isinstance(value, int | float):
+            raise ValueError(f"Invalid JSON value {token!r}")
+        self._complete(value, events)
+
+    def feed(self, text: str) -> list[tuple[Path, Any]]:
+        events: list[tuple[Path, Any]] = []
+        i, n = 0, len(text)
+        while i < n:
+            if self._string is not None:
+                if self._escaped:
+                    self._string.append(text[i])
+                    self._escaped = False
+                    i += 1
+                elif run := _STRING_RUN.match(text, i):
+                    self._string.append(run.group())
+                    i = run.end()
+                elif text[i] == "\\":
+                    self._string.append("\\")
+                    self._escaped = True
+                    i += 1
+                else:  # the closing quote
+                    self._end_string(events)
+                    i += 1
+                continue
+            if self._scalar is not None:
+                if run := _SCALAR_RUN.match(text, i):
+                    self._scalar += run.group()
+                    i = run.end()
+                if i < n:
+                    self._end_scalar(events)
+                continue
+
+            char = text[i]
+            i += 1
+            expect = self._expect
+            if char in _WHITESPACE:
+                continue
+            if expect == "start":
+                if char in "{[":
+                    self._open(char)
+            elif expect == "done":
+                break
+            elif expect == "value":
+                if char in "{[":
+                    self._open(char)
+                elif char == '"':
+                    self._string, self._is_key = [], False
+                elif char == "]" and not self._frames[-1][0]:
+                    self._close(char, events)
+                elif _SCALAR_RUN.match(char):
+                    self._scalar = char
+                else:
+                    raise ValueError(f"Invalid JSON: unexpected {char!r}")
+            elif expect == "key":
+                if char == '"':
+                    self._string, self._is_key = [], True
+                elif char == "}" and not self._frames[-1][0]:
+                    self._close(char, events)
+                else:
+                    raise ValueError(f"Invalid JSON: expected a key, got {char!r}")
+            elif expect == "colon":
+                if char != ":":
+                    raise ValueError(f"Invalid JSON: expected ':', got {char!r}")
+                self._expect = "value"
+            elif char == ",":
+                self._expect = "key" if isinstance(self._frames[-1][0], dict) else "value"
+            elif char in "}]":
+                self._close(char, events)
+            else:
+                raise ValueError(f"Invalid JSON: expected ',', got {char!r}")
+        return events
+
+    def close(self) -> Any:
+        """The parsed document. Raises ValueError if it is incomplete."""
+        if not self.done:
+            raise ValueError("Incomplete JSON reply (cut off by --max-tokens?)")
+        return self.value
+
+
+def parse(text: str) -> Any:
+    """Parse a complete reply (surrounding text such as code fences is ignored)."""
+    parser = JsonStreamParser()
+    parser.feed(text)
+    return parser.close()
+
+
+def iter_values(value: Any, path: Path = ()) -> Iterator[tuple[Path, Any]]:
+    """Every value in a parsed document, in the order the parser reports them."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from iter_values(item, (*path, key))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from iter_values(item, (*path, index))
+    yield path, value
+
+
+def path_name(path: Path) -> str:
+    """``("variations", 0, "headlines")`` as ``variations.0.headlines``."""
+    return ".".join(str(part) for part in path)
+
+
+def as_text(value: Any) -> str:
+    """A field value for a prompt: strings as is, lists of strings comma-separated."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return ", ".join(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+# ── Markdown ────────────────────────────────────────────────────
+
+
+_ACRONYMS = {"og": "OG", "seo": "SEO", "cta": "CTA", "url": "URL", "faq": "FAQ"}
+
+
+def _label(key: str | int) -> str:
+    label = " ".join(_ACRONYMS.get(word, word) for word in str(key).split("_"))
+    return label[:1].upper() + label[1:]
+
+
+class MarkdownRenderer:
+    """Markdown for each completed value: ``**Label:** value`` and bullet lists.
+
+    Objects inside arrays get a numbered heading (``### Variation 1``) before
+    their first field.
+    """
+
+    def __init__(self) -> None:
+        self._started: set[Path] = set()
+
+    def render(self, path: Path, value: Any) -> str:
+        if isinstance(value, dict):
+            return ""
+        if isinstance(value, list):
+            # A finished list of scalars ends its bullet list.
+            return "\n" if (path in self._started and path and isinstance(path[-1], str)) else ""
+        out = []
+        for depth in range(1, len(path)):
+            prefix = path[:depth]
+            if prefix in self._started:
+                continue
+            last, child = prefix[-1], path[depth]
+            if isinstance(last, int) and isinstance(child, str):
+                parent = prefix[-2] if len(prefix) > 1 else "item"
+                out.append(f"### {_label(parent).removesuffix('s')} {last + 1}\n\n")
+            elif isinstance(last, str) and depth == len(path) - 1:  # a list of scalars
+                out.append(f"**{_label(last)}:**\n\n")
+            else:
+                continue
+            self._started.add(prefix)
+        text = value if isinstance(value, str) else json.dumps(value)
+        if path and isinstance(path[-1], int):
+            out.append(f"- {text}\n")
+        else:
+            label = _label(path[-1]) if path else "Value"
+            out.append(f"**{label}:** {text}\n\n")
+        return "".join(out)
+
+
+def to_markdown(value: Any) -> str:
+    """Render a parsed reply as markdown."""
+    renderer = MarkdownRenderer()
+    return "".join(renderer.render(path, item) for path, item in iter_values(value)).rstrip()
+
+
+async def stream_markdown(
+    chunks: AsyncIterator[str], parser: JsonStreamParser | None = None
+) -> AsyncIterator[str]:
+    """Turn a streamed JSON reply into markdown, one field at a time.
+
+    Raises ValueError if the reply is malformed or incomplete; ``parser`` (if
+    given) holds the parsed document afterwards.
+    """
+    parser = parser or JsonStreamParser()
+    renderer = MarkdownRenderer()
+    async for chunk in chunks:
+        text = "".join(renderer.render(path, value) for path, value in parser.feed(chunk))
+        if text:
+            yield text
+    parser.close()
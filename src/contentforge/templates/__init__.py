@@ -2,20 +2,56 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from contentforge.templates.compiler import CompiledTemplate, TemplateError
 from contentforge.templates.models import ContentTemplate, TemplateField
 from contentforge.templates.registry import TEMPLATES
 
-__all__ = ["ContentTemplate", "TemplateField", "get_template", "list_templates"]
+if TYPE_CHECKING:
+    from contentforge.templates.loader import TemplateIndex
+
+__all__ = [
+    "CompiledTemplate",
+    "ContentTemplate",
+    "TemplateError",
+    "TemplateField",
+    "get_template",
+    "list_templates",
+    "render_prompt",
+]
 
 
 def get_template(template_id: str) -> ContentTemplate:
-    """Get a template by ID or raise KeyError."""
-    if template_id not in TEMPLATES:
-        available = ", ".join(sorted(TEMPLATES))
+    """Get a built-in or user template by ID or raise KeyError.
+
+    Built-in ids never touch the user template directories.
+    """
+    if template_id in TEMPLATES:
+        return TEMPLATES[template_id]
+    tpl = _user_templates().get(template_id)
+    if tpl is None:
+        available = ", ".join(sorted([*TEMPLATES, *_user_templates().ids()]))
         raise KeyError(f"Unknown template: {template_id!r}. Available: {available}")
-    return TEMPLATES[template_id]
+    return tpl
 
 
 def list_templates() -> list[ContentTemplate]:
-    """Return all registered templates."""
-    return list(TEMPLATES.values())
+    """Return all built-in templates followed by user templates."""
+    index = _user_templates()
+    return [*TEMPLATES.values(), *(index.get(tid) for tid in index.ids())]
+
+
+def _user_templates() -> TemplateIndex:
+    from contentforge.templates.loader import load_index
+
+    return load_index(reserved=frozenset(TEMPLATES))
+
+
+def render_prompt(template: ContentTemplate, variables: Mapping[str, str]) -> str:
+    """Fill field defaults and build the user prompt for a template.
+
+    Raises TemplateError if a required field is missing or a value is invalid.
+    """
+    return template.compiled.render(variables)
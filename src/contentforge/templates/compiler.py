@@ -0,0 +1,241 @@
+"""Compile prompt templates into render functions."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from contentforge.templates.models import ContentTemplate
+
+# {name} is the value of ``name``; {#name}...{/name} keeps the enclosed text only when
+# ``name`` is non-empty, {^name}...{/name} only when it is empty; {{ and }} are literal
+# braces. A template is compiled once into a plain function, so rendering a row is a
+# single call with no parsing.
+_TOKEN = re.compile(r"\{\{|\}\}|\{([#^/]?)([A-Za-z_][A-Za-z0-9_]*)\}|[{}]")
+
+
+class TemplateError(ValueError):
+    """A prompt template is malformed or its variables are invalid."""
+
+
+@dataclass
+class _Section:
+    name: str
+    inverted: bool
+    body: list = field(default_factory=list)
+
+
+def parse(source: str) -> list:
+    """Parse prompt source into literals (``str``), placeholders and sections.
+
+    Placeholders are ``(name,)`` tuples; sections are :class:`_Section` nodes.
+    """
+    root: list = []
+    stack: list[_Section] = []
+    out = root
+    pos = 0
+
+    def literal(text: str) -> None:
+        if out and isinstance(out[-1], str):
+            out[-1] += text
+        elif text:
+            out.append(text)
+
+    for m in _TOKEN.finditer(source):
+        literal(source[pos : m.start()])
+        pos = m.end()
+        token = m.group(0)
+        sigil, name = m.group(1), m.group(2)
+        if token in ("{{", "}}"):
+            literal(token[0])
+        elif name is None:
+            raise TemplateError(f"Unmatched {token!r} at offset {m.start()} (use {token * 2})")
+        elif sigil in ("#", "^"):
+            section = _Section(name, inverted=sigil == "^")
+            out.append(section)
+            stack.append(section)
+            out = section.body
+        elif sigil == "/":
+            if not stack or stack[-1].name != name:
+                raise TemplateError(f"Unexpected {{/{name}}} at offset {m.start()}")
+            stack.pop()
+            out = stack[-1].body if stack else root
+        else:
+            out.append((name,))
+    if stack:
+        raise TemplateError(f"Unclosed section {{#{stack[-1].name}}}")
+    literal(source[pos:])
+    return root
+
+
+def _names(nodes: list, seen: dict[str, None]) -> dict[str, None]:
+    for node in nodes:
+        if isinstance(node, tuple):
+            seen.setdefault(node[0])
+        elif isinstance(node, _Section):
+            seen.setdefault(node.name)
+            _names(node.body, seen)
+    return seen
+
+
+def _expr(nodes: list, args: dict[str, str]) -> str:
+    parts: list[str] = []
+    for node in nodes:
+        if isinstance(node, str):
+            parts.append(repr(node))
+        elif isinstance(node, tuple):
+            parts.append(args[node[0]])
+        else:
+            body = _expr(node.body, args)
+            test = f"not {args[node.name]}" if node.inverted else args[node.name]
+            parts.append(f"({body} if {test} else '')")
+    return " + ".join(parts) or "''"
+
+
+def _define(code: str, name: str, namespace: dict) -> Callable[..., str]:
+    exec(compile(code, f"<prompt {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def _arguments(names: tuple[str, ...]) -> dict[str, str]:
+    # Generated argument names, so fields called e.g. "type" or "class" are safe.
+    return {name: f"_{i}" for i, name in enumerate(names)}
+
+
+def compile_source(source: str) -> tuple[tuple[str, ...], Callable[..., str]]:
+    """Compile prompt source into ``(names, fn)`` where ``fn(*values)`` renders it.
+
+    ``values`` are passed in the order of ``names``.
+    """
+    nodes = parse(source)
+    names = tuple(_names(nodes, {}))
+    args = _arguments(names)
+    code = f"def render({', '.join(args.values())}):\n    return {_expr(nodes, args)}\n"
+    return names, _define(code, "render", {})
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+class CompiledTemplate:
+    """A template's user prompt compiled into a render function.
+
+    Get one through :attr:`ContentTemplate.compiled`, which compiles on first use.
+    """
+
+    def __init__(self, template: ContentTemplate) -> None:
+        self.template_id = template.id
+        nodes = parse(template.user_prompt_template)
+        self.names = tuple(_names(nodes, {}))
+        fields = {f.name: f for f in template.fields}
+        # Value used when a variable is missing or empty; None means "required".
+        self._fallback: dict[str, str | None] = {}
+        for name in self.names:
+            f = fields.get(name)
+            if f is None:
+                self._fallback[name] = None
+            elif f.default:
+                self._fallback[name] = f.default
+            else:
+                self._fallback[name] = None if f.required else ""
+        self._options = {
+            f.name: frozenset(f.options)
+            for f in template.fields
+            if f.type == "select" and f.options
+        }
+        self._numbers = frozenset(f.name for f in template.fields if f.type == "number")
+
+        args = _arguments(self.names)
+        expr = _expr(nodes, args)
+        namespace = {
+            "missing": self._missing,
+            "check": self._check,
+            "options": self._options,
+            "is_number": _is_number,
+        }
+        self._fn = _define(
+            f"def positional({', '.join(args.values())}):\n    return {expr}\n",
+            "positional",
+            namespace,
+        )
+        # The mapping entry point inlines defaults and the cheap validity tests;
+        # check() only runs to confirm and report a bad value.
+        lines = ["def render(v):"]
+        for name, arg in args.items():
+            fallback = self._fallback[name]
+            default = "" if fallback is None else f" or {fallback!r}"
+            lines.append(f"    {arg} = v.get({name!r}){default}")
+            if fallback is None:
+                lines.append(f"    if not {arg}: missing({name!r})")
+            if name in self._options:
+                lines.append(f"    if {arg} not in options[{name!r}]: check({name!r}, ({arg},))")
+            elif name in self._numbers:
+                lines.append(f"    if not is_number({arg}): check({name!r}, ({arg},))")
+        lines.append(f"    return {expr}")
+        self._render = _define("\n".join(lines) + "\n", "render", namespace)
+
+    @staticmethod
+    def _missing(name: str) -> None:
+        raise TemplateError(f"Missing required field: {name!r}")
+
+    def _check(self, name: str, values: Iterable[str]) -> None:
+        if name in self._options:
+            bad = set(values) - self._options[name] - {""}
+            if bad:
+                choices = ", ".join(sorted(self._options[name]))
+                raise TemplateError(
+                    f"Invalid value for {name!r}: {min(bad)!r} (choose from {choices})"
+                )
+        elif name in self._numbers:
+            for value in set(values):
+                if value and not _is_number(value):
+                    raise TemplateError(f"{name!r} must be a number, got {value!r}")
+
+    def render(self, variables: Mapping[str, str]) -> str:
+        """Validate ``variables``, fill field defaults and render the user prompt."""
+        return self._render(variables)
+
+    def render_columns(self, columns: Mapping[str, Sequence[str]]) -> list[str]:
+        """Render one prompt per row from column-oriented variables.
+
+        All columns must have the same length. Defaults are filled and values
+        validated once per column (selects and numbers per distinct value), then
+        every row is rendered with a single ``map`` over the compiled function.
+        """
+        lengths = {len(col) for col in columns.values()}
+        if len(lengths) > 1:
+            raise TemplateError("All columns must have the same length")
+        n = lengths.pop() if lengths else 0
+        args: list[Iterable[str]] = []
+        for name in self.names:
+            fallback = self._fallback[name]
+            col = columns.get(name)
+            if col is None:
+                if fallback is None and n:
+                    self._missing(name)
+                args.append(repeat(fallback or "", n))
+                continue
+            if not all(col):
+                if fallback is None:
+                    row = next(i for i, v in enumerate(col) if not v)
+                    raise TemplateError(f"Missing required field: {name!r} (row {row})")
+                col = [v or fallback for v in col]
+            self._check(name, col)
+            args.append(col)
+        return list(map(self._fn, *args))
+
+    def render_many(self, rows: Iterable[Mapping[str, str]]) -> list[str]:
+        """Render one prompt per row of variables (see :meth:`render_columns`)."""
+        rows = list(rows)
+        return self.render_columns(
+            {name: [row.get(name) or "" for row in rows] for name in self.names}
+        )
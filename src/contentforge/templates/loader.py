@@ -0,0 +1,273 @@
+"""User templates loaded from TOML/YAML files, behind an on-disk index."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+
+from contentforge import config
+from contentforge.config import tomllib
+from contentforge.templates.compiler import TemplateError, parse
+from contentforge.templates.models import ContentTemplate, TemplateField
+
+INDEX_VERSION = 1
+SUFFIXES = (".toml", ".yaml", ".yml")
+FIELD_TYPES = ("text", "textarea", "select", "number")
+
+_ID = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*")
+_TEMPLATE_KEYS = {f.name for f in fields(ContentTemplate)}
+_FIELD_KEYS = {f.name for f in fields(TemplateField)}
+
+# Process-level memo: (template file fingerprint, index)
+_cached: tuple[tuple, TemplateIndex] | None = None
+
+
+def user_template_dir() -> Path:
+    """Return the template directory that is always searched."""
+    return config.APP_DIR / "templates"
+
+
+def index_path() -> Path:
+    """Return the path to the parsed-template index."""
+    return config.APP_DIR / "template_index.json"
+
+
+def template_dirs(extra: str = "") -> list[Path]:
+    """The user template directory followed by ``extra`` (``os.pathsep``-separated)."""
+    dirs = [user_template_dir()]
+    dirs += [Path(p).expanduser() for p in extra.split(os.pathsep) if p.strip()]
+    return dirs
+
+
+def _read(path: Path, raw: bytes) -> dict:
+    if path.suffix == ".toml":
+        try:
+            return tomllib.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+            raise TemplateError(f"invalid TOML ({e})") from None
+    try:
+        import yaml
+    except ImportError:
+        raise TemplateError(
+            "YAML templates need PyYAML: pip install 'contentforge[yaml]'"
+        ) from None
+    try:
+        data = yaml.safe_load(raw)
+    except yaml.YAMLError as e:
+        raise TemplateError(f"invalid YAML ({e})") from None
+    if not isinstance(data, dict):
+        raise TemplateError("expected a mapping at the top level")
+    return data
+
+
+def _str(value: object) -> str:
+    return "" if value is None else str(value)
+
+
+def _field(data: object, index: int) -> TemplateField:
+    if not isinstance(data, dict) or not data.get("name"):
+        raise TemplateError(f"fields[{index}] needs a name")
+    if unknown := set(data) - _FIELD_KEYS:
+        raise TemplateError(f"fields[{index}]: unknown key(s) {', '.join(sorted(unknown))}")
+    ftype = data.get("type", "text")
+    if ftype not in FIELD_TYPES:
+        raise TemplateError(f"fields[{index}]: type must be one of {', '.join(FIELD_TYPES)}")
+    options = data.get("options", [])
+    if not isinstance(options, list) or (ftype == "select" and not options):
+        raise TemplateError(f"fields[{index}]: a select field needs a list of options")
+    name = str(data["name"])
+    return TemplateField(
+        name=name,
+        label=str(data.get("label") or name.replace("_", " ").capitalize()),
+        type=ftype,
+        required=bool(data.get("required", True)),
+        placeholder=_str(data.get("placeholder")),
+        default=_str(data.get("default")),
+        options=[_str(o) for o in options],
+    )
+
+
+def template_from_dict(data: dict, default_id: str) -> ContentTemplate:
+    """Validate a template definition and build it. Raises TemplateError."""
+    if unknown := set(data) - _TEMPLATE_KEYS:
+        raise TemplateError(f"unknown key(s) {', '.join(sorted(unknown))}")
+    prompt = data.get("user_prompt_template")
+    if not isinstance(prompt, str) or not prompt.strip():
+        raise TemplateError("user_prompt_template is required")
+    parse(prompt)  # syntax errors surface when indexing, not at generation time
+    raw_fields = data.get("fields", [])
+    if not isinstance(raw_fields, list):
+        raise TemplateError("fields must be a list")
+    schema = data.get("output_schema", {})
+    if not isinstance(schema, dict):
+        raise TemplateError("output_schema must be a table (a JSON schema)")
+    tid = str(data.get("id") or default_id)
+    if not _ID.fullmatch(tid):
+        raise TemplateError(f"invalid id {tid!r} (use letters, digits, '-' and '_')")
+    return ContentTemplate(
+        id=tid,
+        name=str(data.get("name") or tid),
+        description=_str(data.get("description")),
+        category=str(data.get("category", "custom")),
+        fields=[_field(f, i) for i, f in enumerate(raw_fields)],
+        system_prompt=_str(data.get("system_prompt")),
+        user_prompt_template=prompt,
+        output_format=str(data.get("output_format", "markdown")),
+        output_schema=schema,
+        example_output=_str(data.get("example_output")),
+    )
+
+
+def _from_dict(data: dict) -> ContentTemplate:
+    return ContentTemplate(
+        **{**data, "fields": [TemplateField(**f) for f in data["fields"]]},
+    )
+
+
+@dataclass
+class TemplateIndex:
+    """User templates by id; ``ContentTemplate`` objects are built on first lookup."""
+
+    entries: dict[str, dict] = field(default_factory=dict)
+    sources: dict[str, str] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    parsed: int = 0
+    _built: dict[str, ContentTemplate] = field(default_factory=dict, repr=False)
+
+    def ids(self) -> list[str]:
+        return list(self.entries)
+
+    def get(self, template_id: str) -> ContentTemplate | None:
+        if template_id not in self.entries:
+            return None
+        if template_id not in self._built:
+            self._built[template_id] = _from_dict(self.entries[template_id])
+        return self._built[template_id]
+
+
+def _scan(dirs: list[Path]) -> list[os.DirEntry]:
+    found = []
+    for d in dirs:
+        try:
+            entries = sorted(os.scandir(d), key=lambda e: e.name)
+        except OSError:
+            continue
+        found += [e for e in entries if e.name.endswith(SUFFIXES) and e.is_file()]
+    return found
+
+
+# Parsing hundreds of files on every run would dominate startup, so parsed
+# templates are kept in template_index.json keyed by each file's mtime and size,
+# plus its SHA-256 so a touched but unchanged file is not re-parsed.
+def _read_index(path: Path) -> dict[str, dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def _write_index(path: Path, files: dict[str, dict]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({"version": INDEX_VERSION, "files": files}), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def build_index(
+    dirs: list[Path], path: Path | None = None, reserved: frozenset[str] = frozenset()
+) -> TemplateIndex:
+    """Stat every template file, re-parse only changed ones and refresh the index file.
+
+    Ids in ``reserved`` (the built-in templates) cannot be redefined, and the
+    first file to define an id wins; both cases are reported in ``errors``.
+    """
+    path = path or index_path()
+    old = _read_index(path)
+    files: dict[str, dict] = {}
+    index = TemplateIndex()
+    for entry in _scan(dirs):
+        st = entry.stat()
+        prev = old.get(entry.path)
+        if prev and (prev["mtime_ns"], prev["size"]) == (st.st_mtime_ns, st.st_size):
+            files[entry.path] = prev
+            continue
+        try:
+            raw = Path(entry.path).read_bytes()
+        except OSError:
+            continue
+        digest = hashlib.sha256(raw).hexdigest()
+        record = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+        if prev and prev["sha256"] == digest:
+            files[entry.path] = {**prev, **record}
+            continue
+        index.parsed += 1
+        try:
+            tpl = template_from_dict(_read(Path(entry.path), raw), Path(entry.path).stem)
+            record["template"] = asdict(tpl)
+        except TemplateError as e:
+            record["error"] = str(e)
+        files[entry.path] = record
+
+    if files != old:
+        _write_index(path, files)
+
+    for source, record in files.items():
+        name = Path(source).name
+        if "error" in record:
+            index.errors[source] = f"{name}: {record['error']}"
+            continue
+        tid = record["template"]["id"]
+        if tid in reserved:
+            index.errors[source] = f"{name}: id {tid!r} is a built-in template"
+        elif tid in index.entries:
+            index.errors[source] = f"{name}: id {tid!r} is already defined in {index.sources[tid]}"
+        else:
+            index.entries[tid] = record["template"]
+            index.sources[tid] = source
+    return index
+
+
+def _fingerprint(dirs: list[Path]) -> tuple:
+    """Every template file's path, mtime and size (edits, additions and removals).
+
+    Saving a file in place leaves its directory's mtime alone, so the files
+    themselves have to be checked.
+    """
+    fp = []
+    for entry in _scan(dirs):
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        fp.append((entry.path, st.st_mtime_ns, st.st_size))
+    return tuple(fp)
+
+
+def load_index(reserved: frozenset[str] = frozenset()) -> TemplateIndex:
+    """The user template index for the configured directories.
+
+    Within a process the index is reused until a template file's mtime or size
+    changes, or files are added or removed.
+    """
+    global _cached
+    dirs = template_dirs(config.load_config().template_dirs)
+    fp = (_fingerprint(dirs), reserved)
+    if _cached is None or _cached[0] != fp:
+        _cached = (fp, build_index(dirs, reserved=reserved))
+    return _cached[1]
+
+
+def invalidate_index_cache() -> None:
+    """Forget the in-process index so the next lookup re-checks every file."""
+    global _cached
+    _cached = None
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import cached_property
+
+from contentforge.templates.compiler import CompiledTemplate
 
 
 @dataclass(frozen=True)
@@ -30,4 +33,10 @@ class ContentTemplate:
     system_prompt: str
     user_prompt_template: str
     output_format: str = "markdown"  # markdown | structured
+    output_schema: dict = field(default_factory=dict)  # JSON schema of a structured reply
     example_output: str = ""
+
+    @cached_property
+    def compiled(self) -> CompiledTemplate:
+        """The user prompt compiled into a render function (built on first use)."""
+        return CompiledTemplate(self)
@@ -11,6 +11,24 @@ def _register(t: ContentTemplate) -> None:
     TEMPLATES[t.id] = t
 
 
+def _object(**properties: dict) -> dict:
+    """A JSON schema object with every property required (as OpenAI strict mode wants)."""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def _string(description: str) -> dict:
+    return {"type": "string", "description": description}
+
+
+def _list(items: dict, description: str) -> dict:
+    return {"type": "array", "items": items, "description": description}
+
+
 # ── 1. Blog Post ────────────────────────────────────────────────
 _register(
     ContentTemplate(
@@ -50,7 +68,7 @@ _register(
         user_prompt_template=(
             "Write a {tone} blog post about: {topic}\n\n"
             "Target approximately {word_count} words.\n"
-            "{keywords_line}"
+            "{#keywords}Include these SEO keywords naturally: {keywords}{/keywords}"
         ),
     )
 )
@@ -185,8 +203,7 @@ _register(
             "- Use line breaks between tweets"
         ),
         user_prompt_template=(
-            "Create a {style} Twitter thread about: {topic}\n\n"
-            "Length: {count} tweets"
+            "Create a {style} Twitter thread about: {topic}\n\nLength: {count} tweets"
         ),
     )
 )
@@ -238,6 +255,17 @@ _register(
             "USP: {usp}\n\n"
             "Generate 3 ad variations."
         ),
+        output_format="structured",
+        output_schema=_object(
+            variations=_list(
+                _object(
+                    headlines=_list({"type": "string"}, "Headlines within the platform limits"),
+                    descriptions=_list({"type": "string"}, "Descriptions or primary text"),
+                    call_to_action=_string("Call to action"),
+                ),
+                "3 ad variations",
+            ),
+        ),
     )
 )
 
@@ -283,6 +311,13 @@ _register(
             "Secondary keywords: {secondary_keywords}"
         ),
         output_format="structured",
+        output_schema=_object(
+            meta_title=_string("50-60 characters, primary keyword near the start"),
+            meta_description=_string("150-160 characters, with a call to action"),
+            og_title=_string("Open Graph title, can be longer and more engaging"),
+            og_description=_string("Open Graph description, at most 200 characters"),
+            keywords=_list({"type": "string"}, "5 related long-tail keywords"),
+        ),
     )
 )
 
@@ -0,0 +1,110 @@
+"""Test batch generation."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+from typer.testing import CliRunner
+
+from contentforge.batch import iter_jobs, run_batch
+from contentforge.cli import app
+from contentforge.providers.base import BaseProvider, GenerationResult
+
+runner = CliRunner()
+
+
+class FakeProvider(BaseProvider):
+    name = "fake"
+    models: ClassVar[list[str]] = ["fake-1"]
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.model = "fake-1"
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return GenerationResult(content=prompt, provider="fake", model="fake-1", tokens_used=3)
+
+    async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        yield prompt
+
+    def is_available(self):
+        return True
+
+
+def _write_jsonl(path: Path, rows: list[dict]) -> Path:
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+    return path
+
+
+def test_iter_jobs_jsonl(tmp_path: Path):
+    path = _write_jsonl(tmp_path / "jobs.jsonl", [{"topic": "a", "count": 3}, {"topic": None}])
+    rows = list(iter_jobs(path))
+    assert rows == [{"topic": "a", "count": "3"}, {"topic": ""}]
+
+
+def test_iter_jobs_csv(tmp_path: Path):
+    path = tmp_path / "jobs.csv"
+    path.write_text("template,name,features\nproduct,Mug,ceramic\n", encoding="utf-8")
+    assert list(iter_jobs(path)) == [{"template": "product", "name": "Mug", "features": "ceramic"}]
+
+
+def test_iter_jobs_invalid_json(tmp_path: Path):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text('{"topic": "a"}\nnot json\n', encoding="utf-8")
+    with pytest.raises(ValueError, match=r"jobs\.jsonl:2"):
+        list(iter_jobs(path))
+
+
+def test_run_batch_bounded_concurrency():
+    prov = FakeProvider(delay=0.01)
+    jobs = ({"topic": f"t{i}"} for i in range(20))
+    records: list[dict] = []
+
+    stats = asyncio.run(run_batch(prov, jobs, records.append, template_id="blog", concurrency=4))
+
+    assert stats.succeeded == 20
+    assert stats.failed == 0
+    assert stats.tokens_used == 60
+    assert prov.peak == 4
+    assert sorted(r["index"] for r in records) == list(range(20))
+
+
+def test_run_batch_records_errors():
+    prov = FakeProvider()
+    jobs = [{"topic": "ok"}, {"template": "nonexistent"}, {"id": "x", "template": "product"}]
+    records: list[dict] = []
+
+    stats = asyncio.run(run_batch(prov, jobs, records.append, template_id="blog", concurrency=2))
+
+    assert stats.succeeded == 1
+    assert stats.failed == 2
+    by_index = {r["index"]: r for r in records}
+    assert "ok" in by_index[0]["content"]
+    assert "Unknown template" in by_index[1]["error"]
+    assert by_index[2]["id"] == "x"
+    assert "Missing required field" in by_index[2]["error"]
+
+
+def test_batch_command(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        "contentforge.commands.generate.get_provider", lambda *a, **kw: FakeProvider()
+    )
+    jobs = _write_jsonl(tmp_path / "jobs.jsonl", [{"topic": "A"}, {"topic": "B"}])
+    out = tmp_path / "results.jsonl"
+
+    result = runner.invoke(app, ["generate", "batch", str(jobs), "-t", "blog", "-o", str(out)])
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 2
+    assert all(r["provider"] == "fake" for r in records)
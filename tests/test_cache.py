@@ -0,0 +1,143 @@
+"""Test the response cache."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import ClassVar
+
+from typer.testing import CliRunner
+
+from contentforge.cache import CacheEntry, ResponseCache, cache_path, request_key
+from contentforge.cli import app
+from contentforge.providers import get_provider
+from contentforge.providers.base import BaseProvider, GenerationResult
+from contentforge.providers.cached import CachedProvider
+
+runner = CliRunner()
+
+
+class CountingProvider(BaseProvider):
+    name = "fake"
+    models: ClassVar[list[str]] = ["fake-1"]
+
+    def __init__(self) -> None:
+        self.model = "fake-1"
+        self.calls = 0
+
+    async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.calls += 1
+        return GenerationResult(
+            content=f"out:{prompt}", provider="fake", model="fake-1", tokens_used=5
+        )
+
+    async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.calls += 1
+        for chunk in ("a", "b", "c"):
+            yield chunk
+
+    def is_available(self):
+        return True
+
+
+def _entry(content: str) -> CacheEntry:
+    return CacheEntry(content=content, chunks=[content], provider="fake", model="fake-1")
+
+
+async def _collect(chunks) -> list[str]:
+    return [c async for c in chunks]
+
+
+def test_request_key_is_stable():
+    k1 = request_key("openai", "gpt-4o", "sys", "prompt", 0.7, 100)
+    assert k1 == request_key("openai", "gpt-4o", "sys", "prompt", 0.7, 100)
+    assert k1 != request_key("openai", "gpt-4o", "sys", "prompt", 0.8, 100)
+
+
+def test_put_and_get(tmp_path: Path):
+    cache = ResponseCache(tmp_path / "c.sqlite", max_bytes=10_000)
+    cache.put("k", _entry("hello"))
+    entry = cache.get("k")
+    assert entry is not None
+    assert entry.content == "hello"
+    assert cache.get("missing") is None
+    assert cache.stats().hits == 1
+
+
+def test_ttl_expiry(tmp_path: Path):
+    cache = ResponseCache(tmp_path / "c.sqlite", max_bytes=10_000, ttl=0.01)
+    cache.put("k", _entry("hello"))
+    cache._db().execute("UPDATE responses SET created = created - 1")
+    assert cache.get("k") is None
+    assert cache.stats().entries == 0
+
+
+def test_lru_eviction(tmp_path: Path):
+    cache = ResponseCache(tmp_path / "c.sqlite", max_bytes=150)
+    cache.put("a", _entry("x" * 30))
+    cache.put("b", _entry("y" * 30))
+    cache._db().execute("UPDATE responses SET accessed = accessed - 10 WHERE key = 'b'")
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", _entry("z" * 30))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_size_cap_holds_across_processes_sharing_the_file(tmp_path: Path):
+    # Two caches stand in for two processes (a batch next to serve); each entry is 64 bytes.
+    a = ResponseCache(tmp_path / "c.sqlite", max_bytes=150)
+    b = ResponseCache(tmp_path / "c.sqlite", max_bytes=150)
+    a.get("warm")  # a opens the database before b writes anything
+    for i in range(4):
+        (a if i % 2 else b).put(str(i), _entry("x" * 30))
+        assert a.stats().size_bytes <= 150
+    assert a.stats().entries == 2
+
+
+def test_cached_provider_generate(tmp_path: Path):
+    inner = CountingProvider()
+    prov = CachedProvider(inner, ResponseCache(tmp_path / "c.sqlite", max_bytes=10_000))
+
+    first = asyncio.run(prov.generate("hi", "sys"))
+    second = asyncio.run(prov.generate("hi", "sys"))
+
+    assert inner.calls == 1
+    assert second.content == first.content
+    assert second.tokens_used == 5
+    assert prov.hits == 1
+
+
+def test_cached_provider_stream_replays_chunks(tmp_path: Path):
+    inner = CountingProvider()
+    prov = CachedProvider(inner, ResponseCache(tmp_path / "c.sqlite", max_bytes=10_000))
+
+    assert asyncio.run(_collect(prov.stream("hi"))) == ["a", "b", "c"]
+    assert asyncio.run(_collect(prov.stream("hi"))) == ["a", "b", "c"]
+    assert inner.calls == 1
+
+
+def test_cached_provider_refresh(tmp_path: Path):
+    inner = CountingProvider()
+    cache = ResponseCache(tmp_path / "c.sqlite", max_bytes=10_000)
+    asyncio.run(CachedProvider(inner, cache).generate("hi"))
+    asyncio.run(CachedProvider(inner, cache, refresh=True).generate("hi"))
+    assert inner.calls == 2
+
+
+def test_get_provider_cache_toggle():
+    assert isinstance(get_provider("ollama"), CachedProvider)
+    assert not isinstance(get_provider("ollama", cache=False), CachedProvider)
+
+
+def test_cache_stats_command():
+    result = runner.invoke(app, ["cache", "stats"])
+    assert result.exit_code == 0
+    assert "entries" in result.output
+    assert cache_path().exists()
+
+
+def test_cache_prune_command():
+    result = runner.invoke(app, ["cache", "prune"])
+    assert result.exit_code == 0
+    assert "Pruned" in result.output
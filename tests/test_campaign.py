@@ -0,0 +1,208 @@
+"""Test campaigns: a dependency graph of templates filled from one brief."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import ClassVar
+
+import pytest
+from typer.testing import CliRunner
+
+from contentforge import structured
+from contentforge.campaign import (
+    DEFAULT_NODES,
+    Campaign,
+    Node,
+    build_brief,
+    load_plan,
+    run_campaign,
+)
+from contentforge.cli import app
+from contentforge.providers.base import BaseProvider, GenerationResult
+
+
+def _sample(schema: dict, text: str):
+    if schema.get("type") == "object":
+        return {k: _sample(v, f"{k} of {text}") for k, v in schema["properties"].items()}
+    if schema.get("type") == "array":
+        return [_sample(schema["items"], f"{text} {i}") for i in range(2)]
+    return text
+
+
+class _EchoProvider(BaseProvider):
+    """Answers with the first line of the prompt after ``delay`` seconds.
+
+    Structured requests get JSON in the requested shape, streamed in small chunks.
+    """
+
+    name = "fake"
+    models: ClassVar[list[str]] = ["fake-1"]
+    model = "fake-1"
+
+    def __init__(self, delay: float = 0.05, fail_on: str = "") -> None:
+        self.delay = delay
+        self.fail_on = fail_on
+        self.prompts: list[str] = []
+        self.events: list[tuple[str, str]] = []
+
+    def _reply(self, prompt: str) -> str:
+        line = prompt.splitlines()[0]
+        schema = structured.current()
+        return f"out: {line}" if schema is None else json.dumps(_sample(schema, line))
+
+    async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.prompts.append(prompt)
+        self.events.append(("start", prompt))
+        await asyncio.sleep(self.delay)
+        if self.fail_on and self.fail_on in prompt:
+            raise ConnectionError("reset")
+        return GenerationResult(content=self._reply(prompt), provider="fake", model="fake-1")
+
+    async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.prompts.append(prompt)
+        self.events.append(("start", prompt))
+        reply = self._reply(prompt)
+        chunks = [reply[i : i + 16] for i in range(0, len(reply), 16)]
+        for chunk in chunks:
+            await asyncio.sleep(self.delay / len(chunks))
+            yield chunk
+        self.events.append(("end", prompt))
+
+    def is_available(self):
+        return True
+
+
+def _default(topic: str = "tea", **brief: str) -> Campaign:
+    return Campaign({n.id: n for n in DEFAULT_NODES}, build_brief({"topic": topic, **brief}))
+
+
+def test_independent_nodes_run_in_parallel_and_dependents_see_upstream_output():
+    prov = _EchoProvider()
+    finished: list[str] = []
+
+    start = time.perf_counter()
+    results = asyncio.run(
+        run_campaign(prov, _default(), on_result=lambda r: finished.append(r.node))
+    )
+    elapsed = time.perf_counter() - start
+
+    assert all(r.status == "generated" for r in results.values())
+    # blog, seo and ad first (in parallel), then the two posts built on the blog.
+    assert set(finished[:3]) == {"blog", "seo", "ad"}
+    assert set(finished[3:]) == {"linkedin", "thread"}
+    assert elapsed < 0.2  # two rounds of 50 ms, not five
+    linkedin = next(p for p in prov.prompts if p.startswith("Create a linkedin post"))
+    assert results["blog"].content in linkedin
+    assert results["seo"].data["meta_title"] == "meta_title of Generate SEO meta tags for:"
+
+
+def test_structured_field_reference_starts_before_the_reply_is_done():
+    prov = _EchoProvider(delay=0.2)
+    nodes = {
+        "seo": Node("seo", "seo", {"keyword": "{topic}"}),
+        "post": Node("post", "social", {"topic": "{seo.meta_title}"}),
+        "tags": Node("tags", "tweet-thread", {"topic": "{seo.keywords}"}),
+    }
+    results = asyncio.run(run_campaign(prov, Campaign(nodes, build_brief({"topic": "tea"}))))
+
+    assert results["post"].ok and results["tags"].ok
+    post = next(p for p in prov.prompts if p.startswith("Create a linkedin"))
+    assert "about: meta_title of Generate SEO meta tags for:" in post
+    tags = next(p for p in prov.prompts if "Twitter thread" in p)
+    assert "keywords of Generate SEO meta tags for: 0, keywords of" in tags
+    # The meta title is the first field: the post started while the reply was streaming.
+    events = [(kind, p.split(":")[0]) for kind, p in prov.events]
+    assert events.index(("start", "Create a linkedin post about")) < events.index(
+        ("end", "Generate SEO meta tags for")
+    )
+
+    with pytest.raises(ValueError, match="no structured output"):
+        Campaign(
+            {
+                "blog": Node("blog", "blog", {"topic": "x"}),
+                "p": Node("p", "social", {"topic": "{blog.title}"}),
+            },
+            {},
+        ).validate()
+
+
+def test_output_dir_reruns_only_changed_nodes_and_their_dependents(tmp_path):
+    out = tmp_path / "campaign"
+    prov = _EchoProvider(delay=0)
+    asyncio.run(run_campaign(prov, _default(), output_dir=out))
+    assert len(prov.prompts) == 5
+    assert (out / "campaign.json").is_file()
+
+    # Nothing changed: every node is read back.
+    prov.prompts.clear()
+    results = asyncio.run(run_campaign(prov, _default(), output_dir=out))
+    assert prov.prompts == []
+    assert {r.status for r in results.values()} == {"reused"}
+
+    # A hand-edited blog post is kept, and only the posts built from it are redone.
+    (out / "blog.md").write_text("My edited post", encoding="utf-8")
+    results = asyncio.run(run_campaign(prov, _default(), output_dir=out))
+    assert results["blog"].content == "My edited post"
+    assert {n for n, r in results.items() if r.status == "generated"} == {"linkedin", "thread"}
+    assert all("My edited post" in p for p in prov.prompts)
+
+    # A new audience only touches the ad.
+    prov.prompts.clear()
+    results = asyncio.run(run_campaign(prov, _default(audience="baristas"), output_dir=out))
+    assert [n for n, r in results.items() if r.status == "generated"] == ["ad"]
+
+
+def test_failed_node_skips_dependents_only():
+    prov = _EchoProvider(delay=0, fail_on="blog post about")
+    results = asyncio.run(run_campaign(prov, _default()))
+    assert results["blog"].status == "failed"
+    assert results["linkedin"].status == results["thread"].status == "skipped"
+    assert results["seo"].ok and results["ad"].ok
+
+
+def test_validation_and_plan_file(tmp_path):
+    with pytest.raises(ValueError, match="cycle"):
+        Campaign(
+            {"a": Node("a", "blog", {"topic": "{b}"}), "b": Node("b", "blog", {"topic": "{a}"})}, {}
+        ).validate()
+    with pytest.raises(ValueError, match=r"\{nope\}"):
+        Campaign({"a": Node("a", "blog", {"topic": "{nope}"})}, {}).validate()
+
+    plan = tmp_path / "plan.toml"
+    plan.write_text(
+        '[brief]\ntopic = "coffee"\n\n'
+        '[nodes.post]\ntemplate = "blog"\ntopic = "{topic}"\n\n'
+        '[nodes.mail]\ntemplate = "email"\ntype = "newsletter"\nsubject = "{post}"\n'
+        'recipient = "subscribers"\ncta = "read it"\n',
+        encoding="utf-8",
+    )
+    nodes, brief = load_plan(plan)
+    assert [n.id for n in nodes] == ["post", "mail"]
+    assert Campaign({n.id: n for n in nodes}, build_brief(brief)).graph() == {
+        "post": set(),
+        "mail": {"post"},
+    }
+
+
+def test_campaign_cli(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    monkeypatch.setattr(
+        "contentforge.commands.generate.get_provider", lambda *a, **kw: _EchoProvider(delay=0)
+    )
+    runner = CliRunner()
+    result = runner.invoke(
+        app, ["generate", "campaign", "--topic", "tea", "-o", str(tmp_path / "out")]
+    )
+    assert result.exit_code == 0, result.output
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == [
+        "ad.json",
+        "blog.md",
+        "campaign.json",
+        "linkedin.md",
+        "seo.json",
+        "thread.md",
+    ]
+
+    result = runner.invoke(app, ["generate", "campaign"])  # no topic for the default plan
+    assert result.exit_code == 1
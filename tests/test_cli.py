@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import subprocess
+import sys
+
+import pytest
 from typer.testing import CliRunner
 
 from contentforge import __version__
@@ -33,6 +37,28 @@ def test_generate_help():
     assert "email" in result.output
 
 
+@pytest.mark.parametrize(
+    "command",
+    [
+        "blog",
+        "social",
+        "email",
+        "tweet-thread",
+        "ad",
+        "seo",
+        "product",
+        "youtube",
+        "run",
+        "campaign",
+        "batch",
+    ],
+)
+def test_generate_subcommand_help(command):
+    # Option help is rich markup: a stray "[/...]" would crash --help.
+    result = runner.invoke(app, ["generate", command, "--help"])
+    assert result.exit_code == 0, result.output
+
+
 def test_templates_list():
     result = runner.invoke(app, ["templates"])
     assert result.exit_code == 0
@@ -76,3 +102,20 @@ def test_config_set_and_persist():
 def test_config_set_invalid_key():
     result = runner.invoke(app, ["config", "set", "nonexistent_key", "value"])
     assert result.exit_code == 1
+
+
+def test_startup_does_not_import_heavy_modules():
+    code = (
+        "import sys\n"
+        "from contentforge.cli import app\n"
+        "try:\n"
+        "    app(['--version'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "heavy = ['openai', 'google.generativeai', 'httpx', 'rich.markdown',\n"
+        "         'contentforge.commands.generate']\n"
+        "print('loaded=' + ','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert "contentforge" in proc.stdout
+    assert proc.stdout.strip().endswith("loaded=")
@@ -0,0 +1,133 @@
+"""Test single-flight coalescing of identical in-flight requests."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import ClassVar
+
+import pytest
+
+from contentforge import metrics
+from contentforge.batch import run_batch
+from contentforge.providers import BaseProvider, GenerationResult
+from contentforge.providers.coalesce import CoalescingProvider
+
+
+class _SlowProvider(BaseProvider):
+    """Answers after ``delay`` seconds, streaming one chunk per word."""
+
+    name = "slow"
+    models: ClassVar[list[str]] = ["m"]
+    model = "m"
+
+    def __init__(self, delay: float = 0.02, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.calls: list[str] = []
+        self.cancelled = 0
+
+    async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.calls.append(prompt)
+        await asyncio.sleep(self.delay)
+        return GenerationResult(content=f"re: {prompt}", provider="slow", model="m")
+
+    async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.calls.append(prompt)
+        try:
+            for word in ("one ", "two ", "three"):
+                await asyncio.sleep(self.delay)
+                if self.fail:
+                    raise ConnectionError("reset")
+                yield word
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+    def is_available(self):
+        return True
+
+
+def test_concurrent_identical_generates_share_one_call():
+    inner = _SlowProvider()
+    prov = CoalescingProvider(inner)
+
+    async def call(prompt: str) -> tuple[str, bool]:
+        with metrics.collecting(metrics.GenerationMetrics()) as m:
+            result = await prov.generate(prompt)
+        return result.content, m.coalesced
+
+    async def scenario():
+        results = await asyncio.gather(*(call(p) for p in ["a", "a", "b", "a", "b"]))
+        await call("a")  # the first call has finished, so this one goes upstream again
+        return results
+
+    results = asyncio.run(scenario())
+    assert [r[0] for r in results] == ["re: a", "re: a", "re: b", "re: a", "re: b"]
+    assert [r[1] for r in results] == [False, True, False, True, True]
+    assert inner.calls == ["a", "b", "a"]
+    assert (prov.requests, prov.coalesced) == (6, 3)
+    assert prov.dedup_ratio == pytest.approx(0.5)
+
+
+def test_stream_fans_out_to_late_and_leaving_subscribers():
+    inner = _SlowProvider()
+    prov = CoalescingProvider(inner)
+
+    async def read(delay: float = 0.0, stop_after: int | None = None) -> str:
+        await asyncio.sleep(delay)
+        chunks = []
+        async for chunk in prov.stream("p"):
+            chunks.append(chunk)
+            if len(chunks) == stop_after:
+                break
+        return "".join(chunks)
+
+    async def scenario():
+        # The leader walks away after one chunk; the late joiner still gets everything.
+        return await asyncio.gather(read(stop_after=1), read(), read(delay=0.03))
+
+    assert asyncio.run(scenario()) == ["one ", "one two three", "one two three"]
+    assert inner.calls == ["p"]
+    assert inner.cancelled == 0
+
+    failing = CoalescingProvider(_SlowProvider(fail=True))
+
+    async def fail_both():
+        async def consume():
+            return [c async for c in failing.stream("p")]
+
+        return await asyncio.gather(consume(), consume(), return_exceptions=True)
+
+    assert [type(e) for e in asyncio.run(fail_both())] == [ConnectionError, ConnectionError]
+
+
+def test_stream_cancelled_when_every_subscriber_leaves():
+    inner = _SlowProvider()
+    prov = CoalescingProvider(inner)
+
+    async def scenario():
+        async def first_chunk():
+            async for chunk in prov.stream("p"):
+                return chunk
+
+        await asyncio.gather(first_chunk(), first_chunk())
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert inner.cancelled == 1
+    assert prov.coalesced == 1
+
+
+def test_batch_reports_dedup_ratio():
+    inner = _SlowProvider()
+    rows = [{"topic": t} for t in ["tea", "coffee", "tea", "tea", "coffee", "juice"]]
+
+    async def scenario():
+        return await run_batch(
+            CoalescingProvider(inner), rows, lambda r: None, template_id="blog", concurrency=6
+        )
+
+    stats = asyncio.run(scenario())
+    assert len(inner.calls) == 3
+    assert (stats.succeeded, stats.coalesced) == (6, 3)
+    assert stats.dedup_ratio == pytest.approx(0.5)
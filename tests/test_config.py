@@ -6,6 +6,7 @@ from pathlib import Path
 
 import pytest
 
+from contentforge import config
 from contentforge.config import Config, config_path, load_config, mask_value, save_config, set_value
 
 
@@ -79,3 +80,35 @@ def test_cast_float():
     set_value("default_temperature", "0.5")
     loaded = load_config()
     assert loaded.default_temperature == 0.5
+
+
+def test_load_config_is_memoized(monkeypatch: pytest.MonkeyPatch):
+    save_config(Config(default_provider="gemini"))
+    calls = []
+    real_read = config._read_config
+    monkeypatch.setattr(config, "_read_config", lambda: calls.append(1) or real_read())
+
+    assert load_config().default_provider == "gemini"
+    assert load_config().default_provider == "gemini"
+    assert len(calls) == 1
+
+
+def test_load_config_returns_independent_copies():
+    cfg = load_config()
+    cfg.default_provider = "ollama"
+    cfg._env_overrides.add("default_provider")
+    fresh = load_config()
+    assert fresh.default_provider == "openai"
+    assert not fresh._env_overrides
+
+
+def test_load_config_invalidates_on_file_change(config_file: Path):
+    assert load_config().default_provider == "openai"
+    config_file.write_text('default_provider = "ollama"\n', encoding="utf-8")
+    assert load_config().default_provider == "ollama"
+
+
+def test_load_config_invalidates_on_env_change(monkeypatch: pytest.MonkeyPatch):
+    assert load_config().openai_model == "gpt-4o-mini"
+    monkeypatch.setenv("CONTENTFORGE_OPENAI_MODEL", "gpt-4o")
+    assert load_config().openai_model == "gpt-4o"
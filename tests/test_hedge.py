@@ -0,0 +1,211 @@
+"""Test hedged requests and TTFT tracking."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import ClassVar
+
+import pytest
+
+from contentforge import metrics
+from contentforge.providers import BaseProvider, GenerationResult, get_provider
+from contentforge.providers.hedge import MIN_SAMPLES, HedgedProvider, TTFTTracker, ttft_path
+
+
+class _DelayedProvider(BaseProvider):
+    """Yields ``chunks`` after ``delay`` seconds, or raises if ``fail`` is set."""
+
+    models: ClassVar[list[str]] = ["m"]
+
+    def __init__(self, name: str, delay: float, chunks=("a", "b"), fail: bool = False) -> None:
+        self.name = name
+        self.model = "m"
+        self.delay = delay
+        self.chunks = list(chunks)
+        self.fail = fail
+        self.started = 0
+        self.cancelled = False
+
+    async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise ConnectionError("refused")
+        return GenerationResult(content="".join(self.chunks), provider=self.name, model=self.model)
+
+    async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise ConnectionError("refused")
+            for chunk in self.chunks:
+                yield chunk
+                await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+    def is_available(self):
+        return True
+
+
+def _collect(prov: BaseProvider, m: metrics.GenerationMetrics | None = None) -> list[str]:
+    async def run() -> list[str]:
+        with metrics.collecting(m or metrics.GenerationMetrics()):
+            return [c async for c in prov.stream("hi")]
+
+    return asyncio.run(run())
+
+
+def test_fast_primary_does_not_hedge():
+    primary = _DelayedProvider("primary", 0.0, ["p1", "p2"])
+    backup = _DelayedProvider("backup", 0.0)
+    prov = HedgedProvider(primary, backup, hedge_after_ms=200)
+
+    m = metrics.GenerationMetrics()
+    assert _collect(prov, m) == ["p1", "p2"]
+    assert not m.hedged
+    assert backup.started == 0
+    assert m.provider == "primary"
+
+
+def test_slow_primary_loses_to_backup():
+    primary = _DelayedProvider("primary", 1.0, ["p"])
+    backup = _DelayedProvider("backup", 0.0, ["b1", "b2"])
+    prov = HedgedProvider(primary, backup, hedge_after_ms=20)
+
+    m = metrics.GenerationMetrics()
+    assert _collect(prov, m) == ["b1", "b2"]
+    assert m.hedged
+    assert m.provider == "backup"
+    assert primary.cancelled
+
+
+def test_primary_can_still_win_after_hedging():
+    primary = _DelayedProvider("primary", 0.05, ["p"])
+    backup = _DelayedProvider("backup", 1.0, ["b"])
+    prov = HedgedProvider(primary, backup, hedge_after_ms=10)
+
+    m = metrics.GenerationMetrics()
+    assert _collect(prov, m) == ["p"]
+    assert m.hedged
+    assert backup.cancelled
+
+
+def test_failed_primary_falls_back_immediately():
+    primary = _DelayedProvider("primary", 0.0, fail=True)
+    backup = _DelayedProvider("backup", 0.0, ["b"])
+    prov = HedgedProvider(primary, backup, hedge_after_ms=10_000)
+
+    m = metrics.GenerationMetrics()
+    assert _collect(prov, m) == ["b"]
+    assert m.provider == "backup"
+    # A failure is not a latency sample.
+    assert "primary/m:ttft" not in prov.tracker.samples
+
+
+def test_both_failing_raises():
+    prov = HedgedProvider(
+        _DelayedProvider("primary", 0.0, fail=True),
+        _DelayedProvider("backup", 0.0, fail=True),
+        hedge_after_ms=10,
+    )
+    with pytest.raises(ConnectionError):
+        _collect(prov)
+
+
+def test_generate_hedges():
+    primary = _DelayedProvider("primary", 1.0, ["p"])
+    backup = _DelayedProvider("backup", 0.0, ["b"])
+    prov = HedgedProvider(primary, backup, hedge_after_ms=20)
+
+    async def run() -> GenerationResult:
+        with metrics.collecting(m):
+            return await prov.generate("hi")
+
+    m = metrics.GenerationMetrics()
+    result = asyncio.run(run())
+
+    assert result.content == "b"
+    assert m.hedged
+    assert m.provider == "backup"
+    assert primary.cancelled
+
+
+def test_threshold_adapts_to_p95(tmp_path):
+    tracker = TTFTTracker(tmp_path / "ttft.json")
+    key = "primary/m:ttft"
+    assert tracker.threshold(key, 2000) == 2000
+
+    for ms in range(1, MIN_SAMPLES * 5 + 1):  # 1..100 ms
+        tracker.record(key, float(ms))
+    assert tracker.threshold(key, 2000) == 95.0
+
+    tracker.save()
+    assert TTFTTracker(tmp_path / "ttft.json").threshold(key, 2000) == 95.0
+
+
+def test_stream_records_ttft_per_provider():
+    primary = _DelayedProvider("primary", 0.0)
+    prov = HedgedProvider(primary, _DelayedProvider("backup", 0.0), hedge_after_ms=200)
+    _collect(prov)
+    assert len(prov.tracker.samples["primary/m:ttft"]) == 1
+
+
+@pytest.mark.parametrize("kind", ["ttft", "total"])
+def test_loser_records_censored_sample_and_racers_are_timed_from_launch(kind):
+    primary = _DelayedProvider("primary", 1.0, ["p"])
+    backup = _DelayedProvider("backup", 0.0, ["b"])
+    prov = HedgedProvider(primary, backup, hedge_after_ms=50)
+
+    if kind == "ttft":
+        _collect(prov)
+    else:
+        asyncio.run(prov.generate("hi"))
+
+    # The cancelled primary had run at least until the hedge delay...
+    assert prov.tracker.samples[f"primary/m:{kind}"][0] >= 50
+    # ...while the backup is not charged for the time before it launched.
+    assert prov.tracker.samples[f"backup/m:{kind}"][0] < 50
+
+
+def test_concurrent_calls_report_their_own_outcome():
+    class _PromptDelay(_DelayedProvider):
+        """Waits as many seconds as the prompt says."""
+
+        async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+            await asyncio.sleep(float(prompt))
+            yield self.name
+
+    prov = HedgedProvider(
+        _PromptDelay("primary", 0.0), _DelayedProvider("backup", 0.0, ["backup"]), hedge_after_ms=50
+    )
+
+    async def call(prompt: str) -> metrics.GenerationMetrics:
+        with metrics.collecting(metrics.GenerationMetrics()) as m:
+            assert [c async for c in prov.stream(prompt)] == [m.provider]
+        return m
+
+    async def run() -> list[metrics.GenerationMetrics]:
+        return await asyncio.gather(call("1"), call("0"))
+
+    slow, quick = asyncio.run(run())
+    assert (slow.hedged, slow.provider) == (True, "backup")
+    assert (quick.hedged, quick.provider) == (False, "primary")
+
+
+def test_get_provider_wraps_configured_hedge(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("CONTENTFORGE_OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("CONTENTFORGE_HEDGE_PROVIDER", "ollama/qwen2.5")
+    prov = get_provider("openai", cache=False)
+    assert isinstance(prov, HedgedProvider)
+    assert prov.backup.name == "ollama"
+    assert prov.backup.model == "qwen2.5"
+    assert prov.tracker.path == ttft_path()
+
+    assert not isinstance(get_provider("openai", cache=False, hedge="none"), HedgedProvider)
@@ -0,0 +1,116 @@
+"""Tests for the generation history (SQLite + FTS5)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+from typer.testing import CliRunner
+
+from contentforge import history
+from contentforge.cli import app
+from contentforge.history import HistoryEntry, HistoryStore, HistoryWriter
+from contentforge.metrics import GenerationMetrics
+from contentforge.providers.base import BaseProvider, GenerationResult
+
+runner = CliRunner()
+
+
+class Echo(BaseProvider):
+    name = "fake"
+    models: ClassVar[list[str]] = ["fake-1"]
+    model = "fake-1"
+
+    async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        return GenerationResult(
+            content=f"Draft about {prompt[-40:]}", provider="fake", model="fake-1"
+        )
+
+    async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        for word in ("Streamed ", "kombucha ", "notes"):
+            yield word
+
+    def is_available(self):
+        return True
+
+
+def _entry(content: str, template: str = "blog", **variables: str) -> HistoryEntry:
+    return HistoryEntry(
+        template=template, provider="fake", model="fake-1", content=content, variables=variables
+    )
+
+
+def test_search_ranks_filters_and_quotes_terms():
+    store = HistoryStore()
+    store.add_many(
+        [
+            _entry("Cold brew coffee guide for beginners", topic="brewing"),
+            _entry("Tea, coffee and more coffee: a comparison", topic="drinks"),
+            _entry("Espresso machines reviewed", template="product", name="Barista-9000"),
+        ]
+    )
+
+    hits = store.search("coffee")
+    assert [h.entry.id for h in hits] == [2, 1]  # bm25: more mentions rank higher
+    assert "[coffee]" in hits[0].snippet
+    assert [h.entry.id for h in store.search("coffee", newest_first=True)] == [2, 1]
+    assert [h.entry.id for h in store.search("coffee guide")] == [1]
+    assert [h.entry.id for h in store.search("espress*")] == [3]
+    # Variables are indexed too; punctuation is never read as query syntax.
+    assert [h.entry.id for h in store.search("barista-9000")] == [3]
+    assert store.search('coffee" OR "espresso', template="product") == []
+    assert [e.id for e in store.iter_entries("coffee", template="blog")] == [1, 2]
+    assert store.get(3).variables == {"name": "Barista-9000"}
+    assert store.get(99) is None
+
+
+def test_writer_batches_queued_entries_and_skips_cache_hits():
+    store = HistoryStore()
+    writer = HistoryWriter(store)
+    for i in range(300):
+        writer.add(_entry(f"entry {i}"))
+    writer.close()
+    assert HistoryStore().count() == 300
+    assert writer.transactions < 300
+
+    m = GenerationMetrics(template="blog")
+    history.record_result(GenerationResult("fresh", "fake", "fake-1"), {"topic": "x"}, m)
+    m.cached = True
+    history.record_result(GenerationResult("from cache", "fake", "fake-1"), {"topic": "x"}, m)
+    history.flush()
+    (entry,) = HistoryStore().recent(1)
+    assert (entry.content, entry.metrics["provider"]) == ("fresh", "fake")
+    assert HistoryStore().count() == 301
+
+
+def test_generate_records_history_and_cli_commands(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("contentforge.commands.generate.get_provider", lambda *a, **kw: Echo())
+    for args in (["--no-stream", "--topic", "pour-over"], ["--stream", "--topic", "kombucha"]):
+        result = runner.invoke(app, ["generate", "blog", "--format", "plain", *args])
+        assert result.exit_code == 0, result.output
+    history.flush()
+
+    first, second = HistoryStore().iter_entries()
+    assert (first.template, first.variables["topic"]) == ("blog", "pour-over")
+    assert second.content == "Streamed kombucha notes"
+    assert second.metrics["streamed"] is True
+
+    result = runner.invoke(app, ["history", "search", "kombucha"])
+    assert result.exit_code == 0, result.output
+    assert "Streamed" in result.output and "pour-over" not in result.output
+
+    result = runner.invoke(app, ["history", "show", str(first.id), "--format", "json"])
+    assert json.loads(result.stdout)["variables"]["topic"] == "pour-over"
+    assert runner.invoke(app, ["history", "show", "42"]).exit_code == 1
+
+    out = tmp_path / "history.jsonl"
+    result = runner.invoke(app, ["history", "export", "-o", str(out), "--query", "pour*"])
+    assert result.exit_code == 0, result.output
+    assert [json.loads(line)["id"] for line in out.read_text().splitlines()] == [first.id]
+
+    monkeypatch.setenv("CONTENTFORGE_HISTORY_ENABLED", "false")
+    runner.invoke(app, ["generate", "blog", "--no-stream", "--topic", "matcha"])
+    history.flush()
+    assert HistoryStore().count() == 2
@@ -0,0 +1,105 @@
+"""Test the long-form (outline, then concurrent sections) blog pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import ClassVar
+
+import pytest
+from typer.testing import CliRunner
+
+from contentforge import metrics
+from contentforge.cli import app
+from contentforge.longform import parse_outline, stream_long_form
+from contentforge.providers.base import BaseProvider, GenerationResult
+
+OUTLINE = """Here is the plan:
+
+# Brewing at Home
+## Introduction
+- why brew at home
+## **Choosing Beans**
+1. roast levels
+2. freshness
+## Conclusion
+"""
+
+
+class _WriterProvider(BaseProvider):
+    """Returns ``OUTLINE`` for the outline; sections stream slowly, the first slowest."""
+
+    name = "fake"
+    models: ClassVar[list[str]] = ["fake-1"]
+    model = "fake-1"
+
+    def __init__(self) -> None:
+        self.section_prompts: list[str] = []
+
+    async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        return GenerationResult(content=OUTLINE, provider="fake", model="fake-1")
+
+    async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.section_prompts.append(prompt)
+        index = int(prompt.split("Write section ")[1].split(" ")[0])
+        delay = {1: 0.06, 2: 0.01, 3: 0.03}[index]
+        for word in (f"Body {index} ", "ends."):
+            await asyncio.sleep(delay)
+            yield word
+        metrics.record_usage(100, 50)
+
+    def is_available(self):
+        return True
+
+
+def test_parse_outline():
+    outline = parse_outline(OUTLINE, "fallback")
+    assert outline.title == "Brewing at Home"
+    assert [s.heading for s in outline.sections] == ["Introduction", "Choosing Beans", "Conclusion"]
+    assert outline.sections[1].notes == ["roast levels", "freshness"]
+    assert parse_outline("## Only section", "Topic").title == "Topic"
+    with pytest.raises(ValueError):
+        parse_outline("# Title but nothing else", "Topic")
+
+
+def test_sections_run_concurrently_and_stream_in_order():
+    prov = _WriterProvider()
+    variables = {"topic": "home brewing", "tone": "casual", "word_count": "3000"}
+    m = metrics.GenerationMetrics()
+
+    async def run() -> list[str]:
+        with metrics.collecting(m):
+            return [c async for c in stream_long_form(prov, "sys", variables)]
+
+    start = time.perf_counter()
+    chunks = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    text = "".join(chunks)
+    assert text.startswith("# Brewing at Home\n\n## Introduction\n\nBody 1 ends.\n\n")
+    assert text.index("## Choosing Beans") < text.index("Body 2") < text.index("## Conclusion")
+    assert text.rstrip().endswith("Body 3 ends.")
+    # The slowest section (2 x 60 ms) bounds the run, not the sum of all three (200 ms).
+    assert elapsed < 0.18
+    # Every section sees the whole outline, which comes first (a shared prompt prefix).
+    assert all(p.startswith(prov.section_prompts[0][:200]) for p in prov.section_prompts)
+    assert all("## Conclusion" in p for p in prov.section_prompts)
+    assert (m.tokens_in, m.tokens_out) == (300, 150)
+    assert "outline" in m.phases
+
+
+def test_blog_long_form_cli(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        "contentforge.commands.generate.get_provider", lambda *a, **kw: _WriterProvider()
+    )
+    runner = CliRunner()
+    args = ["generate", "blog", "--topic", "brewing", "--long-form", "--format", "plain"]
+
+    for extra in (["--no-stream"], ["--stream"]):
+        result = runner.invoke(app, [*args, *extra])
+        assert result.exit_code == 0, result.output
+        out = result.stdout
+        assert out.index("Body 1") < out.index("Body 2") < out.index("Body 3")
+
+    result = runner.invoke(app, [*args, "--variants", "2"])
+    assert result.exit_code == 1
@@ -0,0 +1,274 @@
+"""Test per-generation metrics and their sinks."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import ClassVar
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from contentforge import metrics
+from contentforge.cli import app
+from contentforge.metrics import GenerationMetrics, collecting
+from contentforge.providers.base import BaseProvider
+from contentforge.providers.ollama_provider import OllamaProvider
+from contentforge.providers.openai_provider import OpenAIProvider
+
+runner = CliRunner()
+
+
+class _SlowStream(BaseProvider):
+    name = "fake"
+    models: ClassVar[list[str]] = ["fake-1"]
+
+    def __init__(self) -> None:
+        self.model = "fake-1"
+
+    async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        raise NotImplementedError
+
+    async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        metrics.record_connect()
+        for chunk in ("one ", "two ", "three"):
+            await asyncio.sleep(0.01)
+            yield chunk
+        metrics.record_usage(12, 30)
+
+    def is_available(self):
+        return True
+
+
+def test_stream_timings_and_tokens_per_second():
+    m = GenerationMetrics()
+    m.request_started()
+    for _ in range(3):
+        time.sleep(0.01)
+        m.chunk()
+    m.usage(10, 20)
+    m.finish()
+
+    data = m.to_dict()
+    assert data["chunks"] == 3
+    assert data["ttft_ms"] >= 10
+    assert data["inter_chunk_ms"]["max"] >= 10
+    assert data["total_ms"] >= data["ttft_ms"]
+    # Rate is measured after the first token: 20 tokens over at least 20ms.
+    assert 0 < data["tokens_per_second"] <= 1000
+
+
+def test_record_helpers_are_noops_outside_collecting():
+    metrics.record_usage(1, 2)
+    metrics.record_connect()
+    assert metrics.current() is None
+
+    m = GenerationMetrics()
+    with collecting(m):
+        metrics.record_usage(5, 7)
+        metrics.record_phase("rate_limit_wait", 1.5)
+    assert (m.tokens_in, m.tokens_out) == (5, 7)
+    assert m.phases == {"rate_limit_wait": 1.5}
+
+
+def test_ollama_stream_reports_usage_and_connect():
+    lines = (
+        '{"response": "hi", "done": false}\n'
+        '{"done": true, "prompt_eval_count": 9, "eval_count": 4}\n'
+    )
+    prov = OllamaProvider(model="stub")
+    prov._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, text=lines))
+    )
+    m = GenerationMetrics()
+
+    async def run() -> list[str]:
+        m.request_started()
+        return [c async for c in prov.stream("x")]
+
+    with collecting(m):
+        assert asyncio.run(run()) == ["hi"]
+    assert (m.tokens_in, m.tokens_out) == (9, 4)
+    assert "connect" in m.phases
+
+
+def test_usage_adds_up_over_the_requests_of_a_generation():
+    body = {"response": "hi", "prompt_eval_count": 9, "eval_count": 4}
+    prov = OllamaProvider(model="stub")
+    prov._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+    )
+    m = GenerationMetrics()
+
+    # Ollama variants are n separate requests.
+    with collecting(m):
+        result = asyncio.run(prov.generate_variants("x", n=3))
+    assert len(result.variants) == 3
+    assert (m.tokens_in, m.tokens_out) == (27, 12)
+
+
+def test_openai_stream_requests_and_reads_usage():
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        chunk = {
+            "id": "c",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "delta": {"content": "hey"}, "finish_reason": None}],
+        }
+        usage = {
+            **chunk,
+            "choices": [],
+            "usage": {"prompt_tokens": 11, "completion_tokens": 2, "total_tokens": 13},
+        }
+        body = f"data: {json.dumps(chunk)}\n\ndata: {json.dumps(usage)}\n\ndata: [DONE]\n\n"
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    prov = OpenAIProvider(api_key="sk-test")
+    prov.client = prov.client.with_options(
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    m = GenerationMetrics()
+
+    async def run() -> list[str]:
+        return [c async for c in prov.stream("x")]
+
+    with collecting(m):
+        assert asyncio.run(run()) == ["hey"]
+    assert seen[0]["stream_options"] == {"include_usage": True}
+    assert (m.tokens_in, m.tokens_out) == (11, 2)
+
+
+def test_ollama_reports_prefix_cache_reuse_and_keep_alive():
+    seen: list[dict] = []
+    final = {
+        "response": "done",
+        "done": True,
+        "context": list(range(110)),  # 100 prompt tokens + 10 output tokens
+        "prompt_eval_count": 20,
+        "prompt_eval_duration": 40_000_000,  # 2 ms per evaluated token
+        "load_duration": 5_000_000,
+        "eval_count": 10,
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        return httpx.Response(200, json=final)
+
+    prov = OllamaProvider(model="stub", keep_alive="30m")
+    prov._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    m = GenerationMetrics()
+    with collecting(m):
+        result = asyncio.run(prov.generate("row", system_prompt="shared instructions"))
+
+    assert seen[0]["keep_alive"] == "30m"
+    assert seen[0]["system"] == "shared instructions"
+    assert (m.tokens_in, m.tokens_cached, m.tokens_out) == (100, 80, 10)
+    assert result.tokens_used == 110
+    assert m.to_dict()["prefix_cache_hit_rate"] == 0.8
+    assert m.prefix_saved_ms == pytest.approx(160.0)
+    assert m.phases["model_load"] == pytest.approx(5.0)
+
+
+def test_openai_sends_prompt_cache_key_and_reads_cached_tokens():
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            json={
+                "id": "c",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "ok"},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 2048,
+                    "completion_tokens": 5,
+                    "total_tokens": 2053,
+                    "prompt_tokens_details": {"cached_tokens": 1024},
+                },
+            },
+        )
+
+    prov = OpenAIProvider(api_key="sk-test")
+    prov.client = prov.client.with_options(
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    m = GenerationMetrics()
+    with collecting(m):
+        for row in ("row one", "row two"):
+            asyncio.run(prov.generate(row, system_prompt="shared instructions"))
+
+    assert [msg["role"] for msg in seen[0]["messages"]] == ["system", "user"]
+    assert seen[0]["prompt_cache_key"] == seen[1]["prompt_cache_key"]
+    assert (m.tokens_in, m.tokens_cached) == (4096, 2048)  # both requests
+    assert m.prefix_cache_hit_rate == 0.5
+
+
+def test_textfile_accumulates_across_runs(tmp_path: Path):
+    path = tmp_path / "contentforge.prom"
+    for ttft in (0.05, 3.0):
+        m = GenerationMetrics(provider="openai", model='gpt"4', streamed=True)
+        m.ttft_ms, m.total_ms, m.tokens_in, m.tokens_out = ttft * 1000, 4000.0, 10, 40
+        metrics.update_textfile(m, path)
+
+    text = path.read_text()
+    assert (
+        'contentforge_generations_total{provider="openai",model="gpt\\"4",source="live"} 2' in text
+    )
+    assert 'direction="out"} 80' in text
+    assert 'contentforge_ttft_seconds_bucket{provider="openai",model="gpt\\"4",le="0.1"} 1' in text
+    assert 'contentforge_ttft_seconds_count{provider="openai",model="gpt\\"4"} 2' in text
+    assert not path.with_name(path.name + ".tmp").exists()
+
+
+def test_textfile_totals_survive_concurrent_writers(tmp_path: Path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = tmp_path / "contentforge.prom"
+
+    def write(_: int) -> None:
+        metrics.update_textfile(GenerationMetrics(provider="ollama", model="m"), path)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(write, range(80)))
+
+    assert 'generations_total{provider="ollama",model="m",source="live"} 80' in path.read_text()
+
+
+def test_generate_metrics_flag_and_log(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setattr(
+        "contentforge.commands.generate.get_provider", lambda *a, **kw: _SlowStream()
+    )
+    monkeypatch.setenv("CONTENTFORGE_METRICS_TEXTFILE", str(tmp_path / "cf.prom"))
+
+    result = runner.invoke(
+        app, ["generate", "blog", "--topic", "AI", "--format", "plain", "--metrics"]
+    )
+
+    assert result.exit_code == 0, result.output
+    logged = [json.loads(line) for line in metrics.metrics_log_path().read_text().splitlines()]
+    assert len(logged) == 1
+    entry = logged[0]
+    assert entry["template"] == "blog"
+    assert entry["streamed"] is True
+    assert entry["chunks"] == 3
+    assert (entry["tokens_in"], entry["tokens_out"]) == (12, 30)
+    assert {"config_load", "prompt_build", "provider_init", "connect"} <= set(entry["phases_ms"])
+    assert entry["ttft_ms"] >= 10
+    assert '"tokens_per_second"' in result.output
+    assert (tmp_path / "cf.prom").exists()
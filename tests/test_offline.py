@@ -0,0 +1,241 @@
+"""Test offline generation through a local stand-in for the OpenAI Batch API."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+from email.parser import BytesParser
+from pathlib import Path
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from contentforge import offline
+from contentforge.batch import BatchStats
+from contentforge.cli import app
+from contentforge.offline import OfflineJob
+from contentforge.providers.openai_provider import OpenAIProvider
+
+runner = CliRunner()
+
+
+class FakeBatchAPI:
+    """Files and batches endpoints. A batch completes on its second status check."""
+
+    def __init__(self, fail_ids: frozenset[str] = frozenset()) -> None:
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, dict] = {}
+        self.checks: dict[str, int] = {}
+        self.fail_ids = fail_ids
+        self._ids = itertools.count(1)
+
+    def _upload(self, request: httpx.Request) -> dict:
+        head = f"Content-Type: {request.headers['content-type']}\r\n\r\n".encode()
+        message = BytesParser().parsebytes(head + request.content)
+        part = next(
+            p
+            for p in message.get_payload()
+            if p.get_param("name", header="content-disposition") == "file"
+        )
+        file_id = f"file-{next(self._ids)}"
+        self.files[file_id] = part.get_payload(decode=True)
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": 0,
+            "created_at": 0,
+            "filename": "in.jsonl",
+            "purpose": "batch",
+            "status": "processed",
+        }
+
+    def _batch(self, batch: dict) -> dict:
+        return {
+            "object": "batch",
+            "endpoint": offline.ENDPOINT,
+            "completion_window": "24h",
+            "created_at": 0,
+            **batch,
+        }
+
+    def _complete(self, batch: dict) -> None:
+        out, err = [], []
+        for line in self.files[batch["input_file_id"]].decode().splitlines():
+            req = json.loads(line)
+            if req["custom_id"] in self.fail_ids:
+                err.append(
+                    {
+                        "custom_id": req["custom_id"],
+                        "response": {
+                            "status_code": 400,
+                            "body": {"error": {"message": "bad request"}},
+                        },
+                        "error": None,
+                    }
+                )
+                continue
+            prompt = req["body"]["messages"][-1]["content"]
+            body = {
+                "model": req["body"]["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": f"re: {prompt}"},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 10,
+                    "completion_tokens": 5,
+                    "total_tokens": 15,
+                    "prompt_tokens_details": {"cached_tokens": 4},
+                },
+            }
+            out.append(
+                {
+                    "custom_id": req["custom_id"],
+                    "response": {"status_code": 200, "body": body},
+                    "error": None,
+                }
+            )
+        for key, lines in (("output_file_id", out), ("error_file_id", err)):
+            if lines:
+                file_id = f"file-{next(self._ids)}"
+                self.files[file_id] = "".join(json.dumps(x) + "\n" for x in lines).encode()
+                batch[key] = file_id
+        batch["status"] = "completed"
+        batch["request_counts"] = {
+            "total": len(out) + len(err),
+            "completed": len(out),
+            "failed": len(err),
+        }
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/v1")
+        if path == "/files" and request.method == "POST":
+            return httpx.Response(200, json=self._upload(request))
+        if path.startswith("/files/") and path.endswith("/content"):
+            return httpx.Response(200, content=self.files[path.split("/")[2]])
+        if path == "/batches" and request.method == "POST":
+            body = json.loads(request.content)
+            batch_id = f"batch_{next(self._ids)}"
+            self.batches[batch_id] = {
+                "id": batch_id,
+                "input_file_id": body["input_file_id"],
+                "status": "validating",
+            }
+            return httpx.Response(200, json=self._batch(self.batches[batch_id]))
+        if path.startswith("/batches/"):
+            batch = self.batches[path.split("/")[2]]
+            if path.endswith("/cancel"):
+                batch["status"] = "cancelling"
+            elif batch["status"] not in offline.TERMINAL:
+                self.checks[batch["id"]] = self.checks.get(batch["id"], 0) + 1
+                if self.checks[batch["id"]] >= 2:
+                    self._complete(batch)
+                else:
+                    batch["status"] = "in_progress"
+            return httpx.Response(200, json=self._batch(batch))
+        return httpx.Response(404, json={"error": {"message": f"no route {path}"}})
+
+
+def _provider(api: FakeBatchAPI) -> OpenAIProvider:
+    prov = OpenAIProvider(api_key="sk-test")
+    prov.client = prov.client.with_options(
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(api)), max_retries=0
+    )
+    return prov
+
+
+def _rows(n: int) -> list[dict[str, str]]:
+    return [{"id": f"sku-{i}", "name": f"Widget {i}", "features": "light"} for i in range(n)]
+
+
+def test_prepare_splits_parts_and_records_render_errors():
+    rows = [*_rows(5), {"id": "bad", "template": "nope"}]
+    job = offline.prepare_job(
+        rows, "jobs.jsonl", "gpt-4o-mini", template_id="product", max_requests=2
+    )
+
+    assert [p.requests for p in job.parts] == [2, 2, 1]
+    assert (job.rows, job.render_errors) == (6, 1)
+    first = json.loads((job.path / "part-0001.jsonl").read_text().splitlines()[0])
+    assert first["custom_id"] == "0"
+    assert first["url"] == "/v1/chat/completions"
+    assert [m["role"] for m in first["body"]["messages"]] == ["system", "user"]
+    assert "prompt_cache_key" in first["body"]
+    assert OfflineJob.load(job.id).parts == job.parts
+
+
+def test_prepare_leaves_nothing_behind_when_reading_rows_fails():
+    def rows():
+        yield from _rows(3)
+        raise ValueError("line 4: invalid JSON")
+
+    with pytest.raises(ValueError):
+        offline.prepare_job(rows(), "jobs.jsonl", "gpt-4o-mini", template_id="product")
+    assert list(offline.jobs_dir().iterdir()) == []
+    assert offline.list_jobs() == []
+
+
+def test_offline_job_round_trip_and_resume():
+    api = FakeBatchAPI(fail_ids=frozenset({"3"}))
+    job = offline.prepare_job(
+        _rows(5), "jobs.jsonl", "gpt-4o-mini", template_id="product", max_requests=3
+    )
+    records: list[dict] = []
+
+    async def run_until_submitted() -> None:
+        async with _provider(api) as prov:
+            await offline.submit(prov.client, job)
+            await offline.refresh(prov.client, job)
+
+    asyncio.run(run_until_submitted())
+    assert OfflineJob.load(job.id).status == "running"
+
+    # A new process picks the job up from disk and does not submit it again.
+    resumed = OfflineJob.load(job.id)
+
+    async def resume() -> BatchStats:
+        async with _provider(api) as prov:
+            await offline.submit(prov.client, resumed)
+            await offline.wait(prov.client, resumed, poll_interval=0.01)
+            return await offline.collect(prov.client, resumed, records.append)
+
+    stats = asyncio.run(resume())
+    assert len(api.batches) == 2
+    assert (stats.succeeded, stats.failed, stats.tokens_used) == (4, 1, 60)
+    assert stats.prefix_cache_hit_rate == pytest.approx(0.4)
+    by_index = {r["index"]: r for r in records}
+    assert sorted(by_index) == [0, 1, 2, 3, 4]
+    assert by_index[0]["id"] == "sku-0"
+    assert by_index[0]["content"].startswith("re: ")
+    assert by_index[3]["error"] == "bad request"
+    assert OfflineJob.load(job.id).status == "collected"
+
+
+def test_generate_batch_offline_cli(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    api = FakeBatchAPI()
+    monkeypatch.setattr("contentforge.commands.jobs_cmd._openai", lambda cfg, model: _provider(api))
+    monkeypatch.setenv("CONTENTFORGE_OFFLINE_POLL_INTERVAL", "0.01")
+    jobs = tmp_path / "jobs.jsonl"
+    jobs.write_text("".join(json.dumps(r) + "\n" for r in _rows(3)))
+    out = tmp_path / "results.jsonl"
+
+    args = ["generate", "batch", str(jobs), "-t", "product", "--offline", "-o", str(out)]
+    result = runner.invoke(app, [*args, "--no-wait"])
+    assert result.exit_code == 0, result.output
+    assert not out.exists()
+    (job,) = offline.list_jobs()
+    assert job.status == "running"
+
+    result = runner.invoke(app, ["jobs", "resume", job.id])
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+    assert sorted(r["id"] for r in records) == ["sku-0", "sku-1", "sku-2"]
+    assert all(r["provider"] == "openai" for r in records)
+
+    result = runner.invoke(app, [*args, "--provider", "ollama"])
+    assert result.exit_code == 1
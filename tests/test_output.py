@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from contentforge import output
 
 
@@ -43,3 +45,102 @@ def test_copy_to_clipboard_graceful_fail():
     # May or may not work depending on environment, but should not raise
     result = output.copy_to_clipboard("test content")
     assert isinstance(result, bool)
+
+
+def test_markdown_stream_buffer_splits_blocks():
+    buf = output.MarkdownStreamBuffer()
+    assert buf.feed("# Title\n\nFirst para") == ["# Title"]
+    assert buf.tail == "First para"
+    assert buf.feed("graph.\n\nNext") == ["First paragraph."]
+    assert buf.tail == "Next"
+
+
+def test_markdown_stream_buffer_keeps_fenced_code_open():
+    buf = output.MarkdownStreamBuffer()
+    assert buf.feed("```py\nx = 1\n\ny = 2\n") == []
+    assert buf.feed("```\n\nafter") == ["```py\nx = 1\n\ny = 2\n```"]
+    assert buf.tail == "after"
+
+
+@pytest.mark.parametrize(
+    "doc",
+    [
+        "# Title\n\nIntro.\n\n## Section\n\n- a\n- b\n\n```py\nx = 1\n\ny = 2\n```\n\nEnd.",
+        # Loose list: blank lines between the items.
+        "Intro.\n\n- one\n\n- two\n\n- three\n\nAfter.",
+        # Continuation paragraph inside an ordered item.
+        "1. Step one\n\n    Detail for step one.\n\n2. Step two\n\n---\n\nDone.",
+        # Nested lists, loose at both levels, then a heading.
+        "- outer\n\n    - inner a\n\n    - inner b\n\n- outer 2\n\n## Next\n\nText.",
+    ],
+)
+def test_run_stream_markdown_matches_full_render(monkeypatch, doc):
+    import io
+
+    from rich.console import Console
+    from rich.markdown import Markdown
+
+    streamed = io.StringIO()
+    monkeypatch.setattr(output, "console", Console(file=streamed, width=60))
+
+    async def chunks():
+        for i in range(0, len(doc), 4):
+            yield doc[i : i + 4]
+
+    assert output.run_stream_markdown(chunks()) == doc
+
+    full = Console(file=io.StringIO(), width=60)
+    with full.capture() as cap:
+        full.print(Markdown(doc))
+    assert [line.rstrip() for line in streamed.getvalue().splitlines()] == [
+        line.rstrip() for line in cap.get().splitlines()
+    ]
+
+
+def test_file_sink_flushes_and_renames_on_success(tmp_path: Path):
+    out_file = tmp_path / "post.md"
+    out_file.write_text("old", encoding="utf-8")
+
+    with output.FileSink(out_file, flush_bytes=10, flush_interval=60) as sink:
+        sink.write("12345")
+        assert sink.flushes == 0
+        sink.write("67890")
+        assert sink.flushes == 1
+        assert sink.partial_path.read_text(encoding="utf-8") == "1234567890"
+        assert out_file.read_text(encoding="utf-8") == "old"
+        sink.write("tail")
+
+    assert out_file.read_text(encoding="utf-8") == "1234567890tail"
+    assert not sink.partial_path.exists()
+
+
+def test_streamed_output_kept_as_partial_on_failure(tmp_path: Path, monkeypatch):
+    from typer.testing import CliRunner
+
+    from contentforge.cli import app
+
+    class _Dies:
+        name, model = "fake", "fake-1"
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return None
+
+        async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+            yield "# Title\n\n"
+            yield "First paragraph."
+            raise ConnectionError("connection reset")
+
+    monkeypatch.setattr("contentforge.commands.generate.get_provider", lambda *a, **kw: _Dies())
+    out_file = tmp_path / "post.md"
+    result = CliRunner().invoke(
+        app,
+        ["generate", "blog", "--topic", "AI", "--stream", "--format", "plain", "-o", str(out_file)],
+    )
+
+    assert isinstance(result.exception, ConnectionError)
+    assert not out_file.exists()
+    partial = tmp_path / "post.md.partial"
+    assert partial.read_text(encoding="utf-8") == "# Title\n\nFirst paragraph."
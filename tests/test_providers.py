@@ -104,3 +104,294 @@ def test_list_providers():
     assert "openai" in names
     assert "gemini" in names
     assert "ollama" in names
+
+
+def test_ollama_provider_reuses_pooled_client():
+    import asyncio
+
+    import httpx
+
+    from contentforge.providers.ollama_provider import OllamaProvider
+
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"response": "hi", "eval_count": 2, "prompt_eval_count": 1})
+
+    async def run() -> OllamaProvider:
+        async with OllamaProvider(model="mistral") as p:
+            client = p._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            first = await p.generate("one")
+            await p.generate("two")
+            assert p._http() is client
+            assert first.content == "hi"
+            assert first.tokens_used == 3
+        return p
+
+    p = asyncio.run(run())
+    assert calls == ["/api/generate", "/api/generate"]
+    assert p._client is None
+
+
+def test_pool_settings_from_config():
+    from contentforge.config import load_config
+    from contentforge.providers.http import PoolSettings
+
+    cfg = load_config()
+    cfg.http_max_connections = 7
+    pool = PoolSettings.from_config(cfg)
+    assert pool.max_connections == 7
+    assert pool.limits().max_connections == 7
+
+
+class _ProbeProvider(BaseProvider):
+    models: ClassVar[list[str]] = ["m"]
+
+    def __init__(self, name: str, delay: float, fail: bool = False) -> None:
+        self.name = name
+        self.model = "m"
+        self.delay = delay
+        self.fail = fail
+
+    async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        raise NotImplementedError
+
+    async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        yield ""
+
+    async def probe(self, timeout=5.0):
+        import asyncio
+
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("refused")
+
+    def is_available(self):
+        return True
+
+
+def _patch_probes(monkeypatch: pytest.MonkeyPatch, delays: dict[str, float], fail=()):
+    probed = []
+
+    def create(cfg, name, model):
+        probed.append(name)
+        return _ProbeProvider(name, delays[name], fail=name in fail)
+
+    monkeypatch.setattr("contentforge.providers._create_provider", create)
+    monkeypatch.setenv("CONTENTFORGE_OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("CONTENTFORGE_GEMINI_API_KEY", "g-test")
+    return probed
+
+
+def test_health_checks_run_concurrently_with_deadlines(monkeypatch: pytest.MonkeyPatch):
+    import time
+
+    from contentforge.providers.health import get_health
+
+    _patch_probes(monkeypatch, {"openai": 0.2, "gemini": 5.0, "ollama": 0.2}, fail={"ollama"})
+
+    start = time.perf_counter()
+    results = {h.name: h for h in get_health(refresh=True, timeout=0.4)}
+    assert time.perf_counter() - start < 1.5
+
+    assert results["openai"].available
+    assert results["openai"].latency_ms >= 200
+    assert not results["gemini"].available
+    assert "timed out" in results["gemini"].error
+    assert results["ollama"].status == "unreachable"
+    assert results["ollama"].error == "refused"
+
+
+def test_health_results_cached_on_disk(monkeypatch: pytest.MonkeyPatch):
+    from contentforge.providers.health import get_health, health_cache_path
+
+    probed = _patch_probes(monkeypatch, {"openai": 0, "gemini": 0, "ollama": 0})
+
+    first = get_health()
+    second = get_health()
+
+    assert len(probed) == 3
+    assert health_cache_path().exists()
+    assert all(h.cached for h in second)
+    assert [h.available for h in first] == [h.available for h in second]
+
+    get_health(refresh=True)
+    assert len(probed) == 6
+
+
+def test_health_not_configured_skips_probe(monkeypatch: pytest.MonkeyPatch):
+    from contentforge.providers.health import get_health
+
+    probed = _patch_probes(monkeypatch, {"openai": 0, "gemini": 0, "ollama": 0})
+    monkeypatch.delenv("CONTENTFORGE_GEMINI_API_KEY")
+
+    results = {h.name: h for h in get_health(refresh=True)}
+    assert results["gemini"].status == "not configured"
+    assert "gemini" not in probed
+
+
+def test_variants_fall_back_to_concurrent_requests(monkeypatch: pytest.MonkeyPatch):
+    import asyncio
+    import json
+
+    from typer.testing import CliRunner
+
+    from contentforge.cli import app
+
+    calls: list[str] = []
+
+    class Echo(BaseProvider):
+        name = "fake"
+        models: ClassVar[list[str]] = ["fake-1"]
+        model = "fake-1"
+
+        async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+            calls.append(prompt)
+            await asyncio.sleep(0.01)
+            return GenerationResult(
+                content=f"take {len(calls)}", provider="fake", model="fake-1", tokens_used=10
+            )
+
+        async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+            yield ""
+
+        def is_available(self):
+            return True
+
+    monkeypatch.setattr("contentforge.commands.generate.get_provider", lambda *a, **kw: Echo())
+    result = CliRunner().invoke(
+        app,
+        ["generate", "blog", "--topic", "AI", "--variants", "3", "--format", "json"],
+    )
+
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.stdout[result.stdout.index("{") :])
+    assert [v["index"] for v in data["variants"]] == [0, 1, 2]
+    assert {v["content"] for v in data["variants"]} == {"take 3"}
+    assert (data["requests"], data["tokens_used"]) == (3, 30)
+    assert len(calls) == 3
+
+
+def test_openai_variants_use_one_request():
+    import asyncio
+    import json
+
+    import httpx
+
+    from contentforge.metrics import GenerationMetrics, collecting
+    from contentforge.providers.openai_provider import OpenAIProvider
+    from contentforge.providers.ratelimit import RateLimitedProvider
+
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        seen.append(body)
+        choices = [
+            {
+                "index": i,
+                "message": {"role": "assistant", "content": f"variant {i}"},
+                "finish_reason": "stop",
+            }
+            for i in reversed(range(body["n"]))
+        ]
+        usage = {"prompt_tokens": 100, "completion_tokens": 30, "total_tokens": 130}
+        return httpx.Response(
+            200,
+            json={
+                "id": "c",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": choices,
+                "usage": usage,
+            },
+        )
+
+    prov = OpenAIProvider(api_key="sk-test")
+    prov.client = prov.client.with_options(
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    m = GenerationMetrics()
+    with collecting(m):
+        multi = asyncio.run(RateLimitedProvider(prov).generate_variants("Write", n=3))
+
+    assert len(seen) == 1
+    assert seen[0]["n"] == 3
+    assert multi.contents == ["variant 0", "variant 1", "variant 2"]
+    assert (multi.requests, multi.tokens_used) == (1, 130)
+    assert m.tokens_in == 100
+
+
+def test_ollama_keep_alive_per_model():
+    from contentforge.providers.ollama_provider import keep_alive_for
+
+    per_model = "llama3.2=1h, mistral:7b=-1, mistral=5m"
+    assert keep_alive_for("llama3.2", "10m", per_model) == "1h"
+    assert keep_alive_for("llama3.2:latest", "10m", per_model) == "1h"
+    assert keep_alive_for("mistral:7b", "10m", per_model) == "-1"
+    assert keep_alive_for("mistral:latest", "10m", per_model) == "5m"
+    assert keep_alive_for("phi3", "10m", per_model) == "10m"
+
+
+def test_ollama_preload_and_warm_up(monkeypatch: pytest.MonkeyPatch):
+    import asyncio
+
+    import httpx
+
+    from contentforge.providers import warm_up
+    from contentforge.providers.ollama_provider import OllamaProvider
+
+    loads: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        import json
+
+        loads.append(json.loads(request.content))
+        return httpx.Response(200, json={"done": True, "load_duration": 1_500_000_000})
+
+    async def run() -> float:
+        async with OllamaProvider(model="mistral", keep_alive="-1") as p:
+            p._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return await p.preload()
+
+    assert asyncio.run(run()) == 1.5
+    assert loads == [{"model": "mistral", "keep_alive": -1.0}]
+
+    def fake_post(url, json, timeout):
+        loads.append(json)
+
+    monkeypatch.setattr(httpx, "post", fake_post)
+    monkeypatch.setenv("CONTENTFORGE_OLLAMA_MODEL_KEEP_ALIVE", "llama3.2=2h")
+    assert warm_up("openai") is None
+    thread = warm_up("ollama")
+    assert thread is not None
+    thread.join(1)
+    assert loads[-1] == {"model": "llama3.2", "keep_alive": "2h"}
+
+
+def test_gemini_handles_cached_per_prompt_with_own_credentials():
+    import asyncio
+
+    from contentforge.providers.gemini_provider import GeminiProvider
+
+    a = GeminiProvider(api_key="key-a", max_models=2)
+    b = GeminiProvider(api_key="key-b")
+
+    async def run() -> None:
+        handle = a._get_model("You write blogs.")
+        assert a._get_model("You write blogs.") is handle
+        assert handle._async_client.transport._credentials.token == "key-a"
+        other = b._get_model("You write blogs.")
+        assert other._async_client.transport._credentials.token == "key-b"
+
+        a._get_model("You write ads.")
+        a._get_model("You write emails.")
+        assert [p for _, p in a._handles] == ["You write ads.", "You write emails."]
+        await a.aclose()
+        await b.aclose()
+
+    asyncio.run(run())
+    assert not a._handles
+    assert a._client is None
@@ -0,0 +1,127 @@
+"""Test the rate-limit scheduler and retries."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from contentforge.providers import get_provider
+from contentforge.providers.ollama_provider import OllamaProvider
+from contentforge.providers.ratelimit import (
+    RateLimitedProvider,
+    TokenBucket,
+    is_retryable,
+    retry_after_seconds,
+)
+
+
+def _stub_ollama(
+    statuses: list[int], retry_after: str | None = None
+) -> tuple[OllamaProvider, list]:
+    """Ollama provider backed by a mock transport answering with ``statuses`` in turn."""
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses[min(len(calls), len(statuses) - 1)]
+        calls.append(status)
+        if status != 200:
+            headers = {"retry-after": retry_after} if retry_after is not None else {}
+            return httpx.Response(status, headers=headers, json={"error": "busy"})
+        lines = '{"response": "ok", "done": false}\n{"done": true}\n'
+        if json.loads(request.content).get("stream"):
+            return httpx.Response(200, text=lines)
+        return httpx.Response(200, json={"response": "ok", "eval_count": 1})
+
+    prov = OllamaProvider(model="stub")
+    prov._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return prov, calls
+
+
+def test_token_bucket_paces_to_rate():
+    async def run() -> float:
+        bucket = TokenBucket(per_minute=6000)  # 100/s, burst of 100
+        start = time.perf_counter()
+        for _ in range(150):
+            await bucket.acquire()
+        return time.perf_counter() - start
+
+    assert asyncio.run(run()) >= 0.45
+
+
+def test_token_bucket_pause():
+    async def run() -> float:
+        bucket = TokenBucket(per_minute=6000)
+        bucket.pause(0.2)
+        start = time.perf_counter()
+        await bucket.acquire()
+        return time.perf_counter() - start
+
+    assert asyncio.run(run()) >= 0.19
+
+
+def test_retries_429_then_succeeds():
+    inner, calls = _stub_ollama([429, 503, 200], retry_after="0")
+    prov = RateLimitedProvider(inner, max_retries=3, base_backoff=0.001)
+
+    result = asyncio.run(prov.generate("hi"))
+
+    assert result.content == "ok"
+    assert calls == [429, 503, 200]
+    assert prov.retries == 2
+
+
+def test_gives_up_after_max_retries():
+    inner, calls = _stub_ollama([429])
+    prov = RateLimitedProvider(inner, max_retries=2, base_backoff=0.001)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(prov.generate("hi"))
+    assert len(calls) == 3
+
+
+def test_does_not_retry_client_errors():
+    inner, calls = _stub_ollama([400])
+    prov = RateLimitedProvider(inner, max_retries=3, base_backoff=0.001)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(prov.generate("hi"))
+    assert calls == [400]
+
+
+def test_stream_retries_before_first_chunk():
+    inner, calls = _stub_ollama([429, 200], retry_after="0")
+    prov = RateLimitedProvider(inner, max_retries=2, base_backoff=0.001)
+
+    async def collect() -> list[str]:
+        return [c async for c in prov.stream("hi")]
+
+    assert asyncio.run(collect()) == ["ok"]
+    assert calls == [429, 200]
+
+
+def test_retry_after_parsing():
+    def err(value: str) -> httpx.HTTPStatusError:
+        request = httpx.Request("POST", "http://x")
+        response = httpx.Response(429, headers={"retry-after": value}, request=request)
+        return httpx.HTTPStatusError("busy", request=request, response=response)
+
+    assert retry_after_seconds(err("3")) == 3.0
+    assert 0 < retry_after_seconds(err(formatdate(time.time() + 30, usegmt=True))) <= 30
+    assert retry_after_seconds(ValueError("x")) is None
+    assert is_retryable(err("1"))
+    assert not is_retryable(ValueError("x"))
+
+
+def test_get_provider_applies_configured_limits(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("CONTENTFORGE_OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("CONTENTFORGE_OPENAI_RPM", "120")
+    prov = get_provider("openai", cache=False)
+    assert isinstance(prov, RateLimitedProvider)
+    assert prov.requests is not None
+    assert prov.requests.rate == 2.0
+    assert prov.tokens is None
@@ -0,0 +1,176 @@
+"""Test the local HTTP API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import ClassVar
+
+import httpx
+import pytest
+
+from contentforge.config import Config
+from contentforge.providers import BaseProvider, GenerationResult
+from contentforge.server import ContentServer
+
+
+class _EchoProvider(BaseProvider):
+    models: ClassVar[list[str]] = ["m"]
+
+    def __init__(self, name: str = "openai", model: str | None = None) -> None:
+        self.name = name
+        self.model = model or "m"
+        self.closed = False
+        self.prompts: list[str] = []
+
+    async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.prompts.append(prompt)
+        return GenerationResult(
+            content="hello", provider=self.name, model=self.model, tokens_used=3
+        )
+
+    async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        self.prompts.append(prompt)
+        for chunk in ("hel", "lo"):
+            yield chunk
+
+    def is_available(self):
+        return True
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture()
+def created(monkeypatch: pytest.MonkeyPatch) -> list[_EchoProvider]:
+    providers: list[_EchoProvider] = []
+
+    def fake_get_provider(name=None, model=None, cfg=None, **kwargs):
+        prov = _EchoProvider(name or "openai", model)
+        providers.append(prov)
+        return prov
+
+    monkeypatch.setattr("contentforge.server.get_provider", fake_get_provider)
+    return providers
+
+
+def _run(scenario):
+    async def main():
+        async with (
+            ContentServer(Config(), port=0) as server,
+            httpx.AsyncClient(base_url=server.base_url) as client,
+        ):
+            return await scenario(client)
+
+    return asyncio.run(main())
+
+
+def test_health_and_templates(created):
+    async def scenario(client: httpx.AsyncClient):
+        health = await client.get("/health")
+        listing = await client.get("/v1/templates")
+        one = await client.get("/v1/templates/blog")
+        missing = await client.get("/v1/templates/nope")
+        return health, listing, one, missing
+
+    health, listing, one, missing = _run(scenario)
+    assert health.json() == {"status": "ok"}
+    assert "blog" in {t["id"] for t in listing.json()}
+    assert {f["name"] for f in one.json()["fields"]} >= {"topic", "tone"}
+    assert missing.status_code == 404
+
+
+def test_generate_reuses_warm_provider(created):
+    async def scenario(client: httpx.AsyncClient):
+        body = {"variables": {"topic": "AI"}}
+        return [await client.post("/v1/generate/blog", json=body) for _ in range(3)]
+
+    responses = _run(scenario)
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert responses[0].json()["content"] == "hello"
+    assert responses[0].json()["tokens_used"] == 3
+    assert len(created) == 1  # warmed at start-up, reused by every request
+    assert len(created[0].prompts) == 3
+    assert "AI" in created[0].prompts[0]
+    assert created[0].closed
+
+
+def test_generate_streams_sse(created):
+    async def scenario(client: httpx.AsyncClient):
+        body = {"variables": {"topic": "AI"}, "stream": True}
+        async with client.stream("POST", "/v1/generate/blog", json=body) as resp:
+            return resp.headers["content-type"], [line async for line in resp.aiter_lines()]
+
+    content_type, lines = _run(scenario)
+    assert content_type == "text/event-stream"
+    data = [json.loads(line[6:]) for line in lines if line.startswith("data: ")]
+    assert [d["text"] for d in data[:-1]] == ["hel", "lo"]
+    assert "event: done" in lines
+    assert data[-1]["template"] == "blog"
+
+
+def test_generate_per_request_provider(created):
+    async def scenario(client: httpx.AsyncClient):
+        body = {"variables": {"topic": "AI"}, "provider": "ollama", "model": "qwen"}
+        return await client.post("/v1/generate/blog", json=body)
+
+    resp = _run(scenario)
+    assert resp.json()["provider"] == "ollama"
+    assert resp.json()["model"] == "qwen"
+
+
+def test_generate_errors(created):
+    async def scenario(client: httpx.AsyncClient):
+        return (
+            await client.post("/v1/generate/blog", json={"variables": {}}),
+            await client.post("/v1/generate/blog", content=b"{not json"),
+            await client.get("/v1/generate/blog"),
+            await client.post("/v1/generate/nope", json={}),
+            await client.get("/nowhere"),
+            await client.post("/v1/generate/blog", json={**body, "stream": "false"}),
+        )
+
+    body = {"variables": {"topic": "AI"}}
+    missing_field, bad_json, wrong_method, unknown, no_route, bad_stream = _run(scenario)
+    assert missing_field.status_code == 400
+    assert "topic" in missing_field.json()["error"]
+    assert bad_json.status_code == 400
+    assert wrong_method.status_code == 405
+    assert unknown.status_code == 404
+    assert no_route.status_code == 404
+    assert bad_stream.status_code == 400
+    assert "stream" in bad_stream.json()["error"]
+
+
+def test_least_recently_used_providers_are_closed(created):
+    async def main():
+        server = ContentServer(Config(), port=0, max_providers=2)
+        async with server, httpx.AsyncClient(base_url=server.base_url) as client:
+            for model in ("a", "b", "a", "c", "d"):
+                body = {"variables": {"topic": "AI"}, "provider": "ollama", "model": model}
+                assert (await client.post("/v1/generate/blog", json=body)).status_code == 200
+            return [(p.model, p.closed) for p in created]
+
+    # Two are kept: the start-up default, then "b", then "a" were least recently used.
+    assert asyncio.run(main()) == [
+        ("m", True),
+        ("a", True),
+        ("b", True),
+        ("c", False),
+        ("d", False),
+    ]
+
+
+def test_evicted_provider_closes_after_its_last_request(created):
+    async def main():
+        server = ContentServer(Config(), max_providers=1)
+        busy = server.provider("ollama", "a")
+        server._in_use[busy] = 1  # a request is still streaming from it
+        server.provider("ollama", "b")
+        server._in_use[server.provider("ollama", "b")] = 1
+        await server._release(server.provider("ollama", "b"))
+        assert not busy.closed
+        await server._release(busy)
+        assert busy.closed
+
+    asyncio.run(main())
@@ -0,0 +1,184 @@
+"""Test structured (JSON) output and the incremental JSON parser."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from typing import ClassVar
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from contentforge import history, structured
+from contentforge.cli import app
+from contentforge.providers.base import BaseProvider, GenerationResult
+from contentforge.structured import JsonStreamParser, iter_values, parse, to_markdown
+from contentforge.templates import get_template
+
+DOC = {
+    "meta_title": 'Tea "time" é \U0001f375',
+    "score": -1.5e3,
+    "ok": True,
+    "missing": None,
+    "keywords": ["green tea", "oolong"],
+    "variations": [{"headlines": ["Sip", "Steep"], "call_to_action": "Buy"}, {"headlines": []}],
+    "empty": {},
+}
+
+
+def test_parser_reports_values_as_they_close_across_any_chunking():
+    rng = random.Random(7)
+    for ensure_ascii in (True, False):
+        text = "```json\n" + json.dumps(DOC, ensure_ascii=ensure_ascii, indent=1) + "\n```"
+        for _ in range(50):
+            parser = JsonStreamParser()
+            events, i = [], 0
+            while i < len(text):
+                size = rng.randint(1, 8)
+                events += parser.feed(text[i : i + size])
+                i += size
+            assert parser.close() == DOC
+            assert events == list(iter_values(DOC))
+
+    # The first field is reported before the rest of the document has arrived.
+    parser = JsonStreamParser()
+    assert parser.feed('{"meta_title": "Tea", "meta_desc') == [(("meta_title",), "Tea")]
+    assert not parser.done
+
+
+@pytest.mark.parametrize(
+    "text", ['{"a": 1,}', '{"a" 1}', "[1 2]", '{"a": tru}', '{"a": [1}', '{"a": "b"']
+)
+def test_parser_rejects_malformed_or_incomplete_json(text):
+    with pytest.raises(ValueError):
+        parse(text)
+
+
+def test_markdown_rendering():
+    text = to_markdown(parse(json.dumps({"og_title": "T", "variations": [{"headlines": ["a"]}]})))
+    assert text == "**OG title:** T\n\n### Variation 1\n\n**Headlines:**\n\n- a"
+
+
+def test_providers_request_json():
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        return httpx.Response(200, json={"response": "{}", "eval_count": 1})
+
+    from contentforge.providers.ollama_provider import OllamaProvider
+    from contentforge.providers.openai_provider import _response_format
+
+    schema = get_template("seo").output_schema
+
+    async def run() -> None:
+        async with OllamaProvider(model="mistral") as p:
+            p._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            await p.generate("plain")
+            with structured.requesting(schema):
+                await p.generate("json")
+            with structured.requesting({}):
+                await p.generate("any json")
+
+    asyncio.run(run())
+    assert [body.get("format") for body in seen] == [None, schema, "json"]
+
+    assert _response_format("gpt-4o-mini") == {}
+    with structured.requesting(schema):
+        assert _response_format("gpt-4o-mini")["response_format"]["json_schema"]["schema"] is schema
+        # Models without Structured Outputs fall back to JSON mode, or to the prompt alone.
+        assert _response_format("gpt-4-turbo") == {"response_format": {"type": "json_object"}}
+        assert _response_format("gpt-3.5-turbo") == {"response_format": {"type": "json_object"}}
+        assert _response_format("gpt-4") == {}
+    with structured.requesting({}):
+        assert _response_format("gpt-4o") == {"response_format": {"type": "json_object"}}
+    assert "JSON schema" in structured.system_prompt(get_template("ad"))
+
+
+def test_gemini_variants_request_json():
+    from types import SimpleNamespace
+
+    from contentforge.providers.gemini_provider import GeminiProvider
+
+    configs = []
+
+    class Model:
+        async def generate_content_async(self, prompt, generation_config):
+            configs.append(generation_config)
+            part = SimpleNamespace(text="{}")
+            candidate = SimpleNamespace(content=SimpleNamespace(parts=[part]))
+            return SimpleNamespace(candidates=[candidate] * 2, usage_metadata=None)
+
+    prov = GeminiProvider(api_key="key")
+    prov._get_model = lambda system_prompt="": Model()
+
+    async def run() -> None:
+        with structured.requesting(get_template("ad").output_schema):
+            result = await prov.generate_variants("json", n=2)
+        assert [v.content for v in result.variants] == ["{}", "{}"]
+        await prov.generate_variants("plain", n=2)
+
+    asyncio.run(run())
+    assert configs[0].response_mime_type == "application/json"
+    assert configs[0].candidate_count == 2
+    assert not configs[1].response_mime_type
+
+
+class _JsonProvider(BaseProvider):
+    """Streams a fixed SEO reply when JSON is requested."""
+
+    name = "fake"
+    models: ClassVar[list[str]] = ["fake-1"]
+    model = "fake-1"
+
+    def __init__(self) -> None:
+        self.schemas: list[dict | None] = []
+
+    def _reply(self) -> str:
+        self.schemas.append(structured.current())
+        return json.dumps(
+            {
+                "meta_title": "Green Tea Guide",
+                "meta_description": "All about green tea.",
+                "og_title": "The Green Tea Guide",
+                "og_description": "Steep better tea.",
+                "keywords": ["green tea benefits", "how to brew green tea"],
+            }
+        )
+
+    async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        return GenerationResult(self._reply(), "fake", "fake-1", 10)
+
+    async def stream(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+        reply = self._reply()
+        for i in range(0, len(reply), 7):
+            yield reply[i : i + 7]
+
+    def is_available(self):
+        return True
+
+
+def test_seo_cli_structured_output(monkeypatch: pytest.MonkeyPatch):
+    prov = _JsonProvider()
+    monkeypatch.setattr("contentforge.commands.generate.get_provider", lambda *a, **kw: prov)
+    runner = CliRunner()
+    args = ["generate", "seo", "--keyword", "green tea", "--format", "plain"]
+
+    for extra in (["--stream"], ["--no-stream"]):
+        result = runner.invoke(app, [*args, *extra])
+        assert result.exit_code == 0, result.output
+        assert "**Meta title:** Green Tea Guide" in result.stdout
+        assert "- how to brew green tea" in result.stdout
+    assert prov.schemas == [get_template("seo").output_schema] * 2
+
+    history.flush()
+    entries = history.HistoryStore().recent()
+    assert [json.loads(e.content)["meta_title"] for e in entries] == ["Green Tea Guide"] * 2
+
+    result = runner.invoke(app, [*args, "--format", "json"])
+    assert json.loads(json.loads(result.stdout)["content"])["og_title"] == "The Green Tea Guide"
+
+    result = runner.invoke(app, ["generate", "run", "blog", "-V", "topic=x", "--structured"])
+    assert result.exit_code == 1
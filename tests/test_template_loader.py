@@ -0,0 +1,162 @@
+"""Test user template directories and the on-disk template index."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from contentforge.cli import app
+from contentforge.templates import get_template, list_templates, render_prompt
+from contentforge.templates.loader import (
+    build_index,
+    index_path,
+    invalidate_index_cache,
+    user_template_dir,
+)
+
+runner = CliRunner()
+
+PRESS_RELEASE = """
+name = "Press Release"
+category = "pr"
+system_prompt = "You are a PR writer."
+user_prompt_template = "Announce {product} for {audience}.{#quote}\\nQuote: {quote}{/quote}"
+
+[[fields]]
+name = "product"
+
+[[fields]]
+name = "audience"
+type = "select"
+options = ["press", "customers"]
+default = "press"
+
+[[fields]]
+name = "quote"
+required = false
+"""
+
+FAQ_YAML = """
+id: faq
+name: FAQ
+user_prompt_template: "Write an FAQ about {topic}"
+fields:
+  - name: topic
+"""
+
+
+@pytest.fixture
+def template_dir() -> Iterator[Path]:
+    d = user_template_dir()
+    d.mkdir(parents=True)
+    invalidate_index_cache()
+    yield d
+    invalidate_index_cache()
+
+
+def test_user_templates_load_from_toml_and_yaml(template_dir: Path):
+    (template_dir / "press-release.toml").write_text(PRESS_RELEASE)
+    (template_dir / "faq.yaml").write_text(FAQ_YAML)
+
+    tpl = get_template("press-release")
+    assert tpl.name == "Press Release"
+    assert tpl.fields[0].label == "Product"
+    assert render_prompt(tpl, {"product": "Forge"}) == "Announce Forge for press."
+    assert get_template("faq").fields[0].name == "topic"
+    assert {"blog", "press-release", "faq"} <= {t.id for t in list_templates()}
+
+
+def test_edited_template_is_reloaded_in_the_same_process(template_dir: Path):
+    path = template_dir / "press-release.toml"
+    path.write_text(PRESS_RELEASE)
+    assert get_template("press-release").name == "Press Release"
+
+    dir_mtime = template_dir.stat().st_mtime_ns
+    path.write_text(PRESS_RELEASE.replace("Press Release", "Launch Note"))
+    os.utime(template_dir, ns=(dir_mtime, dir_mtime))  # saved in place: directory unchanged
+
+    assert get_template("press-release").name == "Launch Note"
+
+
+def test_index_reparses_only_changed_files(template_dir: Path):
+    (template_dir / "press-release.toml").write_text(PRESS_RELEASE)
+    (template_dir / "faq.yaml").write_text(FAQ_YAML)
+
+    assert build_index([template_dir]).parsed == 2
+    assert build_index([template_dir]).parsed == 0
+    assert json.loads(index_path().read_text())["version"] == 1
+
+    # Touched but unchanged content is matched by hash, not re-parsed.
+    faq = template_dir / "faq.yaml"
+    st = faq.stat()
+    os.utime(faq, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert build_index([template_dir]).parsed == 0
+
+    faq.write_text(FAQ_YAML.replace("FAQ about", "FAQ covering"))
+    index = build_index([template_dir])
+    assert index.parsed == 1
+    assert "covering" in index.get("faq").user_prompt_template
+
+    faq.unlink()
+    assert build_index([template_dir]).ids() == ["press-release"]
+
+
+def test_invalid_and_conflicting_files_are_reported(template_dir: Path):
+    (template_dir / "bad.toml").write_text('user_prompt_template = "{#x}unclosed"')
+    (template_dir / "blog.toml").write_text('user_prompt_template = "mine"')
+    (template_dir / "typo.toml").write_text('user_prompt = "x"')
+
+    index = build_index([template_dir], reserved=frozenset({"blog"}))
+    assert index.ids() == []
+    errors = sorted(index.errors.values())
+    assert errors[0].startswith("bad.toml: Unclosed section")
+    assert "built-in template" in errors[1]
+    assert "unknown key(s) user_prompt" in errors[2]
+
+
+def test_generate_run_user_template(template_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    from contentforge.providers.base import GenerationResult
+
+    (template_dir / "press-release.toml").write_text(PRESS_RELEASE)
+    prompts: list[str] = []
+
+    class _Echo:
+        name, model = "fake", "fake-1"
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return None
+
+        async def generate(self, prompt, system_prompt="", temperature=0.7, max_tokens=2000):
+            prompts.append(prompt)
+            return GenerationResult(content="done", provider="fake", model="fake-1")
+
+    monkeypatch.setattr("contentforge.commands.generate.get_provider", lambda *a, **kw: _Echo())
+    result = runner.invoke(
+        app,
+        [
+            "generate",
+            "run",
+            "press-release",
+            "--var",
+            "product=Forge",
+            "-V",
+            "quote=Hi",
+            "--no-stream",
+            "--format",
+            "plain",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert prompts == ["Announce Forge for press.\nQuote: Hi"]
+
+    result = runner.invoke(app, ["generate", "run", "press-release", "--var", "nope"])
+    assert result.exit_code == 1
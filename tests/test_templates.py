@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import pytest
 
-from contentforge.templates import get_template, list_templates
+from contentforge.templates import TemplateError, get_template, list_templates, render_prompt
+from contentforge.templates.compiler import compile_source
 from contentforge.templates.models import ContentTemplate, TemplateField
 from contentforge.templates.registry import TEMPLATES
 
@@ -81,3 +82,54 @@ def test_content_template_dataclass():
         user_prompt_template="user {var}",
     )
     assert t.output_format == "markdown"
+
+
+def test_render_matches_legacy_blog_prompt():
+    t = get_template("blog")
+    assert render_prompt(t, {"topic": "AI"}) == (
+        "Write a professional blog post about: AI\n\nTarget approximately 800 words.\n"
+    )
+    assert render_prompt(t, {"topic": "AI", "keywords": "llm, rag"}).endswith(
+        "\nInclude these SEO keywords naturally: llm, rag"
+    )
+
+
+def test_conditional_sections_and_escapes():
+    names, render = compile_source("{#a}A={a}{/a}{^a}no a{/a} {{literal}} {b}")
+    assert names == ("a", "b")
+    assert render("1", "x") == "A=1 {literal} x"
+    assert render("", "x") == "no a {literal} x"
+
+
+@pytest.mark.parametrize("source", ["{#a}open", "{a}{/b}", "lone { brace", "{/a}"])
+def test_malformed_sources_raise(source: str):
+    with pytest.raises(TemplateError):
+        compile_source(source)
+
+
+def test_render_validates_fields():
+    t = get_template("blog")
+    with pytest.raises(TemplateError, match="Missing required field: 'topic'"):
+        render_prompt(t, {"tone": "casual"})
+    with pytest.raises(TemplateError, match=r"Invalid value for 'tone'.*choose from"):
+        render_prompt(t, {"topic": "AI", "tone": "shouty"})
+    with pytest.raises(TemplateError, match="'word_count' must be a number"):
+        render_prompt(t, {"topic": "AI", "word_count": "lots"})
+
+
+def test_render_columns_matches_per_row_render():
+    t = get_template("social")
+    rows = [
+        {"topic": "launch", "platform": "twitter"},
+        {"topic": "hiring", "goal": "awareness", "include_hashtags": "no"},
+        {"topic": "roadmap"},
+    ]
+    assert t.compiled.render_many(rows) == [render_prompt(t, row) for row in rows]
+    assert t.compiled.render_columns({"topic": ["a", "b"]}) == [
+        render_prompt(t, {"topic": "a"}),
+        render_prompt(t, {"topic": "b"}),
+    ]
+    with pytest.raises(TemplateError, match=r"'topic' \(row 1\)"):
+        t.compiled.render_columns({"topic": ["a", ""]})
+    with pytest.raises(TemplateError, match="Invalid value for 'platform'"):
+        t.compiled.render_columns({"topic": ["a", "b"], "platform": ["linkedin", "myspace"]})